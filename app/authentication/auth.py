@@ -1,17 +1,26 @@
 import functools
 from datetime import datetime
+import hashlib
 import hmac
-from typing import Callable
+import secrets
+from typing import Callable, Iterator
 from uuid import uuid4
 import time
 import uuid
 
+import jwt
+from cachetools import TTLCache
 from flask import request, current_app, g
 from flask_jwt_extended import verify_jwt_in_request, current_user
 from flask_jwt_extended.config import config
 from flask_jwt_extended.exceptions import JWTExtendedException
 from jwt.exceptions import PyJWTError
-from notifications_python_client.authentication import decode_jwt_token, get_token_issuer
+from notifications_python_client.authentication import (
+    decode_jwt_token,
+    decode_token,
+    get_token_issuer,
+    validate_jwt_token,
+)
 from notifications_python_client.errors import TokenError, TokenDecodeError, TokenExpiredError, TokenIssuerError
 from notifications_utils import request_helper
 from sqlalchemy.exc import DataError
@@ -20,6 +29,19 @@ from sqlalchemy.orm.exc import NoResultFound
 
 from app.dao.services_dao import dao_fetch_service_by_id_with_api_keys
 from app.dao.users_dao import get_user_by_id
+from app.service.service_data import ServiceData, ServiceDataApiKey
+
+# Maps a fully verified service JWT to the id of the API key that signed it.  Tokens are only accepted for 30 seconds
+# either side of their iat claim, so entries never need to outlive that window.  The whole token is the key: the
+# signature alone is not enough because a forged header or payload could be paired with a previously seen signature.
+verified_token_cache = TTLCache(maxsize=4096, ttl=60)
+
+# Admin basic-auth credentials that have already passed bcrypt.  Entries are keyed by the user's id and stored password
+# hash, so changing the password invalidates them, and by an HMAC of the presented password under a per-process key so
+# the cache never holds anything that could be checked offline.  Archived and blocked users are rejected before the
+# cache is consulted.
+verified_admin_password_cache = TTLCache(maxsize=1024, ttl=300)
+_admin_password_cache_key = secrets.token_bytes(32)
 
 
 class AuthError(Exception):
@@ -121,7 +143,7 @@ def validate_admin_basic_auth():
     if not user.email_address or user.email_address.startswith('_archived_'):
         raise AuthError('Unauthorized, invalid basic auth credentials', 401)
 
-    if not user.check_password(password):
+    if not _check_admin_password(user, password):
         raise AuthError('Unauthorized, invalid basic auth credentials', 401)
 
     if not user.platform_admin:
@@ -137,6 +159,33 @@ def validate_admin_basic_auth():
     )
 
 
+def _check_admin_password(
+    user,
+    password: str,
+) -> bool:
+    """
+    Return user.check_password(password), skipping bcrypt when the same password has been verified for the user's
+    current password hash within the cache's TTL.
+    """
+
+    if user.blocked or user._password is None:
+        return False
+
+    cache_key = (
+        user.id,
+        user._password,
+        hmac.new(_admin_password_cache_key, password.encode(), hashlib.sha256).digest(),
+    )
+    if cache_key in verified_admin_password_cache:
+        return True
+
+    if not user.check_password(password):
+        return False
+
+    verified_admin_password_cache[cache_key] = True
+    return True
+
+
 def validate_admin_jwt_auth():
     request_helper.check_proxy_header_before_request()
 
@@ -300,7 +349,7 @@ def requires_admin_basic_auth():
     return decorator
 
 
-def validate_service_api_key_auth():  # noqa: C901
+def validate_service_api_key_auth():
     # Set the id here for tracking purposes - becomes notification id
     g.request_id = str(uuid4())
     request_helper.check_proxy_header_before_request()
@@ -321,7 +370,106 @@ def validate_service_api_key_auth():  # noqa: C901
     if not service.active:
         raise AuthError('Invalid token: service is archived', 403, service_id=service.id)
 
+    api_key = _get_cached_api_key(auth_token, service)
+
+    if api_key is None:
+        api_key = _verify_api_key_signature(auth_token, service)
+
+    if api_key.revoked:
+        raise AuthError('Invalid token: API key revoked', 403, service_id=service.id, api_key_id=api_key.id)
+
+    # Check if API key has expired
+    if api_key.expiry_date <= datetime.utcnow():
+        raise AuthError('Invalid token: API key expired', 403, service_id=service.id, api_key_id=api_key.id)
+
+    verified_token_cache[auth_token] = api_key.id
+
+    g.service_id = api_key.service_id
+    g.api_user = api_key
+    g.authenticated_service = service
+    current_app.logger.info(
+        'API authorised for service %s (%s) with api key %s, using client %s',
+        service.id,
+        service.name,
+        api_key.id,
+        request.headers.get('User-Agent'),
+        extra={
+            'sms_sender_id': data.get('sms_sender_id'),
+            'template_id': data.get('template_id'),
+        },
+    )
+
+
+def _get_cached_api_key(
+    auth_token: str,
+    service: ServiceData,
+) -> ServiceDataApiKey | None:
+    """
+    Return the API key that previously verified this exact token, or None if the token has not been seen.  The iat
+    bounds are still enforced because the cached entry may outlive the token.
+    """
+
+    api_key_id = verified_token_cache.get(auth_token)
+    if api_key_id is None:
+        return None
+
+    api_key = next((key for key in service.api_keys if key.id == api_key_id), None)
+    if api_key is None:
+        return None
+
+    try:
+        validate_jwt_token(decode_token(auth_token))
+    except TokenExpiredError:
+        err_msg = 'Error: Your system clock must be accurate to within 30 seconds'
+        raise AuthError(err_msg, 403, service_id=service.id, api_key_id=api_key.id)
+
+    return api_key
+
+
+def _api_keys_in_verification_order(
+    auth_token: str,
+    service: ServiceData,
+) -> Iterator[ServiceDataApiKey]:
+    """
+    Yield the service's API keys in the order their secrets should be tried.
+
+    The key named by the optional "kid" header comes first, followed by keys that are neither revoked nor expired.
+    Revoked and expired keys are only tried when nothing else matched, so the caller can still report why the token
+    was rejected without paying a signature check for every retired key on the happy path.
+    """
+
+    try:
+        kid = jwt.get_unverified_header(auth_token).get('kid')
+    except jwt.PyJWTError:
+        kid = None
+
+    now = datetime.utcnow()
+    preferred = []
+    active = []
+    inactive = []
+
     for api_key in service.api_keys:
+        if kid is not None and str(api_key.id) == kid:
+            preferred.append(api_key)
+        elif not api_key.revoked and api_key.expiry_date > now:
+            active.append(api_key)
+        else:
+            inactive.append(api_key)
+
+    yield from preferred
+    yield from active
+    yield from inactive
+
+
+def _verify_api_key_signature(
+    auth_token: str,
+    service: ServiceData,
+) -> ServiceDataApiKey:
+    """
+    Return the API key whose secret signed the token, or raise AuthError.
+    """
+
+    for api_key in _api_keys_in_verification_order(auth_token, service):
         try:
             # This function call could raise a number of exceptions, all of which are subclasses of TokenError.
             # Catch specific exceptions to raise specific error messages.
@@ -332,31 +480,10 @@ def validate_service_api_key_auth():  # noqa: C901
         except TokenError:
             continue
 
-        if api_key.revoked:
-            raise AuthError('Invalid token: API key revoked', 403, service_id=service.id, api_key_id=api_key.id)
+        return api_key
 
-        # Check if API key has expired
-        if api_key.expiry_date <= datetime.utcnow():
-            raise AuthError('Invalid token: API key expired', 403, service_id=service.id, api_key_id=api_key.id)
-
-        g.service_id = api_key.service_id
-        g.api_user = api_key
-        g.authenticated_service = service
-        current_app.logger.info(
-            'API authorised for service %s (%s) with api key %s, using client %s',
-            service.id,
-            service.name,
-            api_key.id,
-            request.headers.get('User-Agent'),
-            extra={
-                'sms_sender_id': data.get('sms_sender_id'),
-                'template_id': data.get('template_id'),
-            },
-        )
-        return
-    else:
-        # service has API keys, but none matching the one the user provided
-        raise AuthError('Invalid token: signature, api token not found', 403, service_id=service.id)
+    # service has API keys, but none matching the one the user provided
+    raise AuthError('Invalid token: signature, api token not found', 403, service_id=service.id)
 
 
 def __get_token_issuer(auth_token):
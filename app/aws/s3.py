@@ -1,4 +1,6 @@
+import io
 from datetime import datetime, timedelta
+from typing import Iterator
 
 from flask import current_app
 
@@ -49,12 +51,18 @@ def get_job_location(
     )
 
 
-def get_job_from_s3(
+def get_job_lines_from_s3(
     service_id,
     job_id,
-):
+) -> Iterator[str]:
+    """
+    Stream the lines of a job's CSV file from S3, reading the response body incrementally rather than holding the
+    whole file in memory.  Lines keep their line endings, untranslated, so they can be read with csv.reader.
+    """
+
     obj = get_s3_object(*get_job_location(service_id, job_id))
-    return obj.get()['Body'].read().decode('utf-8')
+
+    yield from io.TextIOWrapper(obj.get()['Body'], encoding='utf-8', newline='')
 
 
 def remove_job_from_s3(
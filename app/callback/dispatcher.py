@@ -0,0 +1,473 @@
+"""
+An asyncio dispatcher for webhook delivery status callbacks, run by run_callback_dispatcher.py.
+
+Celery sends each callback in its own task, which blocks a worker process for up to HTTP_TIMEOUT when a service's
+endpoint is slow.  The dispatcher instead consumes the send-delivery-status and send-notification-delivery-status
+tasks queued on QueueNames.DELIVERY_STATUS_CALLBACKS continuously, keeping up to max_in_flight callbacks in flight
+with aiohttp and taking the next message as soon as one completes.
+
+Each host has its own limits on callbacks in flight and started per second, so a slow service only delays its own
+callbacks.  A callback that cannot start within start_timeout seconds is returned to the queue for later.  Failed
+callbacks are queued again with the backoff and retry limit of their Celery task.
+
+Nothing that blocks runs on the event loop.  Calls to the broker, including publishing, are made from one broker
+thread, and building a callback, which reads the database and decrypts, is done in a pool of prepare threads.
+"""
+
+import asyncio
+import inspect
+import json
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from time import monotonic
+from urllib.parse import urlsplit
+
+import aiohttp
+from celery import Task
+from celery.utils.time import get_exponential_backoff_interval
+from flask import current_app
+from kombu import Exchange, Queue
+from kombu.message import Message
+
+from app import notify_celery, statsd_client
+from app.callback.webhook_callback_strategy import webhook_headers
+from app.celery.service_callback_tasks import (
+    create_delivery_status_payload,
+    send_delivery_status_from_notification,
+    send_delivery_status_to_service,
+)
+from app.config import QueueNames
+from app.constants import HTTP_TIMEOUT, WEBHOOK_CHANNEL_TYPE
+from app.dao.service_callback_api_dao import get_service_callback
+from app.utils import statsd_http
+
+
+def _bind_arguments(
+    task: Task,
+    args: list,
+    kwargs: dict,
+) -> dict:
+    """Map a queued task's arguments to its parameter names, as Celery would when calling it."""
+    return inspect.signature(task.run).bind(*args, **kwargs).arguments
+
+
+class CallbackOutcome(Enum):
+    SENT = 'sent'
+    RETRY = 'retry'
+    FAILED = 'failed'
+    DEFERRED = 'deferred'
+
+
+@dataclass
+class Callback:
+    """A callback taken from the queue, ready to send."""
+
+    message: Message
+    task: Task
+    args: list
+    kwargs: dict
+    retries: int
+    url: str
+    data: str
+    headers: dict[str, str]
+    notification_id: str
+    # The statsd namespaces the Celery task records its request under
+    http_namespace: str
+    webhook_namespace: str | None = None
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+    def is_retryable(
+        self,
+        status: int,
+    ) -> bool:
+        """Whether the Celery task would retry after the service responded with an error status."""
+        if self.task is send_delivery_status_from_notification:
+            return status == 429 or status >= 500
+        return status >= 500
+
+
+class HostLimiter:
+    """Limits the callbacks in flight to a host, and the rate at which they start."""
+
+    def __init__(
+        self,
+        concurrency: int,
+        rate: float,
+    ):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._interval = 1 / rate
+        self._next_start = 0.0
+
+    async def acquire(self) -> None:
+        await self._semaphore.acquire()
+        try:
+            now = monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            # Cancelled while waiting for a start time, e.g. by the start timeout
+            self._semaphore.release()
+            raise
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+class CallbackDispatcher:
+    def __init__(
+        self,
+        max_in_flight: int,
+        start_timeout: float,
+        host_concurrency: int,
+        host_rate: float,
+        prepare_threads: int = 4,
+    ):
+        self.max_in_flight = max_in_flight
+        self.start_timeout = start_timeout
+        self.host_concurrency = host_concurrency
+        self.host_rate = host_rate
+        self._limiters: dict[str, HostLimiter] = {}
+        self._tasks: dict[str, Task] = {
+            send_delivery_status_to_service.name: send_delivery_status_to_service,
+            send_delivery_status_from_notification.name: send_delivery_status_from_notification,
+        }
+        self._in_flight: set[asyncio.Task] = set()
+        # Kombu connections are not thread safe, so every call on the queue, and every publish, is made from this one
+        # thread
+        self._broker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='callback-dispatcher-broker')
+        self._prepare_pool = ThreadPoolExecutor(
+            max_workers=prepare_threads, thread_name_prefix='callback-dispatcher-prepare'
+        )
+        self._stopping = False
+
+    @classmethod
+    def from_config(
+        cls,
+        config,
+    ) -> 'CallbackDispatcher':
+        return cls(
+            max_in_flight=config['CALLBACK_DISPATCHER_MAX_IN_FLIGHT'],
+            start_timeout=config['CALLBACK_DISPATCHER_START_TIMEOUT'],
+            host_concurrency=config['CALLBACK_DISPATCHER_HOST_CONCURRENCY'],
+            host_rate=config['CALLBACK_DISPATCHER_HOST_RATE'],
+            prepare_threads=config['CALLBACK_DISPATCHER_PREPARE_THREADS'],
+        )
+
+    def stop(self) -> None:
+        """Stop taking messages, and return once the callbacks in flight have completed."""
+        self._stopping = True
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.stop)
+
+        queue = Queue(
+            QueueNames.DELIVERY_STATUS_CALLBACKS,
+            Exchange('default'),
+            routing_key=QueueNames.DELIVERY_STATUS_CALLBACKS,
+        )
+        timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=HTTP_TIMEOUT[1])
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.host_concurrency)
+
+        current_app.logger.info('Callback dispatcher consuming %s', QueueNames.DELIVERY_STATUS_CALLBACKS)
+        with notify_celery.connection_for_read() as connection:
+            simple_queue = connection.SimpleQueue(queue, accept=['json', 'pickle'])
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                await self.consume(session, simple_queue)
+            simple_queue.close()
+        self._broker.shutdown()
+        self._prepare_pool.shutdown()
+
+    async def consume(
+        self,
+        session: aiohttp.ClientSession,
+        simple_queue,
+    ) -> None:
+        """
+        Take messages from the queue while fewer than max_in_flight callbacks are in flight, handling each in its own
+        task so that a slow callback does not hold up the others.
+        """
+
+        while not self._stopping or self._in_flight:
+            if self._stopping or len(self._in_flight) >= self.max_in_flight:
+                await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            # Only wait for a message when nothing else needs the loop
+            message = await self._call_broker(self._get, simple_queue, not self._in_flight)
+            if message is not None:
+                self.start(session, message)
+            elif self._in_flight:
+                await asyncio.wait(self._in_flight, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+
+    @staticmethod
+    def _get(
+        simple_queue,
+        block: bool,
+    ) -> Message | None:
+        try:
+            return simple_queue.get(block=block, timeout=1)
+        except simple_queue.Empty:
+            return None
+
+    async def _call_broker(
+        self,
+        fn,
+        *args,
+    ):
+        return await self._call_in_app_context(self._broker, fn, *args)
+
+    async def _call_in_app_context(
+        self,
+        executor: ThreadPoolExecutor,
+        fn,
+        *args,
+    ):
+        """Run fn in the executor, in its own app context, so its database session is removed when it returns."""
+
+        app = current_app._get_current_object()
+
+        def call():
+            with app.app_context():
+                return fn(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    def start(
+        self,
+        session: aiohttp.ClientSession,
+        message: Message,
+    ) -> asyncio.Task:
+        """Handle a message in a new task, which is tracked until it completes."""
+
+        task = asyncio.create_task(self._handle(session, message))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+        return task
+
+    async def _handle(
+        self,
+        session: aiohttp.ClientSession,
+        message: Message,
+    ) -> None:
+        """Send a message's callback, then acknowledge, retry, or return the message to the queue."""
+
+        try:
+            try:
+                callback = await self._call_in_app_context(self._prepare_pool, self._prepare, message)
+            except Exception:
+                # Celery would not retry a task that cannot be built either
+                current_app.logger.exception(
+                    'Unable to dispatch %s callback %s', message.headers.get('task'), message.headers.get('id')
+                )
+                await self._call_broker(message.ack)
+                return
+
+            if callback is None:
+                await self._call_broker(self._forward, message)
+                await self._call_broker(message.ack)
+                return
+
+            outcome = await self._send(session, callback, monotonic() + self.start_timeout)
+            statsd_client.incr(f'callback.dispatcher.{outcome.value}')
+            if outcome == CallbackOutcome.DEFERRED:
+                await self._call_broker(message.requeue)
+                return
+
+            if outcome == CallbackOutcome.RETRY:
+                await self._call_broker(self._retry, callback)
+            elif outcome == CallbackOutcome.FAILED:
+                current_app.logger.critical(
+                    'Not retrying: %s failed for notification_id: %s, url: %s.',
+                    callback.task.name,
+                    callback.notification_id,
+                    callback.url,
+                )
+            await self._call_broker(message.ack)
+        except Exception:
+            # The message is delivered again once its visibility timeout expires
+            current_app.logger.exception(
+                'Unable to complete %s callback %s', message.headers.get('task'), message.headers.get('id')
+            )
+
+    def _prepare(
+        self,
+        message: Message,
+    ) -> Callback | None:
+        """
+        Build the request for a queued callback task, or return None if the dispatcher does not send the task itself
+        and it should be handed to the Celery workers.
+        """
+
+        args, kwargs, _ = message.decode()
+        retries = message.headers.get('retries') or 0
+        task = self._tasks.get(message.headers.get('task'))
+        if task is send_delivery_status_to_service:
+            return self._prepare_delivery_status(message, task, args, kwargs, retries)
+        if task is send_delivery_status_from_notification:
+            return self._prepare_notification_delivery_status(message, task, args, kwargs, retries)
+        return None
+
+    @staticmethod
+    def _forward(message: Message) -> None:
+        """Queue a task the dispatcher does not send itself for the Celery workers."""
+
+        args, kwargs, _ = message.decode()
+        notify_celery.send_task(
+            message.headers.get('task'),
+            args,
+            kwargs,
+            queue=QueueNames.CALLBACKS,
+            retries=message.headers.get('retries') or 0,
+        )
+
+    @staticmethod
+    def _prepare_delivery_status(
+        message: Message,
+        task: Task,
+        args: list,
+        kwargs: dict,
+        retries: int,
+    ) -> Callback | None:
+        arguments = _bind_arguments(task, args, kwargs)
+        notification_id = arguments['notification_id']
+        service_callback = get_service_callback(arguments['service_callback_id'])
+        if service_callback.callback_channel != WEBHOOK_CHANNEL_TYPE:
+            return None
+
+        return Callback(
+            message=message,
+            task=task,
+            args=args,
+            kwargs=kwargs,
+            retries=retries,
+            url=service_callback.url,
+            data=json.dumps(create_delivery_status_payload(notification_id, arguments['encrypted_status_update'])),
+            headers=webhook_headers(service_callback),
+            notification_id=str(notification_id),
+            http_namespace='callback.webhook',
+            webhook_namespace=f'callback.webhook.{service_callback.callback_type}',
+        )
+
+    @staticmethod
+    def _prepare_notification_delivery_status(
+        message: Message,
+        task: Task,
+        args: list,
+        kwargs: dict,
+        retries: int,
+    ) -> Callback:
+        arguments = _bind_arguments(task, args, kwargs)
+        return Callback(
+            message=message,
+            task=task,
+            args=args,
+            kwargs=kwargs,
+            retries=retries,
+            url=arguments['callback_url'],
+            data=json.dumps(arguments['notification_data']),
+            headers={
+                'Content-Type': 'application/json',
+                'x-enp-signature': arguments['callback_signature'],
+            },
+            notification_id=str(arguments['notification_id']),
+            http_namespace='send_delivery_status_from_notification',
+        )
+
+    def _limiter(
+        self,
+        host: str,
+    ) -> HostLimiter:
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(self.host_concurrency, self.host_rate)
+        return self._limiters[host]
+
+    async def _send(
+        self,
+        session: aiohttp.ClientSession,
+        callback: Callback,
+        deadline: float,
+    ) -> CallbackOutcome:
+        limiter = self._limiter(callback.host)
+        try:
+            await asyncio.wait_for(limiter.acquire(), max(deadline - monotonic(), 0))
+        except asyncio.TimeoutError:
+            return CallbackOutcome.DEFERRED
+
+        try:
+            with statsd_http(callback.http_namespace):
+                async with session.post(callback.url, data=callback.data, headers=callback.headers) as response:
+                    status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            current_app.logger.warning(
+                'Retryable error sending callback for notification %s, url %s | exception: %s',
+                callback.notification_id,
+                callback.url,
+                repr(e),
+            )
+            self._incr_webhook(callback, 'retryable_error')
+            return CallbackOutcome.RETRY
+        finally:
+            limiter.release()
+
+        if status < 400:
+            self._incr_webhook(callback, 'success')
+            return CallbackOutcome.SENT
+
+        current_app.logger.warning(
+            'Error sending callback for notification %s, url %s | status code: %s',
+            callback.notification_id,
+            callback.url,
+            status,
+        )
+        if callback.is_retryable(status):
+            self._incr_webhook(callback, 'retryable_error')
+            return CallbackOutcome.RETRY
+        self._incr_webhook(callback, 'non_retryable_error')
+        return CallbackOutcome.FAILED
+
+    @staticmethod
+    def _incr_webhook(
+        callback: Callback,
+        result: str,
+    ) -> None:
+        """Count the result under the same name as WebhookCallbackStrategy does."""
+        if callback.webhook_namespace is not None:
+            statsd_client.incr(f'{callback.webhook_namespace}.{result}')
+
+    @staticmethod
+    def _retry(callback: Callback) -> None:
+        """Queue a callback again, as its Celery task's autoretry would."""
+
+        task = callback.task
+        if callback.retries >= task.max_retries:
+            current_app.logger.error(
+                'Retry: %s has retried the max num of times for notification_id: %s, url %s.',
+                task.name,
+                callback.notification_id,
+                callback.url,
+            )
+            return
+
+        countdown = get_exponential_backoff_interval(
+            factor=int(max(1.0, task.retry_backoff)),
+            retries=callback.retries,
+            maximum=task.retry_backoff_max,
+            full_jitter=task.retry_jitter,
+        )
+        # The dispatcher does not hold messages with an ETA, so the broker delays the message instead.
+        task.apply_async(
+            callback.args,
+            callback.kwargs,
+            queue=QueueNames.DELIVERY_STATUS_CALLBACKS,
+            retries=callback.retries + 1,
+            DelaySeconds=countdown,
+        )
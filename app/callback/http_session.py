@@ -0,0 +1,87 @@
+"""
+A process-wide requests Session for sending service callbacks.
+
+Callbacks go to a handful of hosts, so connections are kept alive in per-host pools and reused across tasks rather
+than paying for a new TCP connection and TLS handshake per callback.  The session is created on first use in each
+process, and discarded in forked children, which must not share their parent's sockets.
+"""
+
+import os
+from http.cookiejar import DefaultCookiePolicy
+
+from flask import current_app
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from app import statsd_client
+
+_session: Session | None = None
+
+
+class _CountingPoolMixin:
+    """Records whether each connection taken from a pool is reused or must be opened, with a new TLS handshake."""
+
+    def _get_conn(self, *args, **kwargs):
+        conn = super()._get_conn(*args, **kwargs)
+        if conn.sock is None:
+            statsd_client.incr('callback.http.connection.new')
+        else:
+            statsd_client.incr('callback.http.connection.reused')
+        return conn
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class CallbackHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter whose connection pools report connection reuse to statsd."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+def _create_session() -> Session:
+    config = current_app.config
+    retries = config['CALLBACK_HTTP_CONNECT_RETRIES']
+
+    # Only failures to connect are retried, because the request has not reached the service.  Anything else is
+    # retried by the callback task.
+    adapter = CallbackHTTPAdapter(
+        pool_connections=config['CALLBACK_HTTP_POOL_CONNECTIONS'],
+        pool_maxsize=config['CALLBACK_HTTP_POOL_MAXSIZE'],
+        max_retries=Retry(total=retries, connect=retries, read=0, redirect=0, status=0, other=0),
+    )
+    session = Session()
+    # The session is shared by every service's callbacks, so a cookie set by one callback URL must not be kept
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_callback_session() -> Session:
+    """Return this process's callback session, creating it on first use."""
+
+    global _session
+    if _session is None:
+        _session = _create_session()
+    return _session
+
+
+def _discard_session() -> None:
+    global _session
+    _session = None
+
+
+os.register_at_fork(after_in_child=_discard_session)
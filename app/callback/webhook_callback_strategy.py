@@ -5,10 +5,10 @@ from urllib.parse import urlencode
 from uuid import UUID
 
 from flask import current_app
-from requests.api import request
 from requests.exceptions import HTTPError, RequestException
 
 from app import encryption, statsd_client
+from app.callback.http_session import get_callback_session
 from app.callback.service_callback_strategy_interface import ServiceCallbackStrategyInterface
 from app.celery.exceptions import NonRetryableException, RetryableException
 from app.constants import HTTP_TIMEOUT
@@ -27,14 +27,10 @@ class WebhookCallbackStrategy(ServiceCallbackStrategyInterface):
         tags = ', '.join([f'{key}: {value}' for key, value in logging_tags.items()])
         try:
             with statsd_http('callback.webhook'):
-                response = request(
-                    method='POST',
+                response = get_callback_session().post(
                     url=callback.url,
                     data=json.dumps(payload),
-                    headers={
-                        'Content-Type': 'application/json',
-                        'Authorization': f'Bearer {encryption.decrypt(callback._bearer_token)}',
-                    },
+                    headers=webhook_headers(callback),
                     timeout=HTTP_TIMEOUT,
                 )
             current_app.logger.info('Callback sent to %s, response %d, %s', callback.url, response.status_code, tags)
@@ -51,6 +47,14 @@ class WebhookCallbackStrategy(ServiceCallbackStrategyInterface):
             statsd_client.incr(f'callback.webhook.{callback.callback_type}.success')
 
 
+def webhook_headers(callback: DeliveryStatusCallbackApiData) -> dict[str, str]:
+    """Return the headers sent with every request to a service's webhook."""
+    return {
+        'Content-Type': 'application/json',
+        'Authorization': f'Bearer {encryption.decrypt(callback._bearer_token)}',
+    }
+
+
 def generate_callback_signature(
     api_key_id: UUID,
     callback_params: dict[str, str],
@@ -15,6 +15,8 @@ from app.constants import EMAIL_TYPE, KEY_TYPE_NORMAL, LETTER_TYPE, NOTIFICATION
 from app.dao.inbound_sms_dao import delete_inbound_sms_older_than_retention
 from app.dao.jobs_dao import dao_get_jobs_older_than_data_retention, dao_archive_job
 from app.dao.notifications_dao import (
+    dao_create_notification_partitions,
+    dao_drop_expired_notification_partitions,
     dao_timeout_notifications,
     delete_notifications_older_than_retention_by_type,
 )
@@ -122,6 +124,19 @@ def delete_letter_notifications_older_than_retention():
         raise
 
 
+@notify_celery.task(name='maintain-notification-partitions')
+@statsd(namespace='tasks')
+def maintain_notification_partitions():
+    """Create the upcoming weekly partitions of notifications and drop the ones past every service's retention."""
+    try:
+        created = dao_create_notification_partitions()
+        dropped = dao_drop_expired_notification_partitions()
+        current_app.logger.info('Created notifications partitions %s, dropped %s', created, dropped)
+    except SQLAlchemyError:
+        current_app.logger.exception('Failed to maintain notifications partitions')
+        raise
+
+
 @notify_celery.task(name='timeout-sending-notifications')
 @cronitor('timeout-sending-notifications')
 @statsd(namespace='tasks')
@@ -134,24 +149,34 @@ def timeout_notifications() -> None:
     unsent_created_notifications, temporary_failure_notifications = dao_timeout_notifications(
         current_app.config.get('SENDING_NOTIFICATIONS_TIMEOUT_PERIOD')
     )
-    notifications = unsent_created_notifications + temporary_failure_notifications
-    for notification in notifications:
-        # queue callback task only if the service_callback_api exists
-        check_and_queue_callback_task(notification)
 
-    current_app.logger.info(
-        'Timeout period reached for {} notifications, status has been updated.'.format(len(notifications))
-    )
-    if unsent_created_notifications:
+    unsent_created_ids = []
+    for notifications in unsent_created_notifications:
+        _queue_timeout_callbacks(notifications)
+        unsent_created_ids.extend(str(x.id) for x in notifications)
+
+    timed_out = len(unsent_created_ids)
+    for notifications in temporary_failure_notifications:
+        _queue_timeout_callbacks(notifications)
+        timed_out += len(notifications)
+
+    current_app.logger.info('Timeout period reached for {} notifications, status has been updated.'.format(timed_out))
+    if unsent_created_ids:
         message = (
             '{} notifications have been updated to permanent-failure because they '
             'have timed out and are still in created. Notification ids: {}'.format(
-                len(unsent_created_notifications), [str(x.id) for x in unsent_created_notifications]
+                len(unsent_created_ids), unsent_created_ids
             )
         )
         raise NotificationTechnicalFailureException(message)
 
 
+def _queue_timeout_callbacks(notifications) -> None:
+    for notification in notifications:
+        # queue callback task only if the service_callback_api exists
+        check_and_queue_callback_task(notification)
+
+
 @notify_celery.task(name='send-daily-performance-platform-stats')
 @cronitor('send-daily-performance-platform-stats')
 @statsd(namespace='tasks')
@@ -1,10 +1,12 @@
 import datetime
 import random
+from uuid import UUID
 
 from app.celery.process_ses_receipts_tasks import check_and_queue_va_profile_notification_status_callback
 from celery import Task
 from flask import current_app
 from notifications_utils.statsd_decorators import statsd
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm.exc import NoResultFound, MultipleResultsFound
 
 from app import clients, notify_celery, redis_store, statsd_client
@@ -25,9 +27,11 @@ from app.constants import (
 )
 from app.dao.notifications_dao import (
     dao_get_notification_by_reference,
+    dao_get_notifications_by_references,
     dao_increment_notification_retry_count,
     dao_update_sms_notification_delivery_status,
     dao_update_sms_notification_status_to_created_for_retry,
+    dao_update_sms_notifications_delivery_statuses,
 )
 from app.dao.service_callback_dao import dao_get_callback_include_payload_status
 from app.models import Notification
@@ -294,6 +298,159 @@ def sms_status_update(
         statsd_client.incr(f'clients.sms.{sms_status.provider}.status_update.error')
 
 
+def _is_recent_event(event_timestamp_in_ms: str | None) -> bool:
+    """Whether a provider event happened less than five minutes ago, so its notification might not be persisted yet."""
+    if not event_timestamp_in_ms:
+        return False
+    message_time = datetime.datetime.fromtimestamp(int(event_timestamp_in_ms) / 1000)
+    return datetime.datetime.utcnow() - message_time < datetime.timedelta(minutes=5)
+
+
+def _match_receipts_to_notifications(
+    receipts: list[tuple[SmsStatusRecord, str | None]],
+) -> tuple[list[tuple[Notification, SmsStatusRecord]], list[tuple[SmsStatusRecord, str | None]]]:
+    """Fetch the notifications for a batch of status records with one query.
+
+    Returns:
+        tuple: The records paired with their notification, and the records to process again later
+    """
+    notifications_by_reference: dict[str, list[Notification]] = {}
+    for notification in dao_get_notifications_by_references([sms_status.reference for sms_status, _ in receipts]):
+        notifications_by_reference.setdefault(notification.reference, []).append(notification)
+
+    status_updates = []
+    retry_receipts = []
+    for sms_status, event_timestamp in receipts:
+        notifications = notifications_by_reference.get(sms_status.reference, [])
+        if len(notifications) == 1:
+            status_updates.append((notifications[0], sms_status))
+        elif not notifications and _is_recent_event(event_timestamp):
+            statsd_client.incr(f'clients.sms.{sms_status.provider}.status_update.retry')
+            retry_receipts.append((sms_status, event_timestamp))
+        else:
+            current_app.logger.error(
+                '%s notifications found for %s reference: %s',
+                len(notifications),
+                sms_status.provider,
+                sms_status.reference,
+            )
+            statsd_client.incr(f'clients.sms.{sms_status.provider}.status_update.error')
+
+    return status_updates, retry_receipts
+
+
+def _queue_batch_callbacks(
+    updated_notifications: list[Notification],
+    status_updates: list[tuple[Notification, SmsStatusRecord]],
+) -> None:
+    """Log and queue the callbacks for the notifications updated by sms_status_update_batch."""
+
+    # A notification updated by several records gets one callback, with the payload of the last record that has its
+    # current status.  These are the instances refreshed by the update, so their status is the new one.
+    status_records: dict[UUID, SmsStatusRecord] = {}
+    for notification, sms_status in status_updates:
+        if notification.id not in status_records or notification.status == sms_status.status:
+            status_records[notification.id] = sms_status
+
+    for notification in updated_notifications:
+        sms_status = status_records[notification.id]
+        current_app.logger.info(
+            'Final %s logic | reference: %s | notification_id: %s | status: %s | status_reason: %s | cost_in_millicents: %s | service_id: %s | template_id: %s | provider_updated_at: %s',
+            sms_status.provider,
+            sms_status.reference,
+            notification.id,
+            notification.status,
+            notification.status_reason,
+            notification.cost_in_millicents,
+            notification.service_id,
+            notification.template_id,
+            notification.provider_updated_at,
+            extra={'sms_sender_id': notification.sms_sender_id, 'template_id': notification.template_id},
+        )
+
+        log_notification_total_time(
+            notification.id,
+            notification.created_at,
+            notification.status,
+            sms_status.provider,
+            notification.provider_updated_at,
+            sms_sender_id=notification.sms_sender_id,
+            template_id=notification.template_id,
+        )
+
+        # Our clients are not prepared to deal with pinpoint payloads
+        payload = sms_status.payload if _get_include_payload_status(notification) else None
+
+        try:
+            check_and_queue_callback_task(notification, payload)
+            check_and_queue_va_profile_notification_status_callback(notification)
+            statsd_client.incr(f'clients.sms.{sms_status.provider}.status_update.success')
+        except Exception:
+            current_app.logger.exception(
+                'Failed to check_and_queue_callback_task for notification: %s', notification.id
+            )
+            statsd_client.incr(f'clients.sms.{sms_status.provider}.status_update.error')
+
+
+def sms_status_update_batch(
+    receipts: list[tuple[SmsStatusRecord, str | None]],
+) -> list[tuple[SmsStatusRecord, str | None]]:
+    """Get and update the notifications for a batch of status records.
+
+    The batch equivalent of sms_status_update: the notifications are fetched with one query, updated with one
+    statement, and their callbacks are queued afterwards.  Records for notifications that could not be found are
+    returned to be processed again if their event happened within the last five minutes, because the receipt may have
+    arrived before the notification was persisted.  Otherwise they are logged and dropped.
+
+    Args:
+        receipts (list[tuple[SmsStatusRecord, str | None]]): Status records with the timestamp their event came in
+
+    Raises:
+        AutoRetryException: A transient database error, such as a lost connection or deadlock, prevented the update
+        NonRetryableException: Unable to update the notifications
+
+    Returns:
+        list[tuple[SmsStatusRecord, str | None]]: The receipts to process again later
+    """
+    status_updates, retry_receipts = _match_receipts_to_notifications(receipts)
+    if not status_updates:
+        return retry_receipts
+
+    for _, sms_status in status_updates:
+        # Never include a status reason for a delivered notification.
+        if sms_status.status == NOTIFICATION_DELIVERED:
+            sms_status.status_reason = None
+
+    try:
+        updated_notifications = dao_update_sms_notifications_delivery_statuses(
+            [
+                {
+                    'notification_id': notification.id,
+                    'new_status': sms_status.status,
+                    'new_status_reason': sms_status.status_reason,
+                    'segments_count': sms_status.message_parts,
+                    'price_millicents': sms_status.price_millicents,
+                    'provider_updated_at': sms_status.provider_updated_at,
+                }
+                for notification, sms_status in status_updates
+            ]
+        )
+    except OperationalError as e:
+        for _, sms_status in status_updates:
+            statsd_client.incr(f'clients.sms.{sms_status.provider}.status_update.retry')
+        raise AutoRetryException(f'Found {type(e).__name__}, autoretrying...', e)
+    except Exception:
+        for _, sms_status in status_updates:
+            statsd_client.incr(f'clients.sms.{sms_status.provider}.status_update.error')
+        raise NonRetryableException('Unable to update notifications')
+
+    for _, sms_status in status_updates:
+        statsd_client.incr(f'clients.sms.{sms_status.provider}.delivery.status.{sms_status.status}')
+
+    _queue_batch_callbacks(updated_notifications, status_updates)
+    return retry_receipts
+
+
 def can_retry_sms_request(
     status: str,
     retries: int,
@@ -1,15 +1,25 @@
+from celery import Task
+from celery.utils.time import get_exponential_backoff_interval
 from flask import current_app
 from notifications_utils.statsd_decorators import statsd
 
 from app import notify_celery
-from app.celery.exceptions import AutoRetryException
+from app.celery.exceptions import AutoRetryException, NonRetryableException
 from app.clients.sms import SmsStatusRecord
 from app.celery.process_delivery_status_result_tasks import (
     sms_attempt_retry,
     sms_status_update,
+    sms_status_update_batch,
 )
+from app.config import QueueNames
 from app.constants import CELERY_RETRY_BACKOFF_MAX, STATUS_REASON_RETRYABLE
 
+# Seconds to wait before processing again the receipts whose notification was not found
+MISSING_NOTIFICATION_RETRY_DELAY = 10
+
+# Receipts published per batch task.  Keeps each pickled message well under the 256 KiB SQS limit.
+RECEIPT_BATCH_SIZE = 100
+
 
 @notify_celery.task(
     bind=True,
@@ -49,3 +59,74 @@ def process_pinpoint_v2_receipt_results(
         sms_attempt_retry(sms_status_record, event_timestamp)
     else:
         sms_status_update(sms_status_record, event_timestamp)
+
+
+@notify_celery.task(
+    bind=True,
+    name='process-pinpoint-v2-results-batch',
+    max_retries=585,
+    retry_backoff_max=CELERY_RETRY_BACKOFF_MAX,
+)
+@statsd(namespace='tasks')
+def process_pinpoint_v2_receipt_results_batch(
+    self: Task,
+    receipts: list[tuple[SmsStatusRecord, str | None]],
+) -> None:
+    """
+    Process up to RECEIPT_BATCH_SIZE Pinpoint Voice SMS V2 SMS stream events from a Firehose request.  Status updates
+    are applied with one query to find the notifications and one statement to update them.
+
+    Receipts that may have arrived before their notification was persisted are processed again in a new batch,
+    rather than by retrying this task, so the rest of the batch is not applied twice.  When the status updates fail
+    with a transient database error, the task is retried with only the receipts that were not applied.
+    """
+
+    current_app.logger.info('Processing %s Pinpoint Incoming SMS Voice V2 results.', len(receipts))
+
+    status_receipts = []
+    retry_receipts = []
+    for sms_status_record, event_timestamp in receipts:
+        if sms_status_record.status_reason != STATUS_REASON_RETRYABLE:
+            status_receipts.append((sms_status_record, event_timestamp))
+            continue
+
+        # Retryable failures requeue the notification, which is rare enough to do one at a time
+        try:
+            sms_attempt_retry(sms_status_record, event_timestamp)
+        except AutoRetryException:
+            retry_receipts.append((sms_status_record, event_timestamp))
+        except NonRetryableException:
+            current_app.logger.exception(
+                'Unable to process retryable Pinpoint V2 result for reference: %s', sms_status_record.reference
+            )
+
+    if status_receipts:
+        try:
+            retry_receipts.extend(sms_status_update_batch(status_receipts))
+        except AutoRetryException:
+            current_app.logger.warning(
+                'Retrying %s Pinpoint V2 results after a transient database error.', len(status_receipts)
+            )
+            raise self.retry(
+                args=[status_receipts + retry_receipts],
+                countdown=get_exponential_backoff_interval(
+                    factor=2,
+                    retries=self.request.retries,
+                    maximum=self.retry_backoff_max,
+                    full_jitter=True,
+                ),
+                serializer='pickle',
+            )
+
+    if retry_receipts:
+        current_app.logger.info(
+            'Notifications not found for %s Pinpoint V2 results, processing them again in %s seconds.',
+            len(retry_receipts),
+            MISSING_NOTIFICATION_RETRY_DELAY,
+        )
+        process_pinpoint_v2_receipt_results_batch.apply_async(
+            [retry_receipts],
+            queue=QueueNames.NOTIFY,
+            serializer='pickle',
+            countdown=MISSING_NOTIFICATION_RETRY_DELAY,
+        )
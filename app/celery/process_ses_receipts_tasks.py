@@ -1,4 +1,6 @@
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 from celery import Task
 import iso8601
 
@@ -16,9 +18,9 @@ from sqlalchemy.sql.dml import Update
 
 from notifications_utils.statsd_decorators import statsd
 
-from app import notify_celery, statsd_client
+from app import db, encryption, notify_celery, statsd_client
 from app.celery.common import log_notification_total_time
-from app.celery.exceptions import NonRetryableException
+from app.celery.exceptions import AutoRetryException, NonRetryableException
 from app.celery.send_va_profile_notification_status_tasks import check_and_queue_va_profile_notification_status_callback
 from app.celery.service_callback_tasks import publish_complaint
 from app.config import QueueNames
@@ -148,7 +150,77 @@ def process_ses_results(
             SES_PROVIDER,
         )
     else:
-        return _process_ses_results(task, celery_envelope, task.request.retries)
+        return _process_ses_results(task.retry, celery_envelope, task.request.retries)
+
+
+@notify_celery.task(name='process-ses-results-batch')
+@statsd(namespace='tasks')
+def process_ses_results_batch(celery_envelopes: list[dict]) -> None:
+    """
+    Process the SES results sent by one invocation of the SES callback lambda.  The notifications for the batch are
+    found with one query, and each result is then applied with one statement.
+
+    A result that must be processed again is requeued on its own as a process-ses-result task, so the rest of the
+    batch is not applied twice.  Each result is still committed on its own, but without expiring the session, so the
+    notifications found for the rest of the batch are not loaded again after every commit.
+    """
+
+    current_app.logger.info('Processing %s SES results.', len(celery_envelopes))
+
+    if is_feature_enabled(FeatureFlag.EMAIL_DELIVERY_STATUS_OVERHAUL):
+        for celery_envelope in celery_envelopes:
+            process_ses_results.apply_async([celery_envelope], queue=QueueNames.DELIVERY_STATUS_RESULT_TASKS)
+        return
+
+    # The guarded UPDATE in _apply_ses_update catches a notification that changed since it was read
+    session = db.session()
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        references = [_get_envelope_reference(celery_envelope) for celery_envelope in celery_envelopes]
+        notifications = _get_notifications_by_reference([reference for reference in references if reference])
+
+        for celery_envelope, reference in zip(celery_envelopes, references):
+            retry = partial(
+                process_ses_results.apply_async,
+                [celery_envelope],
+                retries=1,
+                countdown=process_ses_results.default_retry_delay,
+            )
+            try:
+                _process_ses_results(retry, celery_envelope, 0, notifications.get(reference))
+            except Exception:
+                current_app.logger.exception('Error processing SES result in batch: reference: %s', reference)
+    finally:
+        session.expire_on_commit = expire_on_commit
+
+
+def _get_envelope_reference(celery_envelope: dict) -> str | None:
+    """Return the SES message ID of a result, or None if it cannot be parsed.  _process_ses_results reports why."""
+
+    try:
+        return json.loads(celery_envelope['Message'])['mail']['messageId']
+    except (JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+def _get_notifications_by_reference(references: list[str]) -> dict[str, Notification]:
+    """Find the notifications for a batch of references with one query.  References matching more than one
+    notification are left out, so their results are looked up, and fail, one at a time as before."""
+
+    if not references:
+        return {}
+
+    by_reference = {}
+    duplicates = set()
+    for notification in notifications_dao.dao_get_notifications_by_references(references):
+        if notification.reference in by_reference:
+            duplicates.add(notification.reference)
+        by_reference[notification.reference] = notification
+
+    for reference in duplicates:
+        del by_reference[reference]
+    return by_reference
 
 
 def _parse_timestamp(value: str) -> datetime:
@@ -546,7 +618,58 @@ def _queue_callbacks(notification):
     check_and_queue_va_profile_notification_status_callback(notification)
 
 
-def _process_ses_results(task, response, celery_retry_count):  # noqa: C901 (too complex 20 > 10)
+def _apply_ses_update(
+    notification: Notification,
+    provider_updated_at: datetime,
+    increment_retry_count: bool,
+    **values,
+) -> None:
+    """Write the new state computed for a notification, and its provider_updated_at, with one guarded UPDATE.
+
+    Raises:
+        AutoRetryException: The notification's status changed after it was read, so the SES result must be processed
+            again
+    """
+    updated = notifications_dao.dao_update_notification_if_unchanged(
+        notification.id,
+        notification.status,
+        notification.status_reason,
+        increment_retry_count,
+        provider_updated_at=provider_updated_at,
+        **values,
+    )
+    if updated is None:
+        db.session.rollback()
+        raise AutoRetryException(f'Notification {notification.id} changed while its SES result was processed')
+
+    db.session.commit()
+    notifications_dao.apply_returned_values(notification, updated)
+
+    if increment_retry_count:
+        current_app.logger.info(
+            '_process_ses_results retry_attempt for notification %s, total retry_count now %s',
+            notification.id,
+            notification.retry_count,
+        )
+
+
+def _process_ses_results(  # noqa: C901 (too complex 20 > 10)
+    retry: Callable[..., None],
+    response: dict,
+    celery_retry_count: int,
+    notification: Notification | None = None,
+):
+    """Process one SES result.
+
+    The notification's new state is computed in memory and written with a single UPDATE, guarded on the status it
+    was computed from.
+
+    Args:
+        retry (Callable[..., None]): Called with the queue name to process the result again later
+        response (dict): The Celery envelope holding the SNS message
+        celery_retry_count (int): How many times the result has been retried
+        notification (Notification | None): The notification for the result, if it has already been fetched
+    """
     current_app.logger.debug('Full SES result response: %s', response)
 
     try:
@@ -577,18 +700,18 @@ def _process_ses_results(task, response, celery_retry_count):  # noqa: C901 (too
             notification_type = determine_notification_bounce_type(notification_type, ses_message)
         elif notification_type == 'Complaint':
             try:
-                notification = notifications_dao.dao_get_notification_history_by_reference(reference)
+                complaint_notification = notifications_dao.dao_get_notification_history_by_reference(reference)
             except Exception:
                 # we expect results or no results but it could be multiple results
                 message_time = iso8601.parse_date(ses_message['mail']['timestamp']).replace(tzinfo=None)
                 if datetime.utcnow() - message_time < timedelta(minutes=5):
-                    task.retry(queue=QueueNames.RETRY)
+                    retry(queue=QueueNames.RETRY)
                 else:
                     current_app.logger.warning('SES complaint: notification not found | reference: %s', reference)
                 return
 
-            complaint, recipient_email = handle_ses_complaint(ses_message, notification)
-            publish_complaint(complaint, notification, recipient_email)
+            complaint, recipient_email = handle_ses_complaint(ses_message, complaint_notification)
+            publish_complaint(complaint, complaint_notification, recipient_email)
             return
 
         aws_response_dict = get_aws_responses(notification_type)
@@ -596,40 +719,27 @@ def _process_ses_results(task, response, celery_retry_count):  # noqa: C901 (too
         # This is the prospective, updated status.
         incoming_status = aws_response_dict['notification_status']
 
-        try:
-            notification = notifications_dao.dao_get_notification_by_reference(reference)
-        except Exception:
-            # we expect results or no results but it could be multiple results
-            message_time = iso8601.parse_date(ses_message['mail']['timestamp']).replace(tzinfo=None)
-            if datetime.utcnow() - message_time < timedelta(minutes=5):
-                current_app.logger.info(
-                    'Retrying SES notification lookup for reference: %s. Sending to retry queue %s',
-                    reference,
-                    QueueNames.RETRY,
-                )
-                task.retry(queue=QueueNames.RETRY)
-            else:
-                current_app.logger.warning(
-                    'notification not found for reference: %s (update to %s)', reference, incoming_status
-                )
-            return
+        if notification is None:
+            try:
+                notification = notifications_dao.dao_get_notification_by_reference(reference)
+            except Exception:
+                # we expect results or no results but it could be multiple results
+                message_time = iso8601.parse_date(ses_message['mail']['timestamp']).replace(tzinfo=None)
+                if datetime.utcnow() - message_time < timedelta(minutes=5):
+                    current_app.logger.info(
+                        'Retrying SES notification lookup for reference: %s. Sending to retry queue %s',
+                        reference,
+                        QueueNames.RETRY,
+                    )
+                    retry(queue=QueueNames.RETRY)
+                else:
+                    current_app.logger.warning(
+                        'notification not found for reference: %s (update to %s)', reference, incoming_status
+                    )
+                return
 
         provider_updated_at = iso8601.parse_date(ses_message['mail']['timestamp']).replace(tzinfo=None)
-        if provider_updated_at:
-            current_app.logger.debug(
-                'Updating notification %s provider_updated_at to %s', notification.id, provider_updated_at
-            )
-            notifications_dao.dao_update_provider_updated_at(
-                notification_id=notification.id, provider_updated_at=provider_updated_at
-            )
-
-        if celery_retry_count > 0:
-            db_retry_count = notifications_dao.dao_increment_notification_retry_count(notification.id)
-            current_app.logger.info(
-                '_process_ses_results retry_attempt for notification %s, total retry_count now %s',
-                notification.id,
-                db_retry_count,
-            )
+        increment_retry_count = celery_retry_count > 0
 
         # Prevent regressing bounce status.  Note that this is a test of the existing status; not the new status.
         if notification.status_reason and (
@@ -642,12 +752,15 @@ def _process_ses_results(task, response, celery_retry_count):  # noqa: C901 (too
                 notification.id,
                 incoming_status,
             )
+            _apply_ses_update(notification, provider_updated_at, increment_retry_count)
             return
 
+        values = {}
+
         # Redact personalisation when an email is in a final state. An email may go from delivered to a bounce, but
         # that will not affect the redaction, as the email will not be retried.
         if incoming_status in (NOTIFICATION_DELIVERED, NOTIFICATION_PERMANENT_FAILURE):
-            notification.personalisation = {k: '<redacted>' for k in notification.personalisation}
+            values['_personalisation'] = encryption.encrypt({k: '<redacted>' for k in notification.personalisation})
 
         # This is a test of the new status.  Is it a bounce?
         if incoming_status in (NOTIFICATION_TEMPORARY_FAILURE, NOTIFICATION_PERMANENT_FAILURE):
@@ -659,9 +772,6 @@ def _process_ses_results(task, response, celery_retry_count):  # noqa: C901 (too
                 failure_reason = 'Temporarily failed to deliver email due to soft bounce'
                 status_reason = STATUS_REASON_RETRYABLE
 
-            notification.status_reason = status_reason
-            notification.status = incoming_status
-
             current_app.logger.warning(
                 '%s - %s - in process_ses_results for notification %s',
                 incoming_status,
@@ -669,20 +779,28 @@ def _process_ses_results(task, response, celery_retry_count):  # noqa: C901 (too
                 notification.id,
             )
 
-            notifications_dao.dao_update_notification(notification)
+            _apply_ses_update(
+                notification,
+                provider_updated_at,
+                increment_retry_count,
+                status=incoming_status,
+                status_reason=status_reason,
+                **values,
+            )
             check_and_queue_callback_task(notification)
             check_and_queue_va_profile_notification_status_callback(notification)
 
             return
         elif incoming_status == NOTIFICATION_DELIVERED:
             # Delivered messages should never have a status reason.
-            notification.status_reason = None
+            values['status_reason'] = None
 
         if notification.status not in (NOTIFICATION_SENDING, NOTIFICATION_PENDING):
             notifications_dao.duplicate_update_warning(notification, incoming_status)
+            _apply_ses_update(notification, provider_updated_at, increment_retry_count)
             return
 
-        notifications_dao._update_notification_status(notification=notification, status=incoming_status)
+        _apply_ses_update(notification, provider_updated_at, increment_retry_count, status=incoming_status, **values)
 
         if not aws_response_dict['success']:
             current_app.logger.info(
@@ -719,7 +837,7 @@ def _process_ses_results(task, response, celery_retry_count):  # noqa: C901 (too
     except Exception:
         current_app.logger.exception(
             'Error processing SES results: reference: %s | notification_id: %s',
-            notification.reference,
-            notification.id,
+            reference,
+            None if notification is None else notification.id,
         )
-        task.retry(queue=QueueNames.RETRY)
+        retry(queue=QueueNames.RETRY)
@@ -110,9 +110,15 @@ def deliver_sms_with_rate_limiting(
     task: Task,
     notification_id,
     sms_sender_id=None,
+    sms_sender_slot_reserved=False,
 ):
     from app.notifications.validators import check_sms_sender_over_rate_limit
 
+    if sms_sender_slot_reserved and task.request.kwargs:
+        # The reserved slot covers this attempt only.  Retries reuse the request's kwargs, so clear the flag before
+        # anything can raise, and any later attempt checks the rate limit again.
+        task.request.kwargs['sms_sender_slot_reserved'] = False
+
     current_app.logger.info(
         'Start sending SMS with rate limiting for notification id: %s',
         notification_id,
@@ -139,7 +145,8 @@ def deliver_sms_with_rate_limiting(
             notification.service_id, str(notification.reply_to_text)
         )
 
-        check_sms_sender_over_rate_limit(notification.service_id, sms_sender)
+        if not sms_sender_slot_reserved:
+            check_sms_sender_over_rate_limit(notification.service_id, sms_sender)
         send_to_providers.send_sms_to_provider(notification, sms_sender_id)
         current_app.logger.info(
             'Successfully sent sms with rate limiting for notification id: %s',
@@ -147,17 +154,28 @@ def deliver_sms_with_rate_limiting(
             extra={'sms_sender_id': sms_sender_id, 'template_id': notification.template_id},
         )
 
-    except RateLimitError:
+    except RateLimitError as e:
         # Floor it
         retry_time = sms_sender.rate_limit_interval // sms_sender.rate_limit
+        if e.slot_reserved:
+            # A slot is held for this message, so send it exactly then
+            countdown = e.retry_after
+        else:
+            # Retry when a slot is next free, or after the interval, with jitter so many requests at the same time get
+            # spread out (non-exponential)
+            countdown = (retry_time if e.retry_after is None else e.retry_after) + randint(0, retry_time)  # nosec B311
         current_app.logger.info(
             'SMS notification delivery for id: %s failed due to rate limit being exceeded. Will retry in %s seconds.',
             notification_id,
-            retry_time,
+            countdown,
             extra={'sms_sender_id': sms_sender_id, 'template_id': notification.template_id},
         )
-        # Retry after the interval and with jitter so many requests at the same time get spread out (non-exponential)
-        task.retry(queue=QueueNames.RETRY, max_retries=None, countdown=(retry_time + randint(0, retry_time)))  # nosec B311
+        task.retry(
+            queue=QueueNames.RETRY,
+            max_retries=None,
+            countdown=countdown,
+            kwargs={**(task.request.kwargs or {}), 'sms_sender_slot_reserved': e.slot_reserved},
+        )
 
     except Exception as e:
         _handle_delivery_failure(task, notification, 'deliver_sms_with_rate_limiting', e, notification_id, SMS_TYPE)
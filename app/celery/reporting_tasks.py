@@ -10,7 +10,6 @@ from app.dao.fact_billing_dao import (
     update_fact_billing,
 )
 from app.dao.fact_notification_status_dao import (
-    fetch_notification_status_for_day,
     update_fact_notification_status,
     fetch_notification_statuses_per_service_and_template_for_date,
 )
@@ -57,8 +56,7 @@ def create_nightly_billing_for_day(process_day):
         'create-nightly-billing-for-day %s fetched in %s seconds', process_day, (end - start).seconds
     )
 
-    for data in transit_data:
-        update_fact_billing(data, process_day)
+    update_fact_billing(transit_data, process_day)
 
     current_app.logger.info(
         'create-nightly-billing-for-day task complete. %s rows updated for day: %s', len(transit_data), process_day
@@ -128,18 +126,32 @@ def create_nightly_notification_status_for_day(process_day):
     process_day = datetime.strptime(process_day, '%Y-%m-%d').date()
 
     start = datetime.utcnow()
-    transit_data = fetch_notification_status_for_day(process_day=process_day)
+    rows_updated = update_fact_notification_status(process_day)
     end = datetime.utcnow()
+
     current_app.logger.info(
-        'create-nightly-notification-status-for-day %s fetched in %s seconds', process_day, (end - start).seconds
+        'create-nightly-notification-status-for-day task complete: %s rows updated for day: %s in %s seconds',
+        rows_updated,
+        process_day,
+        (end - start).seconds,
     )
 
-    update_fact_notification_status(transit_data, process_day)
+
+@notify_celery.task(name='update-fact-notification-status-for-today')
+@statsd(namespace='tasks')
+def update_fact_notification_status_for_today():
+    # Keeps today's ft_notification_status rows current so statistics do not need to read notifications.
+    process_day = convert_utc_to_local_timezone(datetime.utcnow()).date()
+
+    start = datetime.utcnow()
+    rows_updated = update_fact_notification_status(process_day)
+    end = datetime.utcnow()
 
     current_app.logger.info(
-        'create-nightly-notification-status-for-day task complete: %s rows updated for day: %s',
-        len(transit_data),
+        'update-fact-notification-status-for-today task complete: %s rows updated for day: %s in %s seconds',
+        rows_updated,
         process_day,
+        (end - start).seconds,
     )
 
 
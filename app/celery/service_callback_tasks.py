@@ -2,13 +2,13 @@ import json
 
 from celery import Task
 from flask import current_app
-from requests import post
 from requests.exceptions import Timeout, RequestException
 from sqlalchemy.orm.exc import NoResultFound
 
 from notifications_utils.statsd_decorators import statsd
 
 from app import notify_celery, encryption, statsd_client
+from app.callback.http_session import get_callback_session
 from app.callback.queue_callback_strategy import QueueCallbackStrategy
 from app.callback.webhook_callback_strategy import generate_callback_signature, WebhookCallbackStrategy
 from app.celery.exceptions import AutoRetryException, NonRetryableException, RetryableException
@@ -30,6 +30,7 @@ from app.dao.service_callback_api_dao import (
 )
 from app.dao.service_sms_sender_dao import dao_get_service_sms_sender_by_service_id_and_number
 from app.dao.templates_dao import dao_get_template_by_id
+from app.feature_flags import FeatureFlag, is_feature_enabled
 from app.models import (
     Complaint,
     Notification,
@@ -53,24 +54,11 @@ def service_callback_send(
         raise RuntimeError(f'Unrecognized callback channel: {service_callback.callback_channel}')
 
 
-@notify_celery.task(
-    bind=True,
-    name='send-delivery-status',
-    throws=(AutoRetryException,),
-    autoretry_for=(AutoRetryException,),
-    max_retries=60,
-    retry_backoff=True,
-    retry_backoff_max=CELERY_RETRY_BACKOFF_MAX,
-)
-@statsd(namespace='tasks')
-def send_delivery_status_to_service(
-    self: Task,
-    service_callback_id,
+def create_delivery_status_payload(
     notification_id,
     encrypted_status_update,
-):
-    service_callback: DeliveryStatusCallbackApiData = get_service_callback(service_callback_id)
-    # create_delivery_status_callback
+) -> dict:
+    """Build the body of a delivery status callback from the status update queued with it."""
     status_update = encryption.decrypt(encrypted_status_update)
 
     payload = {
@@ -91,6 +79,28 @@ def send_delivery_status_to_service(
     if 'provider_payload' in status_update:
         payload['provider_payload'] = status_update['provider_payload']
 
+    return payload
+
+
+@notify_celery.task(
+    bind=True,
+    name='send-delivery-status',
+    throws=(AutoRetryException,),
+    autoretry_for=(AutoRetryException,),
+    max_retries=60,
+    retry_backoff=True,
+    retry_backoff_max=CELERY_RETRY_BACKOFF_MAX,
+)
+@statsd(namespace='tasks')
+def send_delivery_status_to_service(
+    self: Task,
+    service_callback_id,
+    notification_id,
+    encrypted_status_update,
+):
+    service_callback: DeliveryStatusCallbackApiData = get_service_callback(service_callback_id)
+    payload = create_delivery_status_payload(notification_id, encrypted_status_update)
+
     logging_tags = {'notification_id': str(notification_id)}
 
     try:
@@ -363,6 +373,16 @@ def create_complaint_callback_data(
     return encryption.encrypt(data)
 
 
+def delivery_status_callback_queue(callback_channel: str) -> str:
+    """
+    Return the queue for a delivery status callback.  Webhooks are sent by run_callback_dispatcher.py when it is
+    enabled, so a slow service cannot occupy the Celery workers that send everyone else's callbacks.
+    """
+    if callback_channel == WEBHOOK_CHANNEL_TYPE and is_feature_enabled(FeatureFlag.CALLBACK_DISPATCHER_ENABLED):
+        return QueueNames.DELIVERY_STATUS_CALLBACKS
+    return QueueNames.CALLBACKS
+
+
 def check_and_queue_service_callback_task(notification: Notification, payload=None):
     # https://peps.python.org/pep-0557/#mutable-default-values
     # do not want to have mutable type in definition so we set provider_payload to empty dictionary
@@ -385,7 +405,7 @@ def check_and_queue_service_callback_task(notification: Notification, payload=No
                 'notification_id': str(notification.id),
                 'encrypted_status_update': notification_data,
             },
-            queue=QueueNames.CALLBACKS,
+            queue=delivery_status_callback_queue(service_callback_api.callback_channel),
         )
     else:
         current_app.logger.debug(
@@ -424,7 +444,7 @@ def send_delivery_status_from_notification(
     """
     try:
         with statsd_http('send_delivery_status_from_notification'):
-            response = post(
+            response = get_callback_session().post(
                 url=callback_url,
                 data=json.dumps(notification_data),
                 headers={
@@ -490,7 +510,7 @@ def check_and_queue_notification_callback_task(notification: Notification) -> No
             'notification_data': notification_data,
             'notification_id': str(notification.id),
         },
-        queue=QueueNames.CALLBACKS,
+        queue=delivery_status_callback_queue(WEBHOOK_CHANNEL_TYPE),
     )
 
 
@@ -1,5 +1,9 @@
+import csv
+import io
+import json
 from datetime import datetime
 from collections import namedtuple, defaultdict
+from itertools import islice
 
 from flask import current_app
 from notifications_utils.recipients import RecipientCSV
@@ -54,10 +58,21 @@ from app.dao.services_dao import dao_fetch_service_by_id, fetch_todays_total_mes
 from app.dao.templates_dao import dao_get_template_by_id
 from app.exceptions import DVLAException
 from app.models import DailySortedLetter
-from app.notifications.process_notifications import persist_notification
+from app.notifications.process_notifications import (
+    persist_notification,
+    persist_notifications_bulk,
+    send_notifications_to_queue_in_batches,
+)
 from app.service.utils import service_allowed_to_send_to
 from app.utils import create_uuid
 
+# The most CSV rows published to, and persisted by, each save batch task
+JOB_ROW_CHUNK_SIZE = 500
+
+# The most bytes of JSON rows published to each save batch task.  The task message is signed and base64 encoded,
+# and then base64 encoded again by the SQS transport, so it grows to almost twice this.  SQS accepts up to 256 KiB.
+JOB_CHUNK_MAX_BYTES = 96 * 1024
+
 
 @notify_celery.task(name='process-job')
 @statsd(namespace='tasks')
@@ -93,12 +108,7 @@ def process_job(
 
     current_app.logger.debug('Starting job %s processing %s notifications', job_id, job.notification_count)
 
-    for row in RecipientCSV(
-        s3.get_job_from_s3(str(service.id), str(job_id)),
-        template_type=template.template_type,
-        placeholders=template.placeholder_names,
-    ).get_rows():
-        process_row(row, template, job, service, sender_id=sender_id)
+    process_rows(get_job_rows(job, template), template, job, service, sender_id=sender_id)
 
     job_complete(job, start=start)
 
@@ -122,6 +132,129 @@ def job_complete(
         )
 
 
+def get_job_rows(
+    job,
+    template,
+    resume_from_row=-1,
+):
+    """
+    Stream the rows of a job's CSV file from S3.  Records are read with csv.reader, so a quoted value may span
+    lines, and validated by RecipientCSV JOB_ROW_CHUNK_SIZE records at a time, with the header prepended to each
+    chunk, so neither the file nor its parsed rows are held in memory in full.
+
+    Rows up to and including resume_from_row are skipped without being validated.
+    """
+
+    records = csv.reader(
+        s3.get_job_lines_from_s3(str(job.service_id), str(job.id)),
+        quoting=csv.QUOTE_MINIMAL,
+        skipinitialspace=True,
+    )
+
+    # RecipientCSV strips leading blank lines from the file, so the header is the first record with content.
+    header = next((record for record in records if any(field.strip() for field in record)), None)
+
+    if header is None:
+        return
+
+    offset = resume_from_row + 1
+
+    for _ in islice(records, offset):
+        pass
+
+    # Row indexes count records, including blank ones, as they do when RecipientCSV parses the whole file.
+    while chunk := list(islice(records, JOB_ROW_CHUNK_SIZE)):
+        chunk_file = io.StringIO()
+        csv.writer(chunk_file).writerows([header, *chunk])
+
+        for row in RecipientCSV(
+            chunk_file.getvalue(),
+            template_type=template.template_type,
+            placeholders=template.placeholder_names,
+        ).get_rows():
+            # Row indexes are relative to the chunk.
+            row.index += offset
+            yield row
+
+        offset += len(chunk)
+
+
+def process_rows(
+    rows,
+    template,
+    job,
+    service,
+    sender_id=None,
+):
+    """
+    Publish the rows of a job to the save task for the template type.  SMS and e-mail rows are published in chunks
+    of up to JOB_ROW_CHUNK_SIZE rows and JOB_CHUNK_MAX_BYTES, one task per chunk, and letter rows are published one
+    task per row.
+    """
+
+    if template.template_type == LETTER_TYPE:
+        for row in rows:
+            process_row(row, template, job, service, sender_id=sender_id)
+        return
+
+    chunk = []
+    chunk_bytes = 0
+    for row in rows:
+        job_row = {
+            'id': create_uuid(),
+            'to': row.recipient,
+            'row_number': row.index,
+            'personalisation': dict(row.personalisation),
+        }
+        row_bytes = len(json.dumps(job_row))
+
+        if chunk and (len(chunk) == JOB_ROW_CHUNK_SIZE or chunk_bytes + row_bytes > JOB_CHUNK_MAX_BYTES):
+            process_row_chunk(chunk, template, job, service, sender_id=sender_id)
+            chunk = []
+            chunk_bytes = 0
+
+        chunk.append(job_row)
+        chunk_bytes += row_bytes
+
+    if chunk:
+        process_row_chunk(chunk, template, job, service, sender_id=sender_id)
+
+
+def process_row_chunk(
+    rows: list[dict],
+    template,
+    job,
+    service,
+    sender_id=None,
+):
+    template_type = template.template_type
+    encrypted = encryption.encrypt(
+        {
+            'template': str(template.id),
+            'template_version': job.template_version,
+            'job': str(job.id),
+            'rows': rows,
+        }
+    )
+
+    send_fns = {SMS_TYPE: save_sms_batch, EMAIL_TYPE: save_email_batch}
+
+    send_fn = send_fns[template_type]
+
+    task_kwargs = {}
+    if sender_id and template_type == SMS_TYPE:
+        task_kwargs['sender_id'] = sender_id
+
+    send_fn.apply_async(
+        (
+            str(service.id),
+            encrypted,
+        ),
+        task_kwargs,
+        queue=QueueNames.NOTIFY,
+    )
+
+
 def process_row(
     row,
     template,
@@ -293,6 +426,127 @@ def save_email(
         handle_exception(self, notification, notification_id, e)
 
 
+@notify_celery.task(bind=True, name='save-sms-batch', max_retries=5, default_retry_delay=300)
+@statsd(namespace='tasks')
+def save_sms_batch(
+    self,
+    service_id,
+    encrypted_notifications,
+    sender_id=None,
+):
+    batch = encryption.decrypt(encrypted_notifications)
+    service = dao_fetch_service_by_id(service_id)
+    template = dao_get_template_by_id(batch['template'], version=batch['template_version'])
+
+    if sender_id:
+        reply_to_text = dao_get_service_sms_sender_by_id(str(service_id), str(sender_id)).sms_sender
+    else:
+        reply_to_text = template.get_reply_to_text()
+
+    _save_notification_batch(self, batch, service, SMS_TYPE, reply_to_text, sender_id)
+
+
+@notify_celery.task(bind=True, name='save-email-batch', max_retries=5, default_retry_delay=300)
+@statsd(namespace='tasks')
+def save_email_batch(
+    self,
+    service_id,
+    encrypted_notifications,
+):
+    batch = encryption.decrypt(encrypted_notifications)
+    service = dao_fetch_service_by_id(service_id)
+    template = dao_get_template_by_id(batch['template'], version=batch['template_version'])
+
+    _save_notification_batch(self, batch, service, EMAIL_TYPE, template.get_reply_to_text())
+
+
+def _save_notification_batch(
+    task,
+    batch,
+    service,
+    notification_type,
+    reply_to_text,
+    sender_id=None,
+):
+    """
+    Persist the rows of a job chunk in one transaction, and enqueue their delivery tasks.  The chunk is retried as a
+    whole if the transaction fails.  Notifications that cannot be enqueued are deleted, so the task is retried with
+    only their rows.
+    """
+
+    rows = [row for row in batch['rows'] if service_allowed_to_send_to(row['to'], service, KEY_TYPE_NORMAL)]
+
+    if len(rows) < len(batch['rows']):
+        current_app.logger.info(
+            '%s %s notifications for job %s failed as restricted service',
+            len(batch['rows']) - len(rows),
+            notification_type,
+            batch['job'],
+        )
+
+    if not rows:
+        return
+
+    try:
+        notifications = persist_notifications_bulk(
+            template_id=batch['template'],
+            template_version=batch['template_version'],
+            service_id=service.id,
+            notification_type=notification_type,
+            api_key_id=None,
+            key_type=KEY_TYPE_NORMAL,
+            recipients=[
+                {
+                    'notification_id': row['id'],
+                    'recipient': row['to'],
+                    'personalisation': row.get('personalisation'),
+                    'job_row_number': row['row_number'],
+                }
+                for row in rows
+            ],
+            created_at=datetime.utcnow(),
+            job_id=batch['job'],
+            reply_to_text=reply_to_text,
+        )
+    except SQLAlchemyError as e:
+        # The chunk is persisted atomically, so its first notification indicates whether it was saved.
+        handle_exception(task, {'job': batch['job'], 'row_number': rows[0]['row_number']}, rows[0]['id'], e)
+        return
+
+    failed = send_notifications_to_queue_in_batches(notifications, service.research_mode, sender_id)
+
+    current_app.logger.debug(
+        '%s %s notifications created for job %s rows %s to %s',
+        len(notifications) - len(failed),
+        notification_type,
+        batch['job'],
+        rows[0]['row_number'],
+        rows[-1]['row_number'],
+    )
+
+    if failed:
+        failed_ids = {str(notification.id) for notification in failed}
+        failed_rows = [row for row in rows if row['id'] in failed_ids]
+        current_app.logger.error(
+            'Retrying %s %s notifications for job %s that could not be queued',
+            len(failed_rows),
+            notification_type,
+            batch['job'],
+        )
+        try:
+            task.retry(
+                args=(str(service.id), encryption.encrypt({**batch, 'rows': failed_rows})),
+                queue=QueueNames.RETRY,
+            )
+        except task.MaxRetriesExceededError:
+            current_app.logger.error(
+                'Max retry failed %s notifications for job %s rows %s',
+                notification_type,
+                batch['job'],
+                [row['row_number'] for row in failed_rows],
+            )
+
+
 @notify_celery.task(bind=True, name='save-letter', max_retries=5, default_retry_delay=300)
 @statsd(namespace='tasks')
 def save_letter(
@@ -525,12 +779,6 @@ def process_incomplete_job(job_id):
     TemplateClass = get_template_class(db_template.template_type)
     template = TemplateClass(db_template.__dict__)
 
-    for row in RecipientCSV(
-        s3.get_job_from_s3(str(job.service_id), str(job.id)),
-        template_type=template.template_type,
-        placeholders=template.placeholder_names,
-    ).get_rows():
-        if row.index > resume_from_row:
-            process_row(row, template, job, job.service)
+    process_rows(get_job_rows(job, template, resume_from_row), template, job, job.service)
 
     job_complete(job, resumed=True)
@@ -33,6 +33,8 @@ env_name_map = {'development': 'dev', 'test': 'test', 'staging': 'staging', 'pro
 class QueueNames(object):
     CALLBACKS = 'service-callbacks'
     COMMUNICATION_ITEM_PERMISSIONS = 'communication-item-permissions'
+    # Consumed by run_callback_dispatcher.py rather than Celery workers, so it is not in all_queues
+    DELIVERY_STATUS_CALLBACKS = 'delivery-status-callbacks'
     DELIVERY_STATUS_RESULT_TASKS = 'delivery-status-result-tasks'
     LOOKUP_CONTACT_INFO = 'lookup-contact-info-tasks'
     LOOKUP_VA_PROFILE_ID = 'lookup-va-profile-id-tasks'
@@ -174,6 +176,20 @@ class Config(object):
     SQLALCHEMY_POOL_TIMEOUT = 30
     SQLALCHEMY_POOL_RECYCLE = 300
     SQLALCHEMY_STATEMENT_TIMEOUT = 1200
+    # Service callbacks reuse keep-alive connections, pooled per host, for up to this many hosts per process
+    CALLBACK_HTTP_POOL_CONNECTIONS = int(os.getenv('CALLBACK_HTTP_POOL_CONNECTIONS', 20))
+    # Connections kept alive per callback host per process
+    CALLBACK_HTTP_POOL_MAXSIZE = int(os.getenv('CALLBACK_HTTP_POOL_MAXSIZE', 10))
+    CALLBACK_HTTP_CONNECT_RETRIES = int(os.getenv('CALLBACK_HTTP_CONNECT_RETRIES', 1))
+    # Delivery status callbacks in flight at once in run_callback_dispatcher.py
+    CALLBACK_DISPATCHER_MAX_IN_FLIGHT = int(os.getenv('CALLBACK_DISPATCHER_MAX_IN_FLIGHT', 100))
+    # Callbacks that cannot start within this many seconds are returned to the queue
+    CALLBACK_DISPATCHER_START_TIMEOUT = int(os.getenv('CALLBACK_DISPATCHER_START_TIMEOUT', 10))
+    # Callbacks in flight to, and started per second for, each host
+    CALLBACK_DISPATCHER_HOST_CONCURRENCY = int(os.getenv('CALLBACK_DISPATCHER_HOST_CONCURRENCY', 10))
+    CALLBACK_DISPATCHER_HOST_RATE = float(os.getenv('CALLBACK_DISPATCHER_HOST_RATE', 50))
+    # Threads building callbacks, which read the database, off the dispatcher's event loop
+    CALLBACK_DISPATCHER_PREPARE_THREADS = int(os.getenv('CALLBACK_DISPATCHER_PREPARE_THREADS', 4))
     PAGE_SIZE = 50
     API_PAGE_SIZE = 250
     TEST_MESSAGE_FILENAME = 'Test message'
@@ -285,6 +301,11 @@ class Config(object):
                 'schedule': crontab(hour=0, minute=30),
                 'options': {'queue': QueueNames.NOTIFY},
             },
+            'update-fact-notification-status-for-today': {
+                'task': 'update-fact-notification-status-for-today',
+                'schedule': crontab(minute='*/5'),
+                'options': {'queue': QueueNames.PERIODIC},
+            },
             'delete-sms-notifications': {
                 'task': 'delete-sms-notifications',
                 'schedule': crontab(hour=4, minute=15),  # after 'create-nightly-notification-status'
@@ -300,6 +321,11 @@ class Config(object):
                 'schedule': crontab(hour=4, minute=45),  # after 'create-nightly-notification-status'
                 'options': {'queue': QueueNames.PERIODIC},
             },
+            'maintain-notification-partitions': {
+                'task': 'maintain-notification-partitions',
+                'schedule': crontab(hour=5, minute=0),  # after the 'delete-*-notifications' tasks
+                'options': {'queue': QueueNames.PERIODIC},
+            },
             'delete-inbound-sms': {
                 'task': 'delete-inbound-sms',
                 'schedule': crontab(hour=1, minute=40),
@@ -12,6 +12,7 @@ DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
 DATE_FORMAT = '%Y-%m-%d'
 HTTP_TIMEOUT = (3.05, 5) if os.getenv('NOTIFY_ENVIRONMENT') in ('production', 'staging') else (30, 30)
 INTERNAL_PROCESSING_LIMIT = 4.0  # seconds
+BULK_NOTIFICATION_MAX_RECIPIENTS = 5000
 
 # Celery
 CELERY_RETRY_BACKOFF_MAX = 300
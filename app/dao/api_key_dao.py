@@ -7,6 +7,7 @@ from sqlalchemy import select, and_, or_
 from sqlalchemy.orm.exc import NoResultFound
 
 from app import db
+from app.dao.cache_invalidation import SERVICES, invalidate_after_commit
 from app.dao.dao_utils import transactional, version_class
 from app.models import ApiKey
 
@@ -30,6 +31,7 @@ def save_model_api_key(api_key: ApiKey, secret_generator: Callable[[], str] | No
         else:
             api_key.secret = secrets.token_urlsafe(64)
 
+    invalidate_after_commit(SERVICES)
     db.session.add(api_key)
 
 
@@ -65,6 +67,7 @@ def update_api_key_expiry(
     api_key: ApiKey = db.session.scalars(stmt).one()
     api_key.expiry_date = expiry_date
 
+    invalidate_after_commit(SERVICES)
     db.session.add(api_key)
 
 
@@ -86,6 +89,7 @@ def expire_api_key(
     api_key.expiry_date = datetime.now(timezone.utc)
     api_key.revoked = True
 
+    invalidate_after_commit(SERVICES)
     db.session.add(api_key)
 
 
@@ -0,0 +1,120 @@
+"""
+Cross-process invalidation for the in-process caches in front of DAO reads.
+
+Each cache belongs to a namespace with a version counter in Redis.  Writers call invalidate_after_commit with the
+namespaces their change affects, and once the transaction commits the counters are incremented.  Every process
+compares a namespace's counter with the version its caches were filled under at most once every
+CACHE_VERSION_CHECK_SECONDS, and clears them when the counter has moved.  Changes therefore reach every gunicorn and
+Celery process within seconds, so the caches' TTLs only bound staleness when Redis is unavailable.  Data that only
+changes in exceptional cases, such as a template version, is kept in InvalidatedLRUCache instances without a TTL.
+"""
+
+from collections import defaultdict
+from time import monotonic
+
+from cachetools import LRUCache, TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db, redis_store
+
+# How often, in seconds, a process checks whether a namespace's caches have been invalidated
+CACHE_VERSION_CHECK_SECONDS = 5
+
+# TTL, in seconds, for caches that are invalidated on write
+INVALIDATED_CACHE_TTL = 6 * 60 * 60
+
+PROVIDER_DETAILS = 'provider-details'
+SERVICE_CALLBACKS = 'service-callbacks'
+SERVICES = 'services'
+SMS_SENDERS = 'sms-senders'
+TEMPLATES = 'templates'
+TEMPLATE_VERSIONS = 'template-versions'
+
+# Namespaces pending invalidation are kept in Session.info under this key until the transaction ends
+_PENDING_INVALIDATIONS = 'pending_cache_invalidations'
+
+_caches: dict[str, list['InvalidatedCache']] = defaultdict(list)
+
+
+def _version_key(namespace: str) -> str:
+    return f'cache-version-{namespace}'
+
+
+class InvalidatedCache:
+    """Mixin for cachetools caches that are cleared when their namespace is invalidated in any process."""
+
+    def __init__(
+        self,
+        namespace: str,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.namespace = namespace
+        self._version = None
+        self._checked_at = float('-inf')
+        _caches[namespace].append(self)
+
+    def _check_version(self) -> None:
+        now = monotonic()
+        if now - self._checked_at >= CACHE_VERSION_CHECK_SECONDS:
+            # Set first, because clearing the cache reads items through the methods that call this.
+            self._checked_at = now
+            version = redis_store.get(_version_key(self.namespace))
+            if version != self._version:
+                self._version = version
+                self.clear()
+
+    def __contains__(self, key):
+        self._check_version()
+        return super().__contains__(key)
+
+    def __getitem__(self, key):
+        self._check_version()
+        return super().__getitem__(key)
+
+
+class InvalidatedTTLCache(InvalidatedCache, TTLCache):
+    def __init__(
+        self,
+        namespace: str,
+        maxsize,
+        ttl=INVALIDATED_CACHE_TTL,
+        **kwargs,
+    ):
+        super().__init__(namespace, maxsize, ttl, **kwargs)
+
+
+class InvalidatedLRUCache(InvalidatedCache, LRUCache):
+    """For values that only change in exceptional cases, so entries need no TTL."""
+
+
+def invalidate(*namespaces: str) -> None:
+    """Clear the namespaces' caches in this process now, and in every other process within seconds."""
+
+    for namespace in namespaces:
+        redis_store.incr(_version_key(namespace))
+        for cache in _caches[namespace]:
+            cache.clear()
+
+
+def invalidate_after_commit(*namespaces: str) -> None:
+    """
+    Invalidate the namespaces once the current transaction commits.  Invalidating before then would let another
+    process refill its cache with the data being replaced.
+    """
+
+    db.session.info.setdefault(_PENDING_INVALIDATIONS, set()).update(namespaces)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_pending(session: Session) -> None:
+    namespaces = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if namespaces:
+        invalidate(*namespaces)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
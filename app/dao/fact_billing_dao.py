@@ -20,11 +20,15 @@ from app.models import (
     Template,
 )
 from app.utils import get_local_timezone_midnight_in_utc
-from collections.abc import Iterable
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable
 from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from operator import attrgetter
 from flask import current_app
 from notifications_utils.timezones import convert_local_timezone_to_utc, convert_utc_to_local_timezone
-from sqlalchemy import func, case, delete, desc, Date, Integer, and_, select, union_all
+from sqlalchemy import func, case, delete, Date, Integer, and_, select, union_all
 from sqlalchemy.dialects.postgresql import insert
 from uuid import UUID
 
@@ -184,10 +188,10 @@ def fetch_monthly_billing_for_year(
     # if year end date is less than today, we are calculating for data in the past and have no need for deltas.
     if year_end_date >= today:
         yesterday = today - timedelta(days=1)
+        rates = get_rates_for_billing()
         for day in [yesterday, today]:
             data = fetch_billing_data_for_day(process_day=day, service_id=service_id)
-            for d in data:
-                update_fact_billing(data=d, process_day=day)
+            update_fact_billing(data, day, rates)
 
     email_and_letters_stmt = (
         select(
@@ -356,10 +360,48 @@ def _query_for_billing_data(
     return db.session.execute(stmt).all()
 
 
-def get_rates_for_billing():
-    non_letter_rates = db.session.scalars(select(Rate).order_by(desc(Rate.valid_from))).all()
-    letter_rates = db.session.scalars(select(LetterRate).order_by(desc(LetterRate.start_date))).all()
-    return non_letter_rates, letter_rates
+class RateIndex:
+    """
+    Rates grouped by the attributes a rate is chosen on, each group sorted by the date it came into effect, so the
+    rate in effect on a day is found by bisection rather than by scanning every rate.
+    """
+
+    def __init__(
+        self,
+        rates: Iterable[Rate | LetterRate],
+        key: Callable[[Rate | LetterRate], Hashable],
+        start: Callable[[Rate | LetterRate], datetime],
+    ):
+        self._starts: dict[Hashable, list[datetime]] = defaultdict(list)
+        self._rates: dict[Hashable, list[float | Decimal]] = defaultdict(list)
+        for rate in sorted(rates, key=start):
+            self._starts[key(rate)].append(start(rate))
+            self._rates[key(rate)].append(rate.rate)
+
+    @classmethod
+    def for_non_letter_rates(cls, rates: Iterable[Rate]) -> 'RateIndex':
+        return cls(rates, key=attrgetter('notification_type'), start=attrgetter('valid_from'))
+
+    @classmethod
+    def for_letter_rates(cls, rates: Iterable[LetterRate]) -> 'RateIndex':
+        return cls(rates, key=attrgetter('crown', 'sheet_count', 'post_class'), start=attrgetter('start_date'))
+
+    def get(
+        self,
+        key: Hashable,
+        when: datetime,
+    ) -> float | Decimal:
+        """Return the latest rate for key that came into effect on or before when."""
+        i = bisect_right(self._starts.get(key, ()), when)
+        if i == 0:
+            raise LookupError(f'No rate for {key} in effect on {when}')
+        return self._rates[key][i - 1]
+
+
+def get_rates_for_billing() -> tuple[RateIndex, RateIndex]:
+    non_letter_rates = db.session.scalars(select(Rate)).all()
+    letter_rates = db.session.scalars(select(LetterRate)).all()
+    return RateIndex.for_non_letter_rates(non_letter_rates), RateIndex.for_letter_rates(letter_rates)
 
 
 def get_service_ids_that_need_billing_populated(
@@ -381,70 +423,78 @@ def get_service_ids_that_need_billing_populated(
 
 
 def get_rate(
-    non_letter_rates, letter_rates, notification_type, date, crown=None, letter_page_count=None, post_class='second'
+    non_letter_rates: RateIndex,
+    letter_rates: RateIndex,
+    notification_type,
+    date,
+    crown=None,
+    letter_page_count=None,
+    post_class='second',
 ):
     start_of_day = get_local_timezone_midnight_in_utc(date)
 
     if notification_type == LETTER_TYPE:
         if letter_page_count == 0:
             return 0
-        return next(
-            r.rate
-            for r in letter_rates
-            if (
-                start_of_day >= r.start_date
-                and crown == r.crown
-                and letter_page_count == r.sheet_count
-                and post_class == r.post_class
-            )
-        )
+        return letter_rates.get((crown, letter_page_count, post_class), start_of_day)
     elif notification_type == SMS_TYPE:
-        return next(
-            r.rate
-            for r in non_letter_rates
-            if (notification_type == r.notification_type and start_of_day >= r.valid_from)
-        )
+        return non_letter_rates.get(notification_type, start_of_day)
     else:
         return 0
 
 
 def update_fact_billing(
-    data,
+    transit_data,
     process_day,
-):
-    non_letter_rates, letter_rates = get_rates_for_billing()
-    rate = get_rate(
-        non_letter_rates,
-        letter_rates,
-        data.notification_type,
-        process_day,
-        data.crown,
-        data.letter_page_count,
-        data.postage,
-    )
-    billing_record = create_billing_record(data, rate, process_day)
+    rates: tuple[RateIndex, RateIndex] | None = None,
+) -> None:
+    """
+    Upsert the ft_billing rows for the rows returned by fetch_billing_data_for_day in a single statement.
+
+    rates is the result of get_rates_for_billing, and can be passed in to avoid reloading the rates when processing
+    several days.
+    """
+
+    non_letter_rates, letter_rates = rates if rates is not None else get_rates_for_billing()
+
+    # Rows for letters with different page counts can share a primary key.  The upsert can only touch a row once, so
+    # keep the last one, as the old row-by-row upsert did.
+    billing_records = {}
+    for data in transit_data:
+        rate = get_rate(
+            non_letter_rates,
+            letter_rates,
+            data.notification_type,
+            process_day,
+            data.crown,
+            data.letter_page_count,
+            data.postage,
+        )
+        billing_record = create_billing_record(data, rate, process_day)
+        billing_records[tuple(getattr(billing_record, c.name) for c in FactBilling.__table__.primary_key)] = {
+            'bst_date': billing_record.bst_date,
+            'template_id': billing_record.template_id,
+            'service_id': billing_record.service_id,
+            'provider': billing_record.provider,
+            'rate_multiplier': billing_record.rate_multiplier,
+            'notification_type': billing_record.notification_type,
+            'international': billing_record.international,
+            'billable_units': billing_record.billable_units,
+            'notifications_sent': billing_record.notifications_sent,
+            'rate': billing_record.rate,
+            'postage': billing_record.postage,
+        }
+
+    if not billing_records:
+        return
 
-    table = FactBilling.__table__
     """
        This uses the Postgres upsert to avoid race conditions when two threads try to insert
        at the same row. The excluded object refers to values that we tried to insert but were
        rejected.
        http://docs.sqlalchemy.org/en/latest/dialects/postgresql.html#insert-on-conflict-upsert
     """
-    stmt = insert(table).values(
-        bst_date=billing_record.bst_date,
-        template_id=billing_record.template_id,
-        service_id=billing_record.service_id,
-        provider=billing_record.provider,
-        rate_multiplier=billing_record.rate_multiplier,
-        notification_type=billing_record.notification_type,
-        international=billing_record.international,
-        billable_units=billing_record.billable_units,
-        notifications_sent=billing_record.notifications_sent,
-        rate=billing_record.rate,
-        postage=billing_record.postage,
-    )
-
+    stmt = insert(FactBilling.__table__).values(list(billing_records.values()))
     stmt = stmt.on_conflict_do_update(
         constraint='ft_billing_pkey',
         set_={
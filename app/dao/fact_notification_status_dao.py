@@ -2,16 +2,14 @@ from datetime import datetime, timedelta, time
 
 from flask import current_app
 from notifications_utils.timezones import convert_local_timezone_to_utc
-from sqlalchemy import case, delete, func, Date, select, union_all
+from sqlalchemy import case, delete, exists, func, Date, select, union_all
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.expression import literal
 from sqlalchemy.types import DateTime, Integer
 
 from app import db
 from app.constants import (
-    EMAIL_TYPE,
     KEY_TYPE_TEST,
-    LETTER_TYPE,
     NOTIFICATION_CANCELLED,
     NOTIFICATION_CREATED,
     NOTIFICATION_DELIVERED,
@@ -19,7 +17,6 @@ from app.constants import (
     NOTIFICATION_SENT,
     NOTIFICATION_TEMPORARY_FAILURE,
     NOTIFICATION_PERMANENT_FAILURE,
-    SMS_TYPE,
 )
 from app.models import (
     FactNotificationStatus,
@@ -31,114 +28,119 @@ from app.models import (
 from app.utils import (
     get_local_timezone_midnight_in_utc,
     midnight_n_days_ago,
-    get_local_timezone_midnight,
 )
 
 
-def fetch_notification_status_for_day(
-    process_day,
-    service_id=None,
-):
-    start_date = convert_local_timezone_to_utc(datetime.combine(process_day, time.min))
-    end_date = convert_local_timezone_to_utc(datetime.combine(process_day + timedelta(days=1), time.min))
-    # use notification_history if process day is older than 7 days
-    # this is useful if we need to rebuild the ft_billing table for a date older than 7 days ago.
-    current_app.logger.info('Fetch ft_notification_status for {} to {}'.format(start_date, end_date))
-
-    all_data_for_process_day = []
-    service_ids = [x.id for x in db.session.scalars(select(Service)).all()]
-    # for each service
-    # for each notification type
-    # query notifications for day
-    # if no rows try notificationHistory
-    for service_id in service_ids:
-        for notification_type in [EMAIL_TYPE, SMS_TYPE, LETTER_TYPE]:
-            data_for_service_and_type = _query_for_fact_status_data(
-                table=Notification,
-                start_date=start_date,
-                end_date=end_date,
-                notification_type=notification_type,
-                service_id=service_id,
-            )
+def _query_for_fact_status_data(process_day):
+    """
+    Aggregate the notifications created on the local day for every service and notification type in one query.
 
-            if not data_for_service_and_type:
-                data_for_service_and_type = _query_for_fact_status_data(
-                    table=NotificationHistory,
-                    start_date=start_date,
-                    end_date=end_date,
-                    notification_type=notification_type,
-                    service_id=service_id,
-                )
-            all_data_for_process_day.extend(data_for_service_and_type)
-
-    return all_data_for_process_day
+    A notification is moved from notifications to notification_history when its retention period passes, and is
+    briefly in both tables while that happens, so notification_history rows are only counted when the notification
+    is no longer in notifications.
+    """
 
+    start_date = convert_local_timezone_to_utc(datetime.combine(process_day, time.min))
+    end_date = convert_local_timezone_to_utc(datetime.combine(process_day + timedelta(days=1), time.min))
 
-def _query_for_fact_status_data(
-    table,
-    start_date,
-    end_date,
-    notification_type,
-    service_id,
-):
-    stmt = (
-        select(
-            table.template_id,
-            table.service_id,
-            func.coalesce(table.job_id, '00000000-0000-0000-0000-000000000000').label('job_id'),
-            table.notification_type,
-            table.key_type,
-            table.status,
-            table.status_reason,
-            func.count().label('notification_count'),
-        )
-        .where(
+    def _notifications_in_range(table):
+        return select(
+            table.template_id.label('template_id'),
+            table.service_id.label('service_id'),
+            table.job_id.label('job_id'),
+            table.notification_type.label('notification_type'),
+            table.key_type.label('key_type'),
+            table.status.label('status'),
+            table.status_reason.label('status_reason'),
+        ).where(
             table.created_at >= start_date,
             table.created_at < end_date,
-            table.notification_type == notification_type,
-            table.service_id == service_id,
             table.key_type != KEY_TYPE_TEST,
         )
-        .group_by(
-            table.template_id,
-            table.service_id,
-            'job_id',
-            table.notification_type,
-            table.key_type,
-            table.status,
-            table.status_reason,
-        )
-    )
 
-    return db.session.execute(stmt).all()
+    archived_notifications = _notifications_in_range(NotificationHistory).where(
+        ~exists().where(Notification.id == NotificationHistory.id)
+    )
+    notifications = union_all(_notifications_in_range(Notification), archived_notifications).subquery()
+
+    # status_reason is part of the primary key, and NULL is stored as '' so that it can be.
+    status_reason = func.coalesce(notifications.c.status_reason, '')
+    return select(
+        literal(process_day, type_=Date).label('bst_date'),
+        notifications.c.template_id,
+        notifications.c.service_id,
+        func.coalesce(notifications.c.job_id, '00000000-0000-0000-0000-000000000000').label('job_id'),
+        notifications.c.notification_type,
+        notifications.c.key_type,
+        notifications.c.status.label('notification_status'),
+        status_reason.label('status_reason'),
+        func.count().label('notification_count'),
+    ).group_by(
+        notifications.c.template_id,
+        notifications.c.service_id,
+        'job_id',
+        notifications.c.notification_type,
+        notifications.c.key_type,
+        notifications.c.status,
+        status_reason,
+    )
 
 
-def update_fact_notification_status(
-    data,
-    process_day,
-):
-    stmt = delete(FactNotificationStatus).where(FactNotificationStatus.bst_date == process_day)
+def update_fact_notification_status(process_day) -> int:
+    """
+    Bring the ft_notification_status rows for the day up to date with the day's notifications, in a single
+    transaction.  The aggregate is upserted, changing only the rows whose counts differ, and rows for combinations
+    that no longer occur (because every notification moved to another status) are removed.  This runs nightly for
+    recent days, and periodically for the current day so that statistics can be read from the fact table alone.
+
+    Returns:
+        int: The number of rows inserted or updated
+    """
+
+    current_app.logger.info('Update ft_notification_status for %s', process_day)
+
+    fact_status_data = _query_for_fact_status_data(process_day).subquery()
+    stmt = delete(FactNotificationStatus).where(
+        FactNotificationStatus.bst_date == process_day,
+        ~exists().where(
+            fact_status_data.c.template_id == FactNotificationStatus.template_id,
+            fact_status_data.c.service_id == FactNotificationStatus.service_id,
+            fact_status_data.c.job_id == FactNotificationStatus.job_id,
+            fact_status_data.c.notification_type == FactNotificationStatus.notification_type,
+            fact_status_data.c.key_type == FactNotificationStatus.key_type,
+            fact_status_data.c.notification_status == FactNotificationStatus.notification_status,
+            fact_status_data.c.status_reason == FactNotificationStatus.status_reason,
+        ),
+    )
     db.session.execute(stmt)
-    db.session.commit()
-
-    insertion_values = [
-        {
-            'bst_date': process_day,
-            'template_id': row.template_id,
-            'service_id': row.service_id,
-            'job_id': row.job_id,
-            'notification_type': row.notification_type,
-            'key_type': row.key_type,
-            'notification_status': row.status,
-            'status_reason': row.status_reason if row.status_reason else '',
-            'notification_count': row.notification_count,
-        }
-        for row in data
-    ]
 
-    db.session.execute(insert(FactNotificationStatus), insertion_values)
+    stmt = insert(FactNotificationStatus).from_select(
+        [
+            'bst_date',
+            'template_id',
+            'service_id',
+            'job_id',
+            'notification_type',
+            'key_type',
+            'notification_status',
+            'status_reason',
+            'notification_count',
+        ],
+        _query_for_fact_status_data(process_day),
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint='ft_notification_status_pkey',
+        set_={
+            'notification_count': stmt.excluded.notification_count,
+            'updated_at': datetime.utcnow(),
+        },
+        where=FactNotificationStatus.notification_count != stmt.excluded.notification_count,
+    )
+    upserted = db.session.execute(stmt).rowcount
     db.session.commit()
 
+    return upserted
+
 
 def fetch_notification_status_for_service_by_month(
     start_date,
@@ -223,57 +225,35 @@ def fetch_notification_status_for_service_for_today_and_7_previous_days(
     by_template=False,
     limit_days=7,
 ):
+    """
+    Read the service's notification counts from ft_notification_status.  The rows for the current day are kept up
+    to date by the update-fact-notification-status-for-today task, so notifications are not scanned here.
+    """
+
     start_date = midnight_n_days_ago(limit_days)
-    now = datetime.now()
 
-    stats_for_7_days = select(
+    stmt = select(
+        *(
+            [Template.name.label('template_name'), Template.is_precompiled_letter, FactNotificationStatus.template_id]
+            if by_template
+            else []
+        ),
         FactNotificationStatus.notification_type.label('notification_type'),
         FactNotificationStatus.notification_status.label('status'),
-        *([FactNotificationStatus.template_id.label('template_id')] if by_template else []),
-        FactNotificationStatus.notification_count.label('count'),
+        func.cast(func.sum(FactNotificationStatus.notification_count), Integer).label('count'),
     ).where(
         FactNotificationStatus.service_id == service_id,
         FactNotificationStatus.bst_date >= start_date,
         FactNotificationStatus.key_type != KEY_TYPE_TEST,
     )
 
-    stats_for_today = (
-        select(
-            Notification.notification_type.cast(db.Text),
-            Notification.status,
-            *([Notification.template_id] if by_template else []),
-            func.count().label('count'),
-        )
-        .where(
-            Notification.created_at >= get_local_timezone_midnight(now),
-            Notification.service_id == service_id,
-            Notification.key_type != KEY_TYPE_TEST,
-        )
-        .group_by(
-            Notification.notification_type, *([Notification.template_id] if by_template else []), Notification.status
-        )
-    )
-
-    all_stats_table = union_all(stats_for_7_days, stats_for_today).subquery()
-
-    stmt = select(
-        *(
-            [Template.name.label('template_name'), Template.is_precompiled_letter, all_stats_table.c.template_id]
-            if by_template
-            else []
-        ),
-        all_stats_table.c.notification_type,
-        all_stats_table.c.status,
-        func.cast(func.sum(all_stats_table.c.count), Integer).label('count'),
-    )
-
     if by_template:
-        stmt = stmt.where(all_stats_table.c.template_id == Template.id)
+        stmt = stmt.where(FactNotificationStatus.template_id == Template.id)
 
     stmt = stmt.group_by(
-        *([Template.name, Template.is_precompiled_letter, all_stats_table.c.template_id] if by_template else []),
-        all_stats_table.c.notification_type,
-        all_stats_table.c.status,
+        *([Template.name, Template.is_precompiled_letter, FactNotificationStatus.template_id] if by_template else []),
+        FactNotificationStatus.notification_type,
+        FactNotificationStatus.notification_status,
     )
 
     return db.session.execute(stmt).all()
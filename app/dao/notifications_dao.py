@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta
 import functools
+import re
+from time import monotonic
 import string
-from typing import Any
+from typing import Any, Iterator
 from uuid import UUID
 
 from botocore.exceptions import ClientError
@@ -9,17 +11,38 @@ from flask import current_app
 from notifications_utils.international_billing_rates import INTERNATIONAL_BILLING_RATES
 from notifications_utils.statsd_decorators import statsd
 from notifications_utils.timezones import convert_local_timezone_to_utc, convert_utc_to_local_timezone
-from sqlalchemy import and_, delete, desc, func, or_, select, update, literal_column
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Integer,
+    String,
+    and_,
+    cast,
+    column,
+    delete,
+    desc,
+    exists,
+    func,
+    or_,
+    select,
+    table,
+    true,
+    tuple_,
+    update,
+    literal_column,
+    values,
+)
 from sqlalchemy.exc import ArgumentError
 from sqlalchemy.engine.row import Row
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.exc import NoResultFound
-from sqlalchemy.sql import functions, text
+from sqlalchemy.sql import ColumnElement, functions, text
 from sqlalchemy.sql.expression import case
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
 from werkzeug.datastructures import MultiDict
 
-from app import db, encryption
+from app import db, encryption, statsd_client
 from app.aws.s3 import remove_s3_object, get_s3_bucket_objects
 from app.constants import (
     EMAIL_TYPE,
@@ -33,6 +56,7 @@ from app.constants import (
     NOTIFICATION_TEMPORARY_FAILURE,
     NOTIFICATION_PERMANENT_FAILURE,
     NOTIFICATION_SENT,
+    NOTIFICATION_TYPE,
     SMS_TYPE,
     STATUS_REASON_RETRYABLE,
     STATUS_REASON_UNDELIVERABLE,
@@ -42,9 +66,10 @@ from app.letters.utils import LETTERS_PDF_FILE_LOCATION_STRUCTURE
 from app.models import (
     Notification,
     NotificationHistory,
+    NotificationId,
+    RecipientIdentifier,
     ScheduledNotification,
     ServiceDataRetention,
-    Service,
 )
 from app.utils import create_uuid, get_local_timezone_midnight_in_utc
 from app.utils import midnight_n_days_ago
@@ -113,6 +138,47 @@ _TEMPORARY_FAILURE_UPDATES = (
 
 _PERMANENT_FAILURE_UPDATES = (NOTIFICATION_DELIVERED,)
 
+# The statuses an SMS notification in each status may be updated to, as checked by sms_conditions
+_SMS_STATUS_UPDATES = {
+    NOTIFICATION_CREATED: _CREATED_UPDATES,
+    NOTIFICATION_SENDING: _SENDING_UPDATES,
+    NOTIFICATION_PENDING: _PENDING_UPDATES,
+    NOTIFICATION_SENT: _SENT_UPDATES,
+    NOTIFICATION_DELIVERED: _DELIVERED_UPDATES,
+    NOTIFICATION_TEMPORARY_FAILURE: _TEMPORARY_FAILURE_UPDATES,
+    NOTIFICATION_PERMANENT_FAILURE: _PERMANENT_FAILURE_UPDATES,
+}
+
+# Days of retention for services without a ServiceDataRetention row for the notification type
+DEFAULT_DAYS_OF_RETENTION = 7
+
+# Weekly partitions of notifications to keep created ahead of time.  Inserts past the last partition land in
+# notifications_default, which stays small as long as the maintain-notification-partitions task runs.
+NOTIFICATION_PARTITION_WEEKS_AHEAD = 4
+
+_PARTITION_BOUND_PATTERN = re.compile(r'FOR VALUES FROM \((?P<lower>[^)]+)\) TO \((?P<upper>[^)]+)\)')
+
+# Notifications timed out per UPDATE by dao_timeout_notifications
+TIMEOUT_BATCH_SIZE = 1000
+
+# Returned for each notification whose status is updated; enough to build its delivery status callback without loading
+# the row
+_STATUS_UPDATE_RETURNING_COLUMNS = (
+    Notification.id,
+    Notification.service_id,
+    Notification.api_key_id,
+    Notification.callback_url,
+    Notification.client_reference,
+    Notification.to,
+    Notification.status.label('status'),
+    Notification.status_reason,
+    Notification.notification_type,
+    Notification.created_at,
+    Notification.updated_at,
+    Notification.sent_at,
+    Notification.sent_by,
+)
+
 
 @statsd(namespace='dao')
 @transactional
@@ -126,6 +192,38 @@ def dao_create_notification(notification):
     db.session.add(notification)
 
 
+# Keeps each multi-row INSERT well under Postgres' limit of 65535 bind parameters.
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+@statsd(namespace='dao')
+@transactional
+def dao_create_notifications_bulk(
+    notification_rows: list[dict[str, Any]],
+    recipient_identifier_rows: list[dict[str, Any]] | None = None,
+) -> None:
+    """
+    Insert many notifications, and their recipient identifiers, using multi-row INSERT statements in one transaction.
+
+    The rows are column-keyed dictionaries with every derived value (normalised_to, phone_prefix, rate_multiplier,
+    encrypted personalisation, etc.) already computed, so no ORM objects are built or flushed.  All notification rows
+    must have the same keys.
+
+    Args:
+        notification_rows (list[dict[str, Any]]): Values for the notifications table
+        recipient_identifier_rows (list[dict[str, Any]] | None): Values for the recipient_identifiers table
+    """
+
+    for i in range(0, len(notification_rows), BULK_INSERT_CHUNK_SIZE):
+        db.session.execute(insert(Notification).values(notification_rows[i : i + BULK_INSERT_CHUNK_SIZE]))
+
+    recipient_identifier_rows = recipient_identifier_rows or []
+    for i in range(0, len(recipient_identifier_rows), BULK_INSERT_CHUNK_SIZE):
+        db.session.execute(
+            insert(RecipientIdentifier).values(recipient_identifier_rows[i : i + BULK_INSERT_CHUNK_SIZE])
+        )
+
+
 def country_records_delivery(phone_prefix):
     dlr = INTERNATIONAL_BILLING_RATES[phone_prefix]['attributes']['dlr']
     return dlr and dlr.lower() == 'yes'
@@ -141,13 +239,27 @@ def sms_conditions(incoming_status: str) -> Any:
         Any: Conditions for a where clause
     """
     return or_(
-        and_(Notification.status == NOTIFICATION_CREATED, incoming_status in _CREATED_UPDATES),
-        and_(Notification.status == NOTIFICATION_SENDING, incoming_status in _SENDING_UPDATES),
-        and_(Notification.status == NOTIFICATION_PENDING, incoming_status in _PENDING_UPDATES),
-        and_(Notification.status == NOTIFICATION_SENT, incoming_status in _SENT_UPDATES),
-        and_(Notification.status == NOTIFICATION_DELIVERED, incoming_status in _DELIVERED_UPDATES),
-        and_(Notification.status == NOTIFICATION_TEMPORARY_FAILURE, incoming_status in _TEMPORARY_FAILURE_UPDATES),
-        and_(Notification.status == NOTIFICATION_PERMANENT_FAILURE, incoming_status in _PERMANENT_FAILURE_UPDATES),
+        *(
+            and_(Notification.status == current_status, incoming_status in updates)
+            for current_status, updates in _SMS_STATUS_UPDATES.items()
+        )
+    )
+
+
+def _sms_batch_conditions(incoming_status: ColumnElement) -> Any:
+    """Build the conditions of sms_conditions for an incoming status that is a column of the statement.
+
+    Args:
+        incoming_status (ColumnElement): The column holding each row's incoming notification status
+
+    Returns:
+        Any: Conditions for a where clause
+    """
+    return or_(
+        *(
+            and_(Notification.status == current_status, incoming_status.in_(updates))
+            for current_status, updates in _SMS_STATUS_UPDATES.items()
+        )
     )
 
 
@@ -169,16 +281,10 @@ def _get_notification_status_update_statement(
         **kwargs: Additional key-value pairs to be updated
 
     Returns:
-        update_statement: An update statement to be executed, or None if the notification should not be updated
+        update_statement: An update statement to be executed, returning the _STATUS_UPDATE_RETURNING_COLUMNS of the
+            notification if it was updated
     """
 
-    notification = db.session.get(Notification, notification_id)
-    if notification is None:
-        current_app.logger.error(
-            'No notification found when attempting to update status for notification %s', notification_id
-        )
-        return None
-
     # add status to values dict if it doesn't have anything
     if len(kwargs) < 1:
         kwargs['status'] = incoming_status
@@ -213,15 +319,45 @@ def _get_notification_status_update_statement(
         ),
     )
 
-    # create the update query with the above conditions
-    # added execution_options to prevent the session from being out of sync and avoid this error:
-    # "Could not evaluate current criteria in Python: Cannot evaluate ..."
-    # https://docs.sqlalchemy.org/en/14/orm/session_basics.html#update-and-delete-with-arbitrary-where-clause
-    stmt = update(Notification).where(conditions).values(kwargs).execution_options(synchronize_session='fetch')
+    # Callers get the updated values from RETURNING, so the session is not synchronized.  Evaluating the criteria in
+    # Python is not possible, and synchronize_session='fetch' would cost another query.
+    stmt = (
+        update(Notification)
+        .where(conditions)
+        .values(kwargs)
+        .returning(*_STATUS_UPDATE_RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
 
     return stmt
 
 
+@statsd(namespace='dao')
+def dao_transition_notification_status(
+    notification_id: UUID,
+    incoming_status: str,
+    incoming_status_reason: str | None = None,
+    **kwargs,
+) -> Row | None:
+    """
+    Update a notification's status if the status precedence rules allow it, with one UPDATE ... RETURNING statement.
+    The caller is responsible for committing.
+
+    Args:
+        notification_id (UUID): The notification to update
+        incoming_status (str): The status to which the notification will attempt to update
+        incoming_status_reason (str | None): The status reason to which the notification will attempt to update
+        **kwargs: Additional key-value pairs to be updated
+
+    Returns:
+        Row | None: The _STATUS_UPDATE_RETURNING_COLUMNS of the updated notification, or None if the notification
+            does not exist or the transition is not allowed
+    """
+
+    stmt = _get_notification_status_update_statement(notification_id, incoming_status, incoming_status_reason, **kwargs)
+    return db.session.execute(stmt).first()
+
+
 def _update_notification_status(
     notification: Notification, status: str, status_reason: str | None = None
 ) -> Notification:
@@ -235,7 +371,6 @@ def _update_notification_status(
     Returns:
         Notification: The updated notification, or the original notification if it should not be updated.
     """
-    notification_updated = False
 
     # verify notification status is valid
     if not (status in TRANSIENT_STATUSES or status in FINAL_STATUS_STATES):
@@ -243,36 +378,43 @@ def _update_notification_status(
             'Attempting to update notification %s to a status that does not exist %s', notification.id, status
         )
 
-    update_statement = _get_notification_status_update_statement(notification.id, status, status_reason)
-
+    notification_id = notification.id
     try:
-        db.session.execute(update_statement)
+        updated = dao_transition_notification_status(notification_id, status, status_reason)
         db.session.commit()
-    except NoResultFound as e:
-        current_app.logger.warning(
-            'No result found when attempting to update notification %s to status %s',
-            notification.id,
-            status,
-        )
-        current_app.logger.exception(e)
     except ArgumentError as e:
-        current_app.logger.warning('Cannot update notification %s to status %s', notification.id, status)
+        current_app.logger.warning('Cannot update notification %s to status %s', notification_id, status)
         current_app.logger.exception(e)
+        return notification
     except Exception:
         current_app.logger.exception(
             'An error occured when attempting to update notification %s to status %s',
-            notification.id,
+            notification_id,
             status,
         )
-    else:
-        notification_updated = True
+        return notification
 
-    if notification_updated:
-        return db.session.get(Notification, notification.id)
+    if updated is None:
+        current_app.logger.info('Notification %s was not updated to status %s', notification_id, status)
+    else:
+        apply_returned_values(notification, updated)
 
     return notification
 
 
+def apply_returned_values(
+    notification: Notification,
+    row: Row,
+) -> None:
+    """
+    Load the values an UPDATE ... RETURNING statement returned into a notification the commit expired, so reading
+    them does not query again.
+    """
+
+    for key, value in row._mapping.items():
+        set_committed_value(notification, key, value)
+
+
 @statsd(namespace='dao')
 @transactional
 def update_notification_status_by_id(
@@ -344,7 +486,8 @@ def dao_update_sms_notification_delivery_status(
             .where(Notification.id == notification_id)
             .where(sms_conditions(new_status))
             .values(**stmt_values)
-            .execution_options(synchronize_session='fetch')
+            # The commit expires the session, so the notification is read again below without synchronizing first
+            .execution_options(synchronize_session=False)
         )
 
         current_app.logger.debug('sms delivery status statement: %s', stmt)
@@ -365,6 +508,99 @@ def dao_update_sms_notification_delivery_status(
     return db.session.get(Notification, notification_id)
 
 
+@statsd(namespace='dao')
+def dao_update_sms_notifications_delivery_statuses(updates: list[dict[str, Any]]) -> list[Notification]:
+    """Update the delivery status of many SMS notifications with one UPDATE ... FROM (VALUES ...) statement.
+
+    Each update is applied under the same conditions as dao_update_sms_notification_delivery_status, and its price is
+    added to the notification's cost.  Postgres only applies one row of the VALUES list to each notification, so a
+    notification's second update goes in a second statement, and so on.  All statements are committed together.
+
+    Args:
+        updates (list[dict[str, Any]]): Dictionaries with the keys notification_id, new_status, new_status_reason,
+            segments_count, price_millicents, and provider_updated_at.  The notifications should already be loaded
+            in the session.
+
+    Returns:
+        list[Notification]: The notifications that were updated, in their updated state
+    """
+
+    rounds: list[list[dict[str, Any]]] = []
+    occurrences: dict[UUID, int] = {}
+    for status_update in updates:
+        notification_id = status_update['notification_id']
+        round_number = occurrences.get(notification_id, 0)
+        occurrences[notification_id] = round_number + 1
+        if round_number == len(rounds):
+            rounds.append([])
+
+        personalisation = None
+        if status_update['new_status'] in FINAL_STATUS_STATES:
+            # Already in the identity map, so this does not query
+            notification = db.session.get(Notification, notification_id)
+            personalisation = encryption.encrypt({k: '<redacted>' for k in notification.personalisation})
+
+        rounds[round_number].append(
+            {
+                'id': str(notification_id),
+                'status': status_update['new_status'],
+                'status_reason': status_update['new_status_reason'],
+                'segments_count': status_update['segments_count'],
+                'price_millicents': status_update['price_millicents'],
+                'provider_updated_at': status_update['provider_updated_at'],
+                'personalisation': personalisation,
+            }
+        )
+
+    updated_ids = set()
+    try:
+        for rows in rounds:
+            # Concurrent batches lock their notifications in the same order, so they cannot deadlock
+            rows.sort(key=lambda row: row['id'])
+            receipts = values(
+                column('id', String),
+                column('status', String),
+                column('status_reason', String),
+                column('segments_count', Integer),
+                column('price_millicents', Float),
+                column('provider_updated_at', DateTime),
+                column('personalisation', String),
+                name='receipts',
+            ).data([tuple(row.values()) for row in rows])
+
+            # Untyped literals in VALUES are resolved to text by Postgres, so each column is cast where it is used.
+            stmt = (
+                update(Notification)
+                .where(
+                    Notification.id == cast(receipts.c.id, PG_UUID(as_uuid=True)),
+                    _sms_batch_conditions(receipts.c.status),
+                )
+                .values(
+                    status=receipts.c.status,
+                    status_reason=receipts.c.status_reason,
+                    segments_count=cast(receipts.c.segments_count, Integer),
+                    cost_in_millicents=Notification.cost_in_millicents + cast(receipts.c.price_millicents, Float),
+                    provider_updated_at=cast(receipts.c.provider_updated_at, DateTime),
+                    _personalisation=func.coalesce(receipts.c.personalisation, Notification._personalisation),
+                )
+                .returning(Notification.id)
+            )
+            updated_ids.update(
+                db.session.execute(stmt, execution_options={'synchronize_session': False}).scalars().all()
+            )
+        db.session.commit()
+    except Exception:
+        current_app.logger.exception('Updating the delivery status of %s SMS notifications failed.', len(updates))
+        db.session.rollback()
+        raise
+
+    if not updated_ids:
+        return []
+
+    stmt = select(Notification).where(Notification.id.in_(updated_ids)).execution_options(populate_existing=True)
+    return db.session.scalars(stmt).all()
+
+
 @statsd(namespace='dao')
 def dao_update_sms_notification_status_to_created_for_retry(
     notification_id: UUID,
@@ -569,7 +805,14 @@ def get_notifications_for_service(
     older_than=None,
     client_reference=None,
     include_one_off=True,
+    older_than_created_at=None,
 ):
+    """
+    Notifications are ordered newest first by (created_at, id).  Pass the id and created_at of the last notification
+    on a page as older_than and older_than_created_at to get the next page with a keyset lookup; if only older_than
+    is given, its created_at is looked up.  Callers that don't need the total should pass count_pages=False.
+    """
+
     if page_size is None:
         page_size = current_app.config['PAGE_SIZE']
 
@@ -579,8 +822,7 @@ def get_notifications_for_service(
         filters.append(Notification.created_at >= midnight_n_days_ago(limit_days))
 
     if older_than is not None:
-        older_than_created_at = select(Notification.created_at).where(Notification.id == older_than)
-        filters.append(Notification.created_at < older_than_created_at)
+        filters.append(_older_than_filter(older_than, older_than_created_at))
 
     if not include_jobs:
         filters.append(Notification.job_id == None)  # noqa
@@ -600,13 +842,31 @@ def get_notifications_for_service(
 
     stmt = _filter_query(stmt, filter_dict)
     if personalisation:
-        stmt = stmt.options(joinedload('template'))
+        # Everything Notification.serialize reads, so serializing a page doesn't lazy load per row.  The collection
+        # is loaded with one extra query per page because joining it would defeat the LIMIT.
+        stmt = stmt.options(
+            joinedload(Notification.template),
+            joinedload(Notification.created_by),
+            joinedload(Notification.scheduled_notification),
+            selectinload(Notification.recipient_identifiers),
+        )
 
-    stmt = stmt.order_by(desc(Notification.created_at))
+    stmt = stmt.order_by(desc(Notification.created_at), desc(Notification.id))
 
     return db.paginate(stmt, page=page, per_page=page_size, count=count_pages)
 
 
+def _older_than_filter(
+    older_than,
+    older_than_created_at=None,
+) -> ColumnElement:
+    """Keyset filter for notifications after (older_than_created_at, older_than) in newest first order."""
+
+    if older_than_created_at is None:
+        older_than_created_at = select(Notification.created_at).where(Notification.id == older_than).scalar_subquery()
+    return tuple_(Notification.created_at, Notification.id) < tuple_(older_than_created_at, older_than)
+
+
 def _filter_query(
     stmt,
     filter_dict=None,
@@ -636,47 +896,74 @@ def delete_notifications_older_than_retention_by_type(
     qry_limit=10000,
 ):
     """
-    TODO - This seems unnecessarily complicated.  It can probably be reduced to a single "delete"
-    query with a "join" and a compound "where" clause.  See #1102.
-    """
-
-    current_app.logger.info('Deleting %s notifications for services with flexible data retention', notification_type)
+    Purge notifications of the given type that are past their service's data retention.
 
-    stmt = select(ServiceDataRetention).where(ServiceDataRetention.notification_type == notification_type)
-    flexible_data_retention = db.session.scalars(stmt).all()
+    Services are grouped into buckets by days of retention (services without a ServiceDataRetention row for the
+    type use the default of 7 days) so that each bucket is archived to NotificationHistory with one statement and
+    deleted in keyset-ordered batches of qry_limit rows.
+    """
 
+    local_midnight = get_local_timezone_midnight_in_utc(convert_utc_to_local_timezone(datetime.utcnow()).date())
+    start = monotonic()
     deleted = 0
-    for f in flexible_data_retention:
-        days_of_retention = get_local_timezone_midnight_in_utc(
-            convert_utc_to_local_timezone(datetime.utcnow()).date()
-        ) - timedelta(days=f.days_of_retention)
+
+    for days_of_retention, service_filter in _get_retention_buckets(notification_type):
+        date_to_delete_from = local_midnight - timedelta(days=days_of_retention)
+        current_app.logger.info(
+            'Deleting %s notifications created before %s (%s days of retention)',
+            notification_type,
+            date_to_delete_from,
+            days_of_retention,
+        )
 
         if notification_type == LETTER_TYPE:
-            _delete_letters_from_s3(notification_type, f.service_id, days_of_retention, qry_limit)
+            _delete_letters_from_s3(notification_type, service_filter, date_to_delete_from, qry_limit)
 
-        insert_update_notification_history(notification_type, days_of_retention, f.service_id)
+        insert_update_notification_history(notification_type, date_to_delete_from, service_filter)
+        deleted += _delete_notifications(notification_type, date_to_delete_from, service_filter, qry_limit)
+
+    elapsed = monotonic() - start
+    rows_per_second = deleted / elapsed if elapsed else 0
+    statsd_client.gauge(f'dao.retention-purge.{notification_type}.rows-per-second', rows_per_second)
+    current_app.logger.info(
+        'Finished deleting %s notifications: %s rows in %.2f seconds (%.1f rows/sec)',
+        notification_type,
+        deleted,
+        elapsed,
+        rows_per_second,
+    )
 
-        current_app.logger.info('Deleting %s notifications for service id: %s', notification_type, f.service_id)
-        deleted += _delete_notifications(notification_type, days_of_retention, f.service_id, qry_limit)
+    return deleted
 
-    current_app.logger.info('Deleting %s notifications for services without flexible data retention', notification_type)
 
-    seven_days_ago = get_local_timezone_midnight_in_utc(
-        convert_utc_to_local_timezone(datetime.utcnow()).date()
-    ) - timedelta(days=7)
-    services_with_data_retention = [x.service_id for x in flexible_data_retention]
-    stmt = select(Service.id).where(Service.id.notin_(services_with_data_retention))
-    service_ids_to_purge = db.session.scalars(stmt).all()
+def _get_retention_buckets(notification_type) -> list[tuple[int, ColumnElement]]:
+    """
+    Return (days_of_retention, filter on Notification.service_id) pairs covering every service exactly once.
+    """
 
-    for service_id in service_ids_to_purge:
-        if notification_type == LETTER_TYPE:
-            _delete_letters_from_s3(notification_type, service_id, seven_days_ago, qry_limit)
-        insert_update_notification_history(notification_type, seven_days_ago, service_id)
-        deleted += _delete_notifications(notification_type, seven_days_ago, service_id, qry_limit)
+    retention_for_type = select(ServiceDataRetention.service_id).where(
+        ServiceDataRetention.notification_type == notification_type
+    )
+    stmt = retention_for_type.with_only_columns(ServiceDataRetention.days_of_retention).distinct()
+    buckets = [
+        (days, Notification.service_id.in_(retention_for_type.where(ServiceDataRetention.days_of_retention == days)))
+        for days in db.session.scalars(stmt).all()
+    ]
+
+    without_retention = ~exists().where(
+        ServiceDataRetention.service_id == Notification.service_id,
+        ServiceDataRetention.notification_type == notification_type,
+    )
+    buckets.append((DEFAULT_DAYS_OF_RETENTION, without_retention))
+    return buckets
 
-    current_app.logger.info('Finished deleting %s notifications', notification_type)
 
-    return deleted
+def _service_filter(service_id) -> ColumnElement:
+    if isinstance(service_id, ColumnElement):
+        return service_id
+    if isinstance(service_id, Row):
+        service_id = str(service_id[0])
+    return Notification.service_id == service_id
 
 
 def _delete_notifications(
@@ -684,66 +971,54 @@ def _delete_notifications(
     date_to_delete_from,
     service_id,
     query_limit,
-):
-    if isinstance(service_id, Row):
-        service_id = str(service_id[0])
-
-    subquery = (
-        select(Notification.id)
-        .join(NotificationHistory, NotificationHistory.id == Notification.id)
-        .where(
-            Notification.notification_type == notification_type,
-            Notification.service_id == service_id,
-            Notification.created_at < date_to_delete_from,
-        )
-        .limit(query_limit)
-        .subquery()
-        .element
-    )
-    deleted = _delete_for_query(subquery)
+) -> int:
+    """
+    Delete notifications that have been archived to NotificationHistory, or were sent with a test key, walking the
+    primary key so that each batch is a short transaction and no batch rescans rows already visited.
+    """
 
-    subquery_for_test_keys = (
+    batch = (
         select(Notification.id)
         .where(
             Notification.notification_type == notification_type,
-            Notification.service_id == service_id,
+            _service_filter(service_id),
             Notification.created_at < date_to_delete_from,
-            Notification.key_type == KEY_TYPE_TEST,
+            or_(
+                exists().where(NotificationHistory.id == Notification.id),
+                Notification.key_type == KEY_TYPE_TEST,
+            ),
         )
+        .order_by(Notification.id)
         .limit(query_limit)
-        .subquery()
-        .element
     )
 
-    deleted += _delete_for_query(subquery_for_test_keys)
-    return deleted
-
-
-def _delete_for_query(subquery):
-    stmt = delete(Notification).where(Notification.id.in_(subquery))
-    number_deleted = db.session.execute(stmt, execution_options={'synchronize_session': 'fetch'}).rowcount
-    db.session.commit()
-
-    deleted = number_deleted
-    while number_deleted > 0:
-        number_deleted = db.session.execute(stmt, execution_options={'synchronize_session': 'fetch'}).rowcount
-        deleted += number_deleted
+    deleted = 0
+    last_id = None
+    while True:
+        keyset = batch if last_id is None else batch.where(Notification.id > last_id)
+        stmt = delete(Notification).where(Notification.id.in_(keyset.scalar_subquery())).returning(Notification.id)
+        deleted_ids = db.session.execute(stmt, execution_options={'synchronize_session': False}).scalars().all()
         db.session.commit()
 
-    return deleted
+        deleted += len(deleted_ids)
+        if len(deleted_ids) < query_limit:
+            return deleted
+        last_id = max(deleted_ids)
 
 
 def insert_update_notification_history(
     notification_type,
     date_to_delete_from,
     service_id,
-):
-    if isinstance(service_id, Row):
-        service_id = str(service_id[0])
+) -> int:
+    """
+    Copy notifications created before date_to_delete_from to NotificationHistory, updating rows already there.
+    service_id may be a single service id or a filter on Notification.service_id covering many services.
+    """
 
     notifications = select(*[text(x.name) for x in NotificationHistory.__table__.c]).where(
         Notification.notification_type == notification_type,
-        Notification.service_id == service_id,
+        _service_filter(service_id),
         Notification.created_at < date_to_delete_from,
         Notification.key_type != KEY_TYPE_TEST,
     )
@@ -760,8 +1035,9 @@ def insert_update_notification_history(
             'sent_by': stmt.excluded.sent_by,
         },
     )
-    db.session.execute(stmt)
+    archived = db.session.execute(stmt).rowcount
     db.session.commit()
+    return archived
 
 
 def _delete_letters_from_s3(
@@ -770,15 +1046,12 @@ def _delete_letters_from_s3(
     date_to_delete_from,
     query_limit,
 ):
-    if isinstance(service_id, Row):
-        service_id = str(service_id[0])
-
     stmt = (
         select(Notification)
         .where(
             Notification.notification_type == notification_type,
             Notification.created_at < date_to_delete_from,
-            Notification.service_id == service_id,
+            _service_filter(service_id),
         )
         .limit(query_limit)
     )
@@ -805,6 +1078,107 @@ def _delete_letters_from_s3(
                     current_app.logger.exception('Could not delete S3 object with filename: %s', s3_object['Key'])
 
 
+def _get_notification_partitions() -> list[tuple[str, datetime | None, datetime | None]]:
+    """
+    Return (name, lower bound, upper bound) for each range partition of notifications.  A bound of None is
+    MINVALUE/MAXVALUE.  The default partition is not included.
+    """
+
+    stmt = text("""
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'notifications'::regclass
+    """)
+
+    def _bound(value: str) -> datetime | None:
+        return None if value in ('MINVALUE', 'MAXVALUE') else datetime.fromisoformat(value.strip("'"))
+
+    partitions = []
+    for name, bound in db.session.execute(stmt):
+        match = _PARTITION_BOUND_PATTERN.fullmatch(bound)
+        if match is not None:
+            partitions.append((name, _bound(match['lower']), _bound(match['upper'])))
+    return partitions
+
+
+@statsd(namespace='dao')
+def dao_create_notification_partitions(weeks_ahead=NOTIFICATION_PARTITION_WEEKS_AHEAD) -> list[str]:
+    """
+    Create the weekly partitions of notifications from the current week to weeks_ahead weeks from now, skipping
+    any week that is already covered by a partition.  A week with rows in notifications_default is skipped too,
+    because creating its partition would fail; they have to be moved out of the default partition first.
+    """
+
+    partitions = _get_notification_partitions()
+    default_partition = table('notifications_default', column('created_at'))
+    today = datetime.utcnow().date()
+    week_start = datetime.combine(today - timedelta(days=today.weekday()), datetime.min.time())
+
+    created = []
+    for _ in range(weeks_ahead + 1):
+        week_end = week_start + timedelta(weeks=1)
+        if not any(
+            (lower is None or lower < week_end) and (upper is None or upper > week_start)
+            for _, lower, upper in partitions
+        ):
+            name = f'notifications_p{week_start:%Y%m%d}'
+            stmt = select(
+                exists().where(default_partition.c.created_at >= week_start, default_partition.c.created_at < week_end)
+            )
+            if db.session.scalar(stmt):
+                current_app.logger.error('Not creating %s because notifications_default has rows in its range', name)
+            else:
+                db.session.execute(
+                    text(
+                        f'CREATE TABLE {name} PARTITION OF notifications '
+                        f"FOR VALUES FROM ('{week_start.isoformat()}') TO ('{week_end.isoformat()}')"
+                    )
+                )
+                created.append(name)
+        week_start = week_end
+
+    db.session.commit()
+    return created
+
+
+@statsd(namespace='dao')
+def dao_drop_expired_notification_partitions() -> list[str]:
+    """
+    Drop the partitions of notifications that only hold rows past every service's data retention, archiving any
+    rows the retention purge has not already moved to notification_history.
+    """
+
+    stmt = select(func.max(ServiceDataRetention.days_of_retention))
+    longest_retention = max(db.session.scalar(stmt) or 0, DEFAULT_DAYS_OF_RETENTION)
+    expire_before = get_local_timezone_midnight_in_utc(
+        convert_utc_to_local_timezone(datetime.utcnow()).date()
+    ) - timedelta(days=longest_retention)
+
+    expired = [(name, upper) for name, _, upper in _get_notification_partitions() if upper and upper <= expire_before]
+    if not expired:
+        return []
+
+    # created_at < the latest upper bound only touches the expired partitions
+    archive_before = max(upper for _, upper in expired)
+    for notification_type in NOTIFICATION_TYPE:
+        insert_update_notification_history(notification_type, archive_before, true())
+
+    for name, _ in expired:
+        # Dropping a partition does not fire the triggers that delete its ids from notification_ids
+        partition = table(name, column('id'))
+        db.session.execute(
+            delete(NotificationId).where(NotificationId.id.in_(select(partition.c.id))),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.execute(text(f'ALTER TABLE notifications DETACH PARTITION {name}'))
+        db.session.execute(text(f'DROP TABLE {name}'))
+        db.session.commit()
+        current_app.logger.info('Dropped notifications partition %s', name)
+
+    return [name for name, _ in expired]
+
+
 @statsd(namespace='dao')
 @transactional
 def dao_delete_notification_by_id(notification_id):
@@ -819,28 +1193,43 @@ def _timeout_notifications(
     timeout_start: datetime,
     updated_at: datetime,
     status_reason: str,
-) -> list[Notification] | None:
-    stmt = select(Notification).where(
-        Notification.created_at < timeout_start,
-        Notification.status.in_(current_statuses),
-        Notification.notification_type != LETTER_TYPE,
-    )
-    notifications = db.session.scalars(stmt).all()
+    batch_size: int = TIMEOUT_BATCH_SIZE,
+) -> Iterator[list[Row]]:
+    """
+    Update timed out notifications batch_size at a time, committing and yielding the updated rows after each batch.
+    Rows locked by another transaction are skipped and picked up by the next run.
+    """
 
-    stmt = (
-        update(Notification)
+    timed_out = (
+        select(Notification.id)
         .where(
             Notification.created_at < timeout_start,
             Notification.status.in_(current_statuses),
             Notification.notification_type != LETTER_TYPE,
         )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Notification)
+        .where(Notification.id.in_(timed_out.scalar_subquery()), Notification.created_at < timeout_start)
         .values({'status': new_status, 'updated_at': updated_at, 'status_reason': status_reason})
+        .returning(*_STATUS_UPDATE_RETURNING_COLUMNS)
     )
-    db.session.execute(stmt, execution_options={'synchronize_session': False})
-    return notifications
 
+    while True:
+        notifications = db.session.execute(stmt, execution_options={'synchronize_session': False}).all()
+        db.session.commit()
+        if notifications:
+            yield notifications
+        if len(notifications) < batch_size:
+            return
 
-def dao_timeout_notifications(timeout_period_in_seconds):
+
+def dao_timeout_notifications(
+    timeout_period_in_seconds,
+    batch_size: int = TIMEOUT_BATCH_SIZE,
+) -> tuple[Iterator[list[Row]], Iterator[list[Row]]]:
     """
     Timeout SMS and email notifications by the following rules:
 
@@ -852,10 +1241,15 @@ def dao_timeout_notifications(timeout_period_in_seconds):
         pending -> temporary-failure
 
     Letter notifications are not timed out
+
+    Returns a generator of batches for each rule.  Nothing is updated until a generator is iterated.  The rows have
+    the attributes in _STATUS_UPDATE_RETURNING_COLUMNS, which is what delivery status callbacks need.
     """
     timeout_start = datetime.utcnow() - timedelta(seconds=timeout_period_in_seconds)
     updated_at = datetime.utcnow()
-    timeout = functools.partial(_timeout_notifications, timeout_start=timeout_start, updated_at=updated_at)
+    timeout = functools.partial(
+        _timeout_notifications, timeout_start=timeout_start, updated_at=updated_at, batch_size=batch_size
+    )
 
     # Notifications still in created status are marked with a permanent-failure:
     unsent_failed_notifications = timeout(
@@ -871,8 +1265,6 @@ def dao_timeout_notifications(timeout_period_in_seconds):
         status_reason=STATUS_REASON_RETRYABLE,
     )
 
-    db.session.commit()
-
     return unsent_failed_notifications, temporary_failure_notifications
 
 
@@ -949,6 +1341,12 @@ def dao_get_notification_by_reference(reference) -> Notification:
     return db.session.scalars(stmt).one()
 
 
+@statsd(namespace='dao')
+def dao_get_notifications_by_references(references: list[str]) -> list[Notification]:
+    stmt = select(Notification).where(Notification.reference.in_(references))
+    return db.session.scalars(stmt).all()
+
+
 @statsd(namespace='dao')
 def dao_get_notification_history_by_reference(reference):
     try:
@@ -971,7 +1369,7 @@ def dao_created_scheduled_notification(scheduled_notification):
 def dao_get_scheduled_notifications():
     stmt = (
         select(Notification)
-        .join(ScheduledNotification)
+        .join(Notification.scheduled_notification)
         .where(ScheduledNotification.scheduled_for < datetime.utcnow(), ScheduledNotification.pending)
     )
     notifications = db.session.scalars(stmt).all()
@@ -1049,6 +1447,47 @@ def dao_increment_notification_retry_count(notification_id: UUID) -> int:
     return result.scalar()
 
 
+@statsd(namespace='dao')
+def dao_update_notification_if_unchanged(
+    notification_id: UUID,
+    current_status: str,
+    current_status_reason: str | None,
+    increment_retry_count: bool = False,
+    **kwargs,
+) -> Row | None:
+    """
+    Update a notification with one UPDATE ... RETURNING statement, if its status and status reason are still the ones
+    the new values were computed from.  The caller is responsible for committing.
+
+    Args:
+        notification_id (UUID): The notification to update
+        current_status (str): The status the notification is expected to have
+        current_status_reason (str | None): The status reason the notification is expected to have
+        increment_retry_count (bool): Whether to increment the notification's retry_count
+        **kwargs: The notification key-value pairs to be updated
+
+    Returns:
+        Row | None: The _STATUS_UPDATE_RETURNING_COLUMNS, retry_count, and provider_updated_at of the updated
+            notification, or None if it does not exist or its status has changed
+    """
+
+    if increment_retry_count:
+        kwargs['retry_count'] = func.coalesce(Notification.retry_count, 0) + 1
+
+    stmt = (
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.status == current_status,
+            Notification.status_reason.is_not_distinct_from(current_status_reason),
+        )
+        .values(kwargs)
+        .returning(*_STATUS_UPDATE_RETURNING_COLUMNS, Notification.retry_count, Notification.provider_updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.execute(stmt).first()
+
+
 @statsd(namespace='dao')
 @transactional
 def dao_update_provider_updated_at(notification_id: UUID, provider_updated_at: datetime) -> None:
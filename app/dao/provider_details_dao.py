@@ -1,16 +1,17 @@
 from datetime import datetime
 
-from cachetools import cached, TTLCache
+from cachetools import cached
 from notifications_utils.timezones import convert_utc_to_local_timezone
 from sqlalchemy import asc, desc, func, select
 
+from app.dao.cache_invalidation import PROVIDER_DETAILS, InvalidatedTTLCache, invalidate_after_commit
 from app.dao.dao_utils import transactional
 from app.models import FactBilling, ProviderDetails, ProviderDetailsData, ProviderDetailsHistory, SMS_TYPE
 from app.model import User
 from app import db
 
 
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
+@cached(cache=InvalidatedTTLCache(PROVIDER_DETAILS, maxsize=1024))
 def get_provider_details_by_id(provider_details_id) -> ProviderDetailsData | None:
     provider = db.session.get(ProviderDetails, provider_details_id)
 
@@ -35,7 +36,7 @@ def dao_get_provider_versions(provider_id):
     return db.session.scalars(stmt).all()
 
 
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
+@cached(cache=InvalidatedTTLCache(PROVIDER_DETAILS, maxsize=1024))
 def get_highest_priority_active_provider_identifier_by_notification_type(
     notification_type: str, supports_international: bool = False
 ) -> str | None:
@@ -57,6 +58,7 @@ def get_highest_priority_active_provider_identifier_by_notification_type(
 
 @transactional
 def dao_update_provider_details(provider_details):
+    invalidate_after_commit(PROVIDER_DETAILS)
     provider_details.version += 1
     provider_details.updated_at = datetime.utcnow()
     history = ProviderDetailsHistory.from_original(provider_details)
@@ -1,10 +1,11 @@
 from datetime import datetime
 
-from cachetools import cached, TTLCache
+from cachetools import cached
 from sqlalchemy import select
 
 from app import db
 from app.constants import COMPLAINT_CALLBACK_TYPE, DELIVERY_STATUS_CALLBACK_TYPE, INBOUND_SMS_CALLBACK_TYPE
+from app.dao.cache_invalidation import SERVICE_CALLBACKS, InvalidatedTTLCache, invalidate_after_commit
 from app.dao.dao_utils import transactional, version_class
 from app.models import ServiceCallback, DeliveryStatusCallbackApiData
 from app.utils import create_uuid
@@ -13,6 +14,7 @@ from app.utils import create_uuid
 @transactional
 @version_class(ServiceCallback)
 def save_service_callback_api(service_callback_api):
+    invalidate_after_commit(SERVICE_CALLBACKS)
     service_callback_api.id = create_uuid()
     service_callback_api.created_at = datetime.utcnow()
     db.session.add(service_callback_api)
@@ -31,6 +33,7 @@ def reset_service_callback_api(
     if bearer_token:
         service_callback_api.bearer_token = bearer_token
     service_callback_api.updated_by_id = updated_by_id
+    invalidate_after_commit(SERVICE_CALLBACKS)
     service_callback_api.updated_at = datetime.utcnow()
 
     db.session.add(service_callback_api)
@@ -39,6 +42,7 @@ def reset_service_callback_api(
 @transactional
 @version_class(ServiceCallback)
 def store_service_callback_api(service_callback_api):
+    invalidate_after_commit(SERVICE_CALLBACKS)
     service_callback_api.updated_at = datetime.utcnow()
     db.session.add(service_callback_api)
 
@@ -51,7 +55,7 @@ def get_service_callbacks(service_id):
 ###
 # Not to be used in rest controllers where we need to operate within a service user has permissions for
 ###
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
+@cached(cache=InvalidatedTTLCache(SERVICE_CALLBACKS, maxsize=1024))
 def get_service_callback(service_callback_id) -> DeliveryStatusCallbackApiData:
     service_callback = db.session.get(ServiceCallback, service_callback_id)
 
@@ -76,7 +80,7 @@ def query_service_callback(
     return db.session.scalars(stmt).one()
 
 
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
+@cached(cache=InvalidatedTTLCache(SERVICE_CALLBACKS, maxsize=1024))
 def get_service_delivery_status_callback_api_for_service(
     service_id,
     notification_status,
@@ -111,7 +115,7 @@ def get_service_complaint_callback_api_for_service(service_id):
     return db.session.scalars(stmt).first()
 
 
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
+@cached(cache=InvalidatedTTLCache(SERVICE_CALLBACKS, maxsize=1024))
 def get_service_inbound_sms_callback_api_for_service(service_id) -> DeliveryStatusCallbackApiData | None:
     stmt = select(ServiceCallback).where(
         ServiceCallback.service_id == service_id, ServiceCallback.callback_type == INBOUND_SMS_CALLBACK_TYPE
@@ -135,4 +139,5 @@ def get_service_inbound_sms_callback_api_for_service(service_id) -> DeliveryStat
 
 @transactional
 def delete_service_callback_api(service_callback_api):
+    invalidate_after_commit(SERVICE_CALLBACKS)
     db.session.delete(service_callback_api)
@@ -1,12 +1,13 @@
 from app import db
 from app.models import ServiceCallback
-from cachetools import cached, TTLCache
+from app.dao.cache_invalidation import SERVICE_CALLBACKS, InvalidatedTTLCache
+from cachetools import cached
 from notifications_utils.statsd_decorators import statsd
 from sqlalchemy import select
 
 
 @statsd(namespace='dao')
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
+@cached(cache=InvalidatedTTLCache(SERVICE_CALLBACKS, maxsize=1024))
 def dao_get_callback_include_payload_status(
     service_id,
     service_callback_type,
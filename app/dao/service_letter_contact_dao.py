@@ -1,4 +1,5 @@
 from app import db
+from app.dao.cache_invalidation import TEMPLATES, invalidate_after_commit
 from app.dao.dao_utils import transactional
 from app.models import ServiceLetterContact, Template
 from sqlalchemy import desc, select, update
@@ -66,6 +67,7 @@ def archive_letter_contact(
     service_id,
     letter_contact_id,
 ):
+    invalidate_after_commit(TEMPLATES)
     db.session.execute(
         update(Template)
         .where(Template.service_letter_contact_id == letter_contact_id)
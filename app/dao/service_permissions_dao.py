@@ -1,4 +1,5 @@
 from app import db
+from app.dao.cache_invalidation import SERVICES, invalidate_after_commit
 from app.dao.dao_utils import transactional
 from app.models import ServicePermission
 from sqlalchemy import delete, select
@@ -15,6 +16,7 @@ def dao_add_service_permission(
     permission,
 ):
     service_permission = ServicePermission(service_id=service_id, permission=permission)
+    invalidate_after_commit(SERVICES)
     db.session.add(service_permission)
 
 
@@ -27,5 +29,6 @@ def dao_remove_service_permission(
     )
 
     deleted = db.session.execute(stmt).rowcount
+    invalidate_after_commit(SERVICES)
     db.session.commit()
     return deleted
@@ -1,10 +1,11 @@
-from cachetools import TTLCache, cached
+from cachetools import cached
 from datetime import datetime, timedelta
 from uuid import UUID
 
 from sqlalchemy import desc, select, update
 
 from app import db
+from app.dao.cache_invalidation import SERVICES, SMS_SENDERS, InvalidatedTTLCache, invalidate_after_commit
 from app.dao.dao_utils import transactional
 from app.models import ProviderDetails, ServiceSmsSender, InboundNumber, ServiceSmsSenderData, DATETIME_FORMAT
 from app.service.exceptions import (
@@ -14,7 +15,7 @@ from app.service.exceptions import (
     SmsSenderRateLimitIntegrityException,
 )
 
-sms_sender_data_cache = TTLCache(maxsize=1024, ttl=timedelta(hours=12), timer=datetime.now)
+sms_sender_data_cache = InvalidatedTTLCache(SMS_SENDERS, maxsize=1024, ttl=timedelta(hours=12), timer=datetime.now)
 
 
 def insert_service_sms_sender(
@@ -26,6 +27,7 @@ def insert_service_sms_sender(
     """
 
     new_sms_sender = ServiceSmsSender(sms_sender=sms_sender, service=service, is_default=True)
+    invalidate_after_commit(SERVICES, SMS_SENDERS)
     db.session.add(new_sms_sender)
 
 
@@ -176,6 +178,7 @@ def dao_add_sms_sender_for_service(
         sms_sender_specifics=sms_sender_specifics,
     )
 
+    invalidate_after_commit(SERVICES, SMS_SENDERS)
     db.session.add(new_sms_sender)
     return new_sms_sender
 
@@ -229,6 +232,7 @@ def dao_update_service_sms_sender(
     for key, value in kwargs.items():
         setattr(sms_sender_to_update, key, value)
 
+    invalidate_after_commit(SERVICES, SMS_SENDERS)
     db.session.add(sms_sender_to_update)
     return sms_sender_to_update
 
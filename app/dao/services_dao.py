@@ -1,7 +1,7 @@
 import uuid
 from datetime import date, datetime, timedelta
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from flask import current_app
 from notifications_utils.statsd_decorators import statsd
 from notifications_utils.timezones import convert_utc_to_local_timezone
@@ -12,6 +12,14 @@ from sqlalchemy.sql.expression import asc
 
 from app import db
 from app.constants import DEFAULT_SERVICE_NOTIFICATION_PERMISSIONS, KEY_TYPE_TEST
+from app.dao.cache_invalidation import (
+    SERVICES,
+    SMS_SENDERS,
+    TEMPLATE_VERSIONS,
+    TEMPLATES,
+    InvalidatedTTLCache,
+    invalidate_after_commit,
+)
 from app.dao.dao_utils import get_reader_session, transactional, version_class
 from app.dao.organisation_dao import dao_get_organisation_by_email_address
 from app.dao.service_sms_sender_dao import insert_service_sms_sender
@@ -80,7 +88,7 @@ def dao_fetch_service_by_inbound_number(number):
     return db.session.execute(stmt).scalar_one_or_none()
 
 
-@cached(TTLCache(maxsize=1024, ttl=600))
+@cached(InvalidatedTTLCache(SERVICES, maxsize=1024))
 def dao_fetch_service_by_id_with_api_keys(
     service_id: str,
     only_active=False,
@@ -180,6 +188,7 @@ def dao_create_service(
 @transactional
 @version_class(Service)
 def dao_update_service(service):
+    invalidate_after_commit(SERVICES)
     db.session.add(service)
 
 
@@ -243,6 +252,8 @@ def delete_service_and_all_associated_db_objects(service):
         service.users.remove(user)
 
     _delete_commit(delete(Service.get_history_model()).where(Service.get_history_model().id == service.id))
+    # Clear the service and everything deleted with it from the caches once the service itself is gone
+    invalidate_after_commit(SERVICES, SMS_SENDERS, TEMPLATES, TEMPLATE_VERSIONS)
     db.session.delete(service)
     db.session.commit()
 
@@ -3,11 +3,18 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from sqlalchemy import asc, desc, func, select, update
 
 from app import db
 from app.constants import EMAIL_TYPE, SMS_TYPE
+from app.dao.cache_invalidation import (
+    TEMPLATE_VERSIONS,
+    TEMPLATES,
+    InvalidatedLRUCache,
+    InvalidatedTTLCache,
+    invalidate_after_commit,
+)
 from app.dao.dao_utils import (
     transactional,
     version_class,
@@ -24,10 +31,14 @@ from app.utils import generate_html_email_content
 
 from notifications_utils.recipients import try_validate_and_format_phone_number
 
-template_cache = TTLCache(maxsize=1024, ttl=600)  # Cache for 10 minutes
+# How many template versions each process keeps.  A version never changes once written, except for redaction.
+TEMPLATE_VERSION_CACHE_SIZE = 4096
 
+template_cache = InvalidatedTTLCache(TEMPLATES, maxsize=1024)
+template_version_cache = InvalidatedLRUCache(TEMPLATE_VERSIONS, maxsize=TEMPLATE_VERSION_CACHE_SIZE)
 
-@dataclass
+
+@dataclass(frozen=True)
 class TemplateHistoryData:
     # TemplateHistory attributes
     id: str
@@ -53,7 +64,14 @@ class TemplateHistoryData:
     provider_id: str | None = None
     communication_item_id: str | None = None
     redact_personalisation: bool = False
-    get_reply_to_text: str | None = None
+
+    def get_reply_to_text(self):
+        reply_to_text = None
+        if self.template_type == SMS_TYPE:
+            service = dao_fetch_service_by_id(self.service_id)
+            reply_to_text = try_validate_and_format_phone_number(service.get_default_sms_sender())
+
+        return reply_to_text
 
 
 @dataclass
@@ -127,6 +145,7 @@ def dao_create_template(template: Template):
         template.content_as_html = generate_html_email_content(template)
         template.content_as_plain_text = None
 
+    invalidate_after_commit(TEMPLATES)
     db.session.add(template)
 
 
@@ -152,6 +171,7 @@ def dao_update_template(template: Template):
     if template.template_type == EMAIL_TYPE and is_feature_enabled(FeatureFlag.STORE_TEMPLATE_CONTENT):
         template.content_as_html = generate_html_email_content(template)
 
+    invalidate_after_commit(TEMPLATES)
     db.session.add(template)
 
 
@@ -194,6 +214,7 @@ def dao_update_template_reply_to(
         }
     )
     db.session.add(history)
+    invalidate_after_commit(TEMPLATES)
     return template
 
 
@@ -205,6 +226,8 @@ def dao_redact_template(
     template.template_redacted.redact_personalisation = True
     template.template_redacted.updated_at = datetime.utcnow()
     template.template_redacted.updated_by_id = user_id
+    # Redaction applies to every version of the template, so it is the one change that affects cached versions
+    invalidate_after_commit(TEMPLATES, TEMPLATE_VERSIONS)
     db.session.add(template.template_redacted)
 
 
@@ -331,15 +354,16 @@ def _build_template_history_data(template_history_object: TemplateHistory) -> Te
         provider_id=template_history_object.provider_id,
         communication_item_id=template_history_object.communication_item_id,
         redact_personalisation=getattr(template_history_object, 'redact_personalisation', False),
-        get_reply_to_text=template_history_object.get_reply_to_text,
     )
 
 
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
 def dao_get_template_history_by_id(template_id: str, version: str) -> TemplateHistoryData | None:
     """
     Return a specific TemplateHistoryData row by template id and version.
 
+    Versions are immutable, so they are cached without a TTL.  Misses are not cached, because a version that does
+    not exist yet may be written later.
+
     Args:
         template_id (str): Template identifier.
         version (str): Version number to fetch.
@@ -347,16 +371,22 @@ def dao_get_template_history_by_id(template_id: str, version: str) -> TemplateHi
     Returns:
         TemplateHistoryData | None: Matching history row, or None if not found.
     """
+    key = (str(template_id), int(version))
+    if key in template_version_cache:
+        return template_version_cache[key]
+
     stmt = select(TemplateHistory).where(TemplateHistory.id == template_id, TemplateHistory.version == version)
     template_history_object = db.session.scalars(stmt).first()
 
     if template_history_object is None:
         return None
 
-    return _build_template_history_data(template_history_object)
+    template_history_data = _build_template_history_data(template_history_object)
+    template_version_cache[key] = template_history_data
+    return template_history_data
 
 
-@cached(cache=TTLCache(maxsize=1024, ttl=600))
+@cached(cache=InvalidatedTTLCache(TEMPLATES, maxsize=1024))
 def dao_get_latest_template_history_by_id_and_service_id(
     template_id: str,
     service_id: uuid.UUID,
@@ -7,8 +7,12 @@ from flask import Blueprint, current_app, jsonify, request
 from app import aws_pinpoint_client
 from app.celery.exceptions import NonRetryableException
 from celery.exceptions import CeleryError
+from kombu.exceptions import OperationalError
 from app.celery.process_delivery_status_result_tasks import get_notification_platform_status
-from app.celery.process_pinpoint_v2_receipt_tasks import process_pinpoint_v2_receipt_results
+from app.celery.process_pinpoint_v2_receipt_tasks import (
+    RECEIPT_BATCH_SIZE,
+    process_pinpoint_v2_receipt_results_batch,
+)
 from app.clients.sms import SmsStatusRecord
 from app.config import QueueNames
 from app.errors import register_errors
@@ -21,7 +25,7 @@ register_errors(pinpoint_v2_blueprint)
 def handler():
     """
     Handle Pinpoint SMS Voice V2 delivery status updates.
-    Decodes request body and processes each record through Celery.
+    Decodes request body and processes the records with a Celery task per RECEIPT_BATCH_SIZE records.
 
     Returns:
         tuple: (json response, status code)
@@ -31,6 +35,7 @@ def handler():
     current_app.logger.debug('PinpointV2 delivery-status request: %s', request_data)
 
     records = request_data.get('records', [])
+    receipts = []
 
     for record in records:
         try:
@@ -56,14 +61,21 @@ def handler():
             )
             continue
 
+        receipts.append((notification_platform_status, decoded_record_data.get('eventTimestamp')))
+
+    for start in range(0, len(receipts), RECEIPT_BATCH_SIZE):
         try:
-            process_pinpoint_v2_receipt_results.apply_async(
-                [notification_platform_status, decoded_record_data.get('eventTimestamp')],
+            process_pinpoint_v2_receipt_results_batch.apply_async(
+                [receipts[start : start + RECEIPT_BATCH_SIZE]],
                 queue=QueueNames.NOTIFY,
                 serializer='pickle',
             )
-        except CeleryError:
-            current_app.logger.error('Celery unavailable for record: %s', record)
+        except (CeleryError, OperationalError):
+            current_app.logger.error(
+                'Celery unavailable for %s records of request: %s',
+                len(receipts) - start,
+                request_data.get('requestId'),
+            )
 
             # Return 503 so Firehose will retry later when Celery is available
             return jsonify(
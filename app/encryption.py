@@ -23,6 +23,16 @@ class Encryption:
     ):
         return self.serializer.loads(thing_to_decrypt, salt=self.salt)
 
+    def decrypt_many(
+        self,
+        things_to_decrypt,
+    ):
+        """
+        Decrypt each distinct value once with a single signer, returning a dict of encrypted value to decrypted value.
+        """
+        signer = self.serializer.make_signer(self.salt)
+        return {thing: self.serializer.load_payload(signer.unsign(thing)) for thing in set(things_to_decrypt)}
+
 
 def hashpw(password):
     return generate_password_hash(password.encode('UTF-8'), 10).decode('utf-8')
@@ -3,6 +3,7 @@ import os
 
 
 class FeatureFlag(Enum):
+    CALLBACK_DISPATCHER_ENABLED = 'CALLBACK_DISPATCHER_ENABLED'
     CHECK_TEMPLATE_NAME_EXISTS_ENABLED = 'CHECK_TEMPLATE_NAME_EXISTS_ENABLED'
     EMAIL_DELIVERY_STATUS_OVERHAUL = 'EMAIL_DELIVERY_STATUS_OVERHAUL'
     PINPOINT_SMS_VOICE_V2 = 'PINPOINT_SMS_VOICE_V2'
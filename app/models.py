@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable
 
 import datetime
 import html
@@ -1237,6 +1237,8 @@ class Notification(db.Model):
     key_type = db.Column(db.String, db.ForeignKey('key_types.name'), index=True, unique=False, nullable=False)
     billable_units = db.Column(db.Integer, nullable=False, default=0)
     notification_type = db.Column(_notification_types, index=True, nullable=False)
+    # The table's primary key is (id, created_at) because it is partitioned by created_at.  notification_ids keeps
+    # ids unique.
     created_at = db.Column(db.DateTime, index=True, unique=False, nullable=False)
     sent_at = db.Column(db.DateTime, index=False, unique=False, nullable=True)
     sent_by = db.Column(db.String, nullable=True)
@@ -1260,7 +1262,11 @@ class Notification(db.Model):
     client_reference = db.Column(db.String, index=True, nullable=True)
 
     _personalisation = db.Column(db.String, nullable=True)
-    scheduled_notification = db.relationship('ScheduledNotification', uselist=False)
+    scheduled_notification = db.relationship(
+        'ScheduledNotification',
+        primaryjoin='Notification.id == foreign(ScheduledNotification.notification_id)',
+        uselist=False,
+    )
 
     international = db.Column(db.Boolean, nullable=False, default=False)
     phone_prefix = db.Column(db.String, nullable=True)
@@ -1296,7 +1302,10 @@ class Notification(db.Model):
     )
 
     recipient_identifiers = db.relationship(
-        'RecipientIdentifier', collection_class=attribute_mapped_collection('id_type'), cascade='all, delete-orphan'
+        'RecipientIdentifier',
+        primaryjoin='Notification.id == foreign(RecipientIdentifier.notification_id)',
+        collection_class=attribute_mapped_collection('id_type'),
+        cascade='all, delete-orphan',
     )
 
     __table_args__ = (
@@ -1328,9 +1337,16 @@ class Notification(db.Model):
 
     @property
     def personalisation(self):
-        if self._personalisation:
-            return encryption.decrypt(self._personalisation)
-        return {}
+        if not self._personalisation:
+            return {}
+
+        # The decrypted value is cached with the ciphertext it came from, so the cache can't outlive a change to
+        # _personalisation however it's made.  Callers get a copy, so they can't change the cached value.
+        cached = getattr(self, '_personalisation_cache', None)
+        if cached is None or cached[0] != self._personalisation:
+            cached = (self._personalisation, encryption.decrypt(self._personalisation))
+            self._personalisation_cache = cached
+        return cached[1].copy()
 
     @personalisation.setter
     def personalisation(
@@ -1338,6 +1354,18 @@ class Notification(db.Model):
         personalisation,
     ):
         self._personalisation = encryption.encrypt(personalisation or {})
+        self._personalisation_cache = None
+
+    @staticmethod
+    def decrypt_personalisation(notifications: Iterable[Notification]) -> None:
+        """Fill the personalisation cache of many notifications, such as a page being serialized, at once."""
+        notifications = [n for n in notifications if n._personalisation]
+        decrypted = encryption.decrypt_many(n._personalisation for n in notifications)
+        for notification in notifications:
+            notification._personalisation_cache = (
+                notification._personalisation,
+                decrypted[notification._personalisation],
+            )
 
     def completed_at(self):
         if self.status in NOTIFICATION_STATUS_TYPES_COMPLETED:
@@ -1507,18 +1535,51 @@ class Notification(db.Model):
             'type': self.notification_type,
         }
 
-    def serialize(self):
-        template_dict = {'version': self.template.version, 'id': self.template.id, 'uri': self.template.get_link()}
+    @classmethod
+    def serialize_many(
+        cls,
+        notifications: Iterable[Notification],
+    ) -> list[dict]:
+        """
+        Serialize a page of notifications.  Personalisation is decrypted in bulk, and the template link and redacted
+        body and subject are built once per template version and set of personalisation keys rather than per row.
+        Load the relationships serialize uses eagerly (see get_notifications_for_service) to avoid a query per row.
+        """
+
+        notifications = list(notifications)
+        cls.decrypt_personalisation(notifications)
+        template_cache = {}
+        return [notification.serialize(template_cache) for notification in notifications]
 
+    def serialize(
+        self,
+        template_cache: dict | None = None,
+    ):
+        if template_cache is None:
+            template_cache = {}
+
+        template_key = (self.template.id, self.template.version)
+        if template_key not in template_cache:
+            template_cache[template_key] = {
+                'version': self.template.version,
+                'id': self.template.id,
+                'uri': self.template.get_link(),
+            }
+        template_dict = dict(template_cache[template_key])
+
+        personalisation = self.personalisation
+        content_key = (*template_key, frozenset(personalisation))
+        if content_key not in template_cache:
+            template_cache[content_key] = (self.content, self.subject)
+        body, subject = template_cache[content_key]
+
+        pii_enabled = is_feature_enabled(FeatureFlag.PII_ENABLED)
         recipient_identifiers = [
             {
                 'id_type': recipient_identifier.id_type,
                 'id_value': (
                     '<redacted>'
-                    if (
-                        is_feature_enabled(FeatureFlag.PII_ENABLED)
-                        or (recipient_identifier.id_type == IdentifierType.ICN.value)
-                    )
+                    if (pii_enabled or (recipient_identifier.id_type == IdentifierType.ICN.value))
                     else recipient_identifier.id_value
                 ),
             }
@@ -1542,8 +1603,8 @@ class Notification(db.Model):
             'status': self.get_letter_status() if self.notification_type == LETTER_TYPE else self.status,
             'status_reason': self.status_reason,
             'template': template_dict,
-            'body': self.content,
-            'subject': self.subject,
+            'body': body,
+            'subject': subject,
             'created_at': self.created_at.strftime(DATETIME_FORMAT),
             'created_by_name': self.get_created_by_name(),
             'sent_at': self.sent_at.strftime(DATETIME_FORMAT) if self.sent_at else None,
@@ -1564,7 +1625,7 @@ class Notification(db.Model):
         }
 
         if self.notification_type == LETTER_TYPE:
-            col = Columns(self.personalisation)
+            col = Columns(personalisation)
             serialized['line_1'] = col.get('address_line_1')
             serialized['line_2'] = col.get('address_line_2')
             serialized['line_3'] = col.get('address_line_3')
@@ -1664,11 +1725,22 @@ class NotificationHistory(db.Model, HistoryModel):
         self.status = original.status
 
 
+class NotificationId(db.Model):
+    """
+    The id of every notification, maintained by triggers on notifications.  Its primary key keeps ids unique, and is
+    what foreign keys to notifications reference, since notifications' own primary key includes created_at.
+    """
+
+    __tablename__ = 'notification_ids'
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True)
+
+
 class ScheduledNotification(db.Model):
     __tablename__ = 'scheduled_notifications'
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    notification_id = db.Column(UUID(as_uuid=True), db.ForeignKey('notifications.id'), index=True, nullable=False)
+    notification_id = db.Column(UUID(as_uuid=True), db.ForeignKey('notification_ids.id'), index=True, nullable=False)
     scheduled_for = db.Column(db.DateTime, index=False, nullable=False)
     pending = db.Column(db.Boolean, nullable=False, default=True)
 
@@ -1676,7 +1748,7 @@ class ScheduledNotification(db.Model):
 class RecipientIdentifier(db.Model):
     __tablename__ = 'recipient_identifiers'
     notification_id = db.Column(
-        UUID(as_uuid=True), db.ForeignKey('notifications.id', ondelete='cascade'), primary_key=True, nullable=False
+        UUID(as_uuid=True), db.ForeignKey('notification_ids.id', ondelete='cascade'), primary_key=True, nullable=False
     )
     id_type = db.Column(
         db.Enum(*IdentifierType.values(), name='id_types'),
@@ -2,6 +2,7 @@ import base64
 import json
 import uuid
 from datetime import datetime
+from typing import Any
 
 import boto3
 from botocore.exceptions import ClientError
@@ -14,6 +15,7 @@ from notifications_utils.recipients import (
 )
 from notifications_utils.timezones import convert_local_timezone_to_utc
 
+from app import encryption
 from app.celery import provider_tasks
 from app.celery.contact_information_tasks import lookup_contact_info
 from app.celery.lookup_va_profile_id_task import lookup_va_profile_id
@@ -28,6 +30,7 @@ from app.constants import (
 
 from app.dao.notifications_dao import (
     dao_create_notification,
+    dao_create_notifications_bulk,
     dao_delete_notification_by_id,
     dao_created_scheduled_notification,
 )
@@ -42,6 +45,9 @@ from app.v2.errors import BadRequestError
 from app.utils import get_template_instance
 from app.va.identifier import IdentifierType
 
+# The maximum number of entries SQS accepts in one SendMessageBatch request
+SQS_SEND_MESSAGE_BATCH_SIZE = 10
+
 
 def create_content_for_notification(
     template: Template,
@@ -124,40 +130,21 @@ def persist_notification(
     )
 
     if isinstance(recipient_identifier, dict):
-        # id_value is a non-empty string or Pii subclass instance.
-        recipient_identifier_value = recipient_identifier['id_value']
-
-        if isinstance(recipient_identifier_value, Pii):
-            # Get the encrypted value, rather than the output of Pii.__str__, because the value needs to be
-            # decrypted and used downstream.
-            recipient_identifier_value = recipient_identifier_value.get_encrypted_value()
-            current_app.logger.debug(
-                'Persisting the encrypted recipient identifier value %s %s for notification %s.',
-                recipient_identifier['id_type'],
-                recipient_identifier_value,
-                notification_id,
-            )
-
         _recipient_identifier = RecipientIdentifier(
             notification_id=notification_id,
             id_type=recipient_identifier['id_type'],
-            id_value=recipient_identifier_value,
+            id_value=_get_recipient_identifier_value(recipient_identifier, notification_id),
         )
 
         notification.recipient_identifiers.set(_recipient_identifier)
     # Else, the recipient_identifier should be None for notifications sent with a phone number or
     # e-mail address in the post data.
 
-    if notification_type == SMS_TYPE and notification.to:
-        validated_recipient = ValidatedPhoneNumber(recipient)
-        notification.normalised_to = validated_recipient.formatted
-        notification.international = validated_recipient.international
-        notification.phone_prefix = validated_recipient.country_code
-        notification.rate_multiplier = validated_recipient.billable_units
-    elif notification_type == EMAIL_TYPE and notification.to:
-        notification.normalised_to = format_email_address(notification.to)
-    elif notification_type == LETTER_TYPE:
+    if notification_type == LETTER_TYPE:
         notification.postage = postage or template_postage
+    elif notification.to:
+        for column, value in get_recipient_columns(notification_type, recipient).items():
+            setattr(notification, column, value)
 
     if not simulated:
         # Persist the Notification in the database.
@@ -168,6 +155,153 @@ def persist_notification(
     return notification
 
 
+def get_recipient_columns(
+    notification_type: str,
+    recipient: str,
+) -> dict[str, Any]:
+    """
+    Derive the columns of a notification that depend on its recipient's contact information.  Phone numbers are
+    normalised and priced, and e-mail addresses are normalised.
+    """
+
+    if notification_type == SMS_TYPE:
+        validated_recipient = ValidatedPhoneNumber(recipient)
+        return {
+            'normalised_to': validated_recipient.formatted,
+            'international': validated_recipient.international,
+            'phone_prefix': validated_recipient.country_code,
+            'rate_multiplier': validated_recipient.billable_units,
+        }
+    elif notification_type == EMAIL_TYPE:
+        return {'normalised_to': format_email_address(recipient)}
+
+    return {}
+
+
+def _get_recipient_identifier_value(
+    recipient_identifier: dict,
+    notification_id,
+) -> str:
+    # id_value is a non-empty string or Pii subclass instance.
+    recipient_identifier_value = recipient_identifier['id_value']
+
+    if isinstance(recipient_identifier_value, Pii):
+        # Get the encrypted value, rather than the output of Pii.__str__, because the value needs to be
+        # decrypted and used downstream.
+        recipient_identifier_value = recipient_identifier_value.get_encrypted_value()
+        current_app.logger.debug(
+            'Persisting the encrypted recipient identifier value %s %s for notification %s.',
+            recipient_identifier['id_type'],
+            recipient_identifier_value,
+            notification_id,
+        )
+
+    return recipient_identifier_value
+
+
+def persist_notifications_bulk(
+    *,
+    template_id,
+    template_version,
+    service_id,
+    notification_type,
+    api_key_id,
+    key_type,
+    recipients: list[dict[str, Any]],
+    created_at=None,
+    job_id=None,
+    created_by_id=None,
+    status=NOTIFICATION_CREATED,
+    reply_to_text=None,
+    billing_code=None,
+    sms_sender_id=None,
+    callback_url=None,
+) -> list[Notification]:
+    """
+    Persist many notifications that share a template using multi-row INSERT statements in a single transaction.
+    This is the batch counterpart of persist_notification for producers that create many notifications at once,
+    such as jobs and bulk API requests.
+
+    Each item in recipients is a dictionary with the keys "recipient" and "personalisation", and optionally
+    "notification_id", "job_row_number", "reference", "client_reference", "recipient_identifier", and "simulated".
+    As with persist_notification, simulated notifications are not written to the database.
+
+    Returns:
+        list[Notification]: Transient (not session bound) instances in the same order as recipients
+    """
+
+    notification_created_at = created_at or datetime.utcnow()
+    notification_rows = []
+    recipient_identifier_rows = []
+    notifications = []
+
+    for item in recipients:
+        notification_id = item.get('notification_id') or uuid.uuid4()
+        recipient = item.get('recipient')
+
+        row = {
+            'id': notification_id,
+            'template_id': template_id,
+            'template_version': template_version,
+            'to': recipient,
+            'normalised_to': None,
+            'service_id': service_id,
+            '_personalisation': encryption.encrypt(item.get('personalisation') or {}),
+            'notification_type': notification_type,
+            'api_key_id': api_key_id,
+            'key_type': key_type,
+            'created_at': notification_created_at,
+            'job_id': job_id,
+            'job_row_number': item.get('job_row_number'),
+            'reference': item.get('reference'),
+            'client_reference': item.get('client_reference'),
+            'created_by_id': created_by_id,
+            'status': status,
+            'reply_to_text': reply_to_text,
+            'billable_units': 0,
+            'billing_code': billing_code,
+            'sms_sender_id': sms_sender_id,
+            'callback_url': callback_url,
+            'international': False,
+            'phone_prefix': None,
+            'rate_multiplier': None,
+            'segments_count': 0,
+            'cost_in_millicents': 0,
+        }
+
+        if recipient:
+            row.update(get_recipient_columns(notification_type, recipient))
+
+        recipient_identifier = item.get('recipient_identifier')
+
+        if not item.get('simulated'):
+            notification_rows.append(row)
+
+            if isinstance(recipient_identifier, dict):
+                recipient_identifier_rows.append(
+                    {
+                        'notification_id': notification_id,
+                        'id_type': recipient_identifier['id_type'],
+                        'id_value': _get_recipient_identifier_value(recipient_identifier, notification_id),
+                    }
+                )
+
+        notifications.append(Notification(**row))
+
+    if notification_rows:
+        dao_create_notifications_bulk(notification_rows, recipient_identifier_rows)
+
+    current_app.logger.info(
+        '%s %s notifications created at %s for template %s',
+        len(notification_rows),
+        notification_type,
+        notification_created_at,
+        template_id,
+    )
+
+    return notifications
+
+
 def send_notification_to_queue(
     notification,
     research_mode,
@@ -243,12 +377,100 @@ def send_notification_to_queue_delayed(
     # notification sms delivery already attempted at least once so safe to skip lookup_va_profile_id
     deliver_task, queue_name = _get_delivery_task(notification, research_mode, queue_name, sms_sender_id)
 
-    queue_prefix = current_app.config['NOTIFICATION_QUEUE_PREFIX']
-    prefixed_queue_name = f'{queue_prefix}{queue_name}'
+    prefixed_queue_name = f'{current_app.config["NOTIFICATION_QUEUE_PREFIX"]}{queue_name}'
+    queue = _get_sqs_queue(prefixed_queue_name)
+    queue_msg = _build_celery_sqs_message(
+        deliver_task.name, [str(notification.id), str(sms_sender_id)], prefixed_queue_name
+    )
+
+    try:
+        queue.send_message(MessageBody=queue_msg, DelaySeconds=delay_seconds)
+        current_app.logger.debug(
+            '%s %s sent to the %s queue for delivery | DelaySeconds: %s',
+            notification.notification_type,
+            notification.id,
+            queue,
+            delay_seconds,
+        )
+
+    except Exception:
+        current_app.logger.exception(
+            'SQS resource failed to queue message for sqs queue "%s". notification_id: %s',
+            prefixed_queue_name,
+            notification.id,
+        )
+        raise
+
+
+def send_notifications_to_queue_in_batches(
+    notifications: list[Notification],
+    research_mode: bool,
+    sms_sender_id: str | None = None,
+) -> list[Notification]:
+    """
+    Enqueue delivery tasks for notifications with contact information using SQS SendMessageBatch, which publishes up
+    to 10 Celery messages per request instead of one request per notification.
+
+    All of the notifications must share a delivery route (service, notification type, key type, and sender), as is
+    the case for notifications created together from one template.  Notifications that could not be enqueued are
+    deleted, as send_notification_to_queue does, and returned to the caller.
+
+    Returns:
+        list[Notification]: The notifications that failed to enqueue
+    """
+
+    if not notifications:
+        return []
+
+    deliver_task, queue_name = _get_delivery_task(notifications[0], research_mode, None, sms_sender_id)
+    prefixed_queue_name = f'{current_app.config["NOTIFICATION_QUEUE_PREFIX"]}{queue_name}'
+    queue = _get_sqs_queue(prefixed_queue_name)
+    task_sms_sender_id = None if sms_sender_id is None else str(sms_sender_id)
+    failed = []
+
+    for i in range(0, len(notifications), SQS_SEND_MESSAGE_BATCH_SIZE):
+        batch = {
+            str(notification.id): notification for notification in notifications[i : i + SQS_SEND_MESSAGE_BATCH_SIZE]
+        }
+        entries = [
+            {
+                'Id': notification_id,
+                'MessageBody': _build_celery_sqs_message(
+                    deliver_task.name, [notification_id, task_sms_sender_id], prefixed_queue_name
+                ),
+            }
+            for notification_id in batch
+        ]
+
+        try:
+            response = queue.send_messages(Entries=entries)
+            failed_ids = [entry['Id'] for entry in response.get('Failed', [])]
+        except Exception:
+            current_app.logger.exception(
+                'SQS resource failed to queue a batch of %s messages for sqs queue "%s".',
+                len(entries),
+                prefixed_queue_name,
+            )
+            failed_ids = list(batch)
+
+        for notification_id in failed_ids:
+            current_app.logger.error(
+                'Failed to queue notification %s for sqs queue "%s".', notification_id, prefixed_queue_name
+            )
+            dao_delete_notification_by_id(notification_id)
+            failed.append(batch[notification_id])
+
+    current_app.logger.info(
+        '%s notifications sent to the %s queue in batches', len(notifications) - len(failed), queue_name
+    )
+
+    return failed
 
+
+def _get_sqs_queue(prefixed_queue_name: str):
     try:
         sqs = boto3.resource('sqs', current_app.config['AWS_REGION'])
-        queue = sqs.get_queue_by_name(QueueName=prefixed_queue_name)
+        return sqs.get_queue_by_name(QueueName=prefixed_queue_name)
     except ClientError:
         current_app.logger.exception(
             'ClientError, failed to create SQS resource or could not get sqs queue "%s"',
@@ -262,10 +484,21 @@ def send_notification_to_queue_delayed(
         )
         raise
 
+
+def _build_celery_sqs_message(
+    task_name: str,
+    args: list,
+    prefixed_queue_name: str,
+) -> str:
+    """
+    Build the base64 encoded envelope the Celery SQS transport expects, so a message sent directly to SQS is
+    consumed like one published with apply_async.
+    """
+
     task_body = {
-        'task': deliver_task.name,
+        'task': task_name,
         'id': str(uuid.uuid4()),
-        'args': [str(notification.id), str(sms_sender_id)],
+        'args': args,
         'kwargs': {},
         'retries': 0,
     }
@@ -285,25 +518,7 @@ def send_notification_to_queue_delayed(
         },
     }
 
-    queue_msg = base64.b64encode(bytes(json.dumps(envelope), 'utf-8')).decode('utf-8')
-
-    try:
-        queue.send_message(MessageBody=queue_msg, DelaySeconds=delay_seconds)
-        current_app.logger.debug(
-            '%s %s sent to the %s queue for delivery | DelaySeconds: %s',
-            notification.notification_type,
-            notification.id,
-            queue,
-            delay_seconds,
-        )
-
-    except Exception:
-        current_app.logger.exception(
-            'SQS resource failed to queue message for sqs queue "%s". notification_id: %s',
-            prefixed_queue_name,
-            notification.id,
-        )
-        raise
+    return base64.b64encode(bytes(json.dumps(envelope), 'utf-8')).decode('utf-8')
 
 
 def _get_delivery_task(
@@ -1,6 +1,9 @@
 import base64
 import binascii
+import threading
+from time import monotonic, time
 from typing import Any
+from uuid import uuid4
 
 from flask import current_app
 from notifications_utils import SMS_CHAR_COUNT_LIMIT
@@ -20,8 +23,9 @@ from app.constants import (
     KEY_TYPE_TEAM,
     SCHEDULE_NOTIFICATIONS,
 )
-from app.dao import services_dao, templates_dao
+from app.dao import templates_dao
 from app.dao.service_sms_sender_dao import dao_get_service_sms_sender_by_id
+from app.dao.services_dao import fetch_todays_total_message_count
 from app.dao.templates_dao import dao_get_number_of_templates_by_service_id_and_name, TemplateHistoryData
 from app.models import ApiKey, Service
 from app.service.utils import service_allowed_to_send_to
@@ -30,6 +34,167 @@ from app.notifications.process_notifications import create_content_for_notificat
 from app.dao.service_letter_contact_dao import dao_get_letter_contact_by_id
 
 
+# The per-minute API rate limit window, in seconds
+API_RATE_LIMIT_INTERVAL = 60
+
+# How long a service's daily message count is trusted before it's reseeded from the database
+DAILY_LIMIT_CACHE_TTL = 3600
+
+LIMIT_OK = 0
+LIMIT_RATE_EXCEEDED = 1
+LIMIT_DAILY_EXCEEDED = 2
+LIMIT_DAILY_COUNT_MISSING = 3
+
+# Evaluates the API rate limit and the daily message limit and records the request against both in one atomic round
+# trip.  The rate limit is a sorted set of request timestamps over a sliding window; every request is recorded, as
+# before.  A daily count is only incremented when the request is admitted.  A missing daily count is seeded with the
+# given database count; without one, nothing is recorded and the caller runs the script again with the count.  A
+# negative limit skips that check.
+#   KEYS: rate limit key, daily limit key
+#   ARGV: now, interval, rate limit, request member, daily limit, notification count, daily count TTL, daily count
+#         seed or -1
+#   Returns: {LIMIT_* status, count sent today before this request}
+SERVICE_LIMITS_SCRIPT = """
+local daily_limit = tonumber(ARGV[5])
+local sent = 0
+if daily_limit >= 0 then
+    sent = redis.call('GET', KEYS[2])
+    if sent then
+        sent = tonumber(sent)
+    elseif tonumber(ARGV[8]) < 0 then
+        return {3, 0}
+    else
+        sent = tonumber(ARGV[8])
+        redis.call('SET', KEYS[2], sent, 'EX', ARGV[7])
+    end
+end
+
+local rate_limit = tonumber(ARGV[3])
+if rate_limit >= 0 then
+    local now = tonumber(ARGV[1])
+    local interval = tonumber(ARGV[2])
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - interval)
+    redis.call('EXPIRE', KEYS[1], interval)
+    if redis.call('ZCARD', KEYS[1]) > rate_limit then
+        return {1, 0}
+    end
+end
+
+if daily_limit < 0 then
+    return {0, 0}
+end
+
+local notification_count = tonumber(ARGV[6])
+if sent + notification_count > daily_limit then
+    return {2, sent}
+end
+redis.call('INCRBY', KEYS[2], notification_count)
+return {0, sent}
+"""
+
+_service_limits_script = None
+
+
+def _evaluate_service_limits(
+    service: Service,
+    key_type: str,
+    check_rate_limit: bool,
+    check_daily_limit: bool,
+    notification_count: int,
+    daily_count_seed: int = -1,
+) -> tuple[int, int]:
+    """Run SERVICE_LIMITS_SCRIPT for the service.  Redis errors admit the request, as the Redis client does.
+
+    Returns:
+        tuple[int, int]: The LIMIT_* status, and the count sent today before this request
+    """
+    global _service_limits_script
+    if _service_limits_script is None:
+        _service_limits_script = redis_store.redis_store.register_script(SERVICE_LIMITS_SCRIPT)
+
+    now = time()
+    try:
+        status, sent = _service_limits_script(
+            keys=[rate_limit_cache_key(service.id, key_type), daily_limit_cache_key(service.id)],
+            args=[
+                now,
+                API_RATE_LIMIT_INTERVAL,
+                service.rate_limit if check_rate_limit else -1,
+                f'{now}-{uuid4().hex}',
+                service.message_limit if check_daily_limit else -1,
+                notification_count,
+                DAILY_LIMIT_CACHE_TTL,
+                daily_count_seed,
+            ],
+        )
+    except Exception:
+        current_app.logger.exception('Failed to check the rate and daily limits for service %s', service.id)
+        return LIMIT_OK, 0
+    return int(status), int(sent)
+
+
+def _check_service_limits(
+    service: Service,
+    key_type: str,
+    check_rate_limit: bool,
+    check_daily_limit: bool,
+    notification_count: int = 1,
+) -> None:
+    if not (check_rate_limit or check_daily_limit):
+        return
+
+    status, sent = _evaluate_service_limits(service, key_type, check_rate_limit, check_daily_limit, notification_count)
+
+    if status == LIMIT_DAILY_COUNT_MISSING:
+        # The first request of the day, or of the cache TTL, seeds the count from the database
+        status, sent = _evaluate_service_limits(
+            service,
+            key_type,
+            check_rate_limit,
+            check_daily_limit,
+            notification_count,
+            fetch_todays_total_message_count(service.id),
+        )
+
+    if status == LIMIT_RATE_EXCEEDED:
+        current_app.logger.info('service %s (%s) has been rate limited for throughput', service.id, service.name)
+        raise RateLimitError(service.rate_limit, API_RATE_LIMIT_INTERVAL, key_type=key_type)
+
+    if status == LIMIT_DAILY_EXCEEDED:
+        current_app.logger.info(
+            'service %s (%s) has been rate limited for daily use sent %s limit %s',
+            service.id,
+            service.name,
+            sent,
+            service.message_limit,
+        )
+        raise TooManyRequestsError(service.message_limit)
+
+    if check_daily_limit and round((sent / service.message_limit), 2) * 100 > 75:
+        # only log if sent over 75% of the limit, and not already over daily limit
+        current_app.logger.info(
+            'service %s (%s) nearing daily limit %.1f%% of %s message limit',
+            service.id,
+            service.name,
+            round((sent / service.message_limit), 2) * 100,
+            service.message_limit,
+        )
+
+
+def _api_rate_limit_enabled() -> bool:
+    return current_app.config['API_RATE_LIMIT_ENABLED'] and current_app.config['REDIS_ENABLED']
+
+
+def _daily_message_limit_enabled(key_type: str) -> bool:
+    # Enforce daily message limit only when configured and the service is not using a test key.
+    return (
+        current_app.config['API_MESSAGE_LIMIT_ENABLED']
+        and current_app.config['REDIS_ENABLED']
+        and key_type != KEY_TYPE_TEST
+    )
+
+
 def check_service_over_api_rate_limit(
     service: Service,
     api_key: ApiKey,
@@ -43,97 +208,157 @@ def check_service_over_api_rate_limit(
     Raises:
         RateLimitError: If the service has exceeded its API rate limit.
     """
-    if current_app.config['API_RATE_LIMIT_ENABLED'] and current_app.config['REDIS_ENABLED']:
-        cache_key = rate_limit_cache_key(service.id, api_key.key_type)
-        rate_limit = service.rate_limit
-        interval = 60
-        if redis_store.exceeded_rate_limit(cache_key, rate_limit, interval):
-            current_app.logger.info('service %s (%s) has been rate limited for throughput', service.id, service.name)
-            raise RateLimitError(rate_limit, interval, key_type=api_key.key_type)
+    _check_service_limits(service, api_key.key_type, _api_rate_limit_enabled(), False)
 
 
 def check_service_over_daily_message_limit(
     key_type: str,
     service: Service,
+    notification_count: int = 1,
 ):
     """
-    Check if the service has exceeded its daily message limit.
+    Check if the service has exceeded its daily message limit, and count the request against it if not.
     Log when the service is nearing the limit (>= 75%).
     If the service has exceeded the limit, raise a TooManyRequestsError.
 
     Args:
         key_type (str): The type of API key used (normal, team, or test).
         service (Service): The service object to check against.
+        notification_count (int): The number of notifications the request will send.
 
     Raises:
         TooManyRequestsError: If the service has exceeded its daily message limit.
     """
-    # Enforce daily message limit only when configured
-    # and the service is not using a test key.
-    if (
-        current_app.config['API_MESSAGE_LIMIT_ENABLED']
-        and current_app.config['REDIS_ENABLED']
-        and key_type != KEY_TYPE_TEST
-    ):
-        cache_key = daily_limit_cache_key(service.id)
-        service_stats = redis_store.get(cache_key)
-
-        if not service_stats:
-            service_stats = services_dao.fetch_todays_total_message_count(service.id)
-            redis_store.set(cache_key, service_stats, ex=3600)
-
-        # log if the service has exceeded the limit or is getting close (>= 75%)
-        # raise error if the service has exceeded the limit
-        if int(service_stats) >= service.message_limit:
-            current_app.logger.info(
-                'service %s (%s) has been rate limited for daily use sent %s limit %s',
-                service.id,
-                service.name,
-                int(service_stats),
-                service.message_limit,
-            )
-            raise TooManyRequestsError(service.message_limit)
-
-        elif round((int(service_stats) / service.message_limit), 2) * 100 > 75:
-            # only log if sent over 75% of the limit, and not already over daily limit
-            current_app.logger.info(
-                'service %s (%s) nearing daily limit %.1f%% of %s message limit',
-                service.id,
-                service.name,
-                round((int(service_stats) / service.message_limit), 2) * 100,
-                service.message_limit,
-            )
+    _check_service_limits(service, key_type, False, _daily_message_limit_enabled(key_type), notification_count)
 
-        # increment the service stats in redis
-        if service_stats:
-            redis_store.incr(cache_key)
+
+def check_rate_limiting(
+    service,
+    api_key,
+    notification_count: int = 1,
+):
+    """Check the API rate limit and the daily message limit with a single Redis call."""
+    _check_service_limits(
+        service,
+        api_key.key_type,
+        _api_rate_limit_enabled(),
+        _daily_message_limit_enabled(api_key.key_type),
+        notification_count,
+    )
+
+
+# SMS sender tokens are leased from Redis this many at a time, or fewer for senders with a lower rate limit
+SMS_SENDER_TOKEN_LEASE_SIZE = 10
+
+# A message that can't be sent now is given a later slot if one is free within this many seconds
+SMS_SENDER_MAX_RESERVATION_SECONDS = 300
+
+# Leases send slots for an SMS sender using the generic cell rate algorithm.  KEYS[1] holds the time, in microseconds,
+# at which all the sender's slots granted so far are used up; up to a window's worth of slots may be outstanding.
+# When none are free now, one slot up to the reservation limit in the future is reserved instead.  Times are in
+# microseconds, and the time per slot is rounded up, so it is never 0 and is at most 1us too long.
+#   KEYS: sender key
+#   ARGV: now (us), us per slot, window (us), slots wanted, reservation limit (us)
+#   Returns: {slots granted, us until the first granted slot, or until a slot is free if none were granted}
+SMS_SENDER_LEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local per_slot = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or 0), now)
+
+local granted = math.min(tonumber(ARGV[4]), math.floor((now + window - tat) / per_slot))
+local wait = 0
+if granted < 1 then
+    wait = tat + per_slot - window - now
+    if wait > tonumber(ARGV[5]) then
+        return {0, wait}
+    end
+    granted = 1
+end
+
+tat = tat + granted * per_slot
+-- Formatted explicitly, because Lua writes numbers this large in exponent notation with 14 significant digits
+redis.call('SET', KEYS[1], string.format('%.0f', tat), 'PX', math.ceil((tat - now) / 1000))
+return {granted, wait}
+"""
+
+_sms_sender_lease_script = None
+
+# Slots leased by this worker and not yet used, by sender: (count, monotonic time after which they are stale)
+_sms_sender_tokens: dict[str, tuple[int, float]] = {}
+_sms_sender_tokens_lock = threading.Lock()
+
+
+def _lease_sms_sender_tokens(
+    sms_sender,
+    count: int,
+) -> tuple[int, float]:
+    """Run SMS_SENDER_LEASE_SCRIPT.  Redis errors grant a slot, as the Redis client does.
+
+    Returns:
+        tuple[int, float]: The slots granted and the seconds until the first of them, or until one is free
+    """
+    global _sms_sender_lease_script
+    if _sms_sender_lease_script is None:
+        _sms_sender_lease_script = redis_store.redis_store.register_script(SMS_SENDER_LEASE_SCRIPT)
+
+    window = sms_sender.rate_limit_interval * 1_000_000
+    try:
+        granted, wait = _sms_sender_lease_script(
+            keys=[f'sms-sender-slots-{sms_sender.sms_sender}'],
+            args=[
+                int(time() * 1_000_000),
+                # Rounded up, so the sender is never allowed more than its rate limit
+                -(-window // sms_sender.rate_limit),
+                window,
+                count,
+                SMS_SENDER_MAX_RESERVATION_SECONDS * 1_000_000,
+            ],
+        )
+    except Exception:
+        current_app.logger.exception('Failed to lease send slots for sms sender %s', sms_sender.id)
+        return 1, 0.0
+    return int(granted), int(wait) / 1_000_000
 
 
 def check_sms_sender_over_rate_limit(
     service_id,
     sms_sender,
 ):
+    """
+    Take a send slot for the SMS sender, from those this worker has leased if there are any.
+
+    Raises:
+        RateLimitError: If there's no slot free now.  retry_after is the seconds until a slot, and slot_reserved is
+            True if that slot is reserved for this message, so it should be sent then without checking again.
+    """
     if sms_sender is None:
         current_app.logger.info('Skipping sms sender rate limit check')
         return
 
-    sms_sender = dao_get_service_sms_sender_by_id(str(service_id), str(sms_sender.id))
-    if current_app.config['REDIS_ENABLED']:
-        current_app.logger.info('Checking sms sender rate limit')
-        cache_key = sms_sender.sms_sender
-        rate_limit = sms_sender.rate_limit
-        interval = sms_sender.rate_limit_interval
-        if redis_store.should_throttle(cache_key, rate_limit, interval):
-            current_app.logger.info(f'sms sender {sms_sender.id} has been rate limited for throughput')
-            raise RateLimitError(rate_limit, interval)
+    if not current_app.config['REDIS_ENABLED']:
+        return
 
+    current_app.logger.info('Checking sms sender rate limit')
+    cache_key = sms_sender.sms_sender
+    with _sms_sender_tokens_lock:
+        tokens, stale_at = _sms_sender_tokens.get(cache_key, (0, 0.0))
+        if tokens and monotonic() < stale_at:
+            _sms_sender_tokens[cache_key] = (tokens - 1, stale_at)
+            return
+
+    rate_limit = sms_sender.rate_limit
+    interval = sms_sender.rate_limit_interval
+    granted, wait = _lease_sms_sender_tokens(sms_sender, max(1, min(SMS_SENDER_TOKEN_LEASE_SIZE, rate_limit)))
+
+    if granted and not wait:
+        # Redis counts the leased slots as used over the time they cover, so any not used by then are dropped.
+        with _sms_sender_tokens_lock:
+            _sms_sender_tokens[cache_key] = (granted - 1, monotonic() + granted * interval / rate_limit)
+        return
 
-def check_rate_limiting(
-    service,
-    api_key,
-):
-    check_service_over_api_rate_limit(service, api_key)
-    check_service_over_daily_message_limit(api_key.key_type, service)
+    current_app.logger.info(f'sms sender {sms_sender.id} has been rate limited for throughput')
+    raise RateLimitError(rate_limit, interval, retry_after=wait, slot_reserved=bool(granted))
 
 
 def check_template_is_for_notification_type(
@@ -236,6 +461,39 @@ def validate_template(
             the notification, the template is deleted, or personalisation is
             missing.
     """
+    template = validate_template_for_notification_type(template_id, service, notification_type)
+    template_with_content = create_content_for_notification(template, personalisation)
+
+    if template.template_type == SMS_TYPE:
+        # We are trying both metric types to see which one works best for us
+        current_app.statsd_client.gauge('sms.content_length', template_with_content.content_count)
+        # Histogram is a DataDog specific method, which sends a histogram value to statsd.
+        current_app.statsd_client.histogram('sms.content_length.histogram', template_with_content.content_count)
+
+    if template.template_type == SMS_TYPE and template_with_content.content_count > SMS_CHAR_COUNT_LIMIT:
+        current_app.logger.warning(
+            'The personalized message length is %s, which exceeds the 4 segments length of %s.',
+            template_with_content.content_count,
+            SMS_CHAR_COUNT_LIMIT,
+            extra={'template_id': template.id},
+        )
+    return template
+
+
+def validate_template_for_notification_type(
+    template_id: str,
+    service: Service,
+    notification_type: str,
+) -> TemplateHistoryData:
+    """
+    Resolve the latest versioned history snapshot of a template and validate its type and active status, without
+    checking personalisation.  Bulk requests use this once per template and check each recipient's personalisation
+    separately.
+
+    Raises:
+        BadRequestError: If template lookup fails, template type is invalid for
+            the notification, or the template is deleted.
+    """
     template = templates_dao.dao_get_latest_template_history_by_id_and_service_id(template_id, service.id)
     if template is None:
         # Putting this in the "message" would be a breaking change for API responses
@@ -252,21 +510,6 @@ def validate_template(
 
     check_template_is_for_notification_type(notification_type, template.template_type)
     check_template_is_active(template)
-    template_with_content = create_content_for_notification(template, personalisation)
-
-    if template.template_type == SMS_TYPE:
-        # We are trying both metric types to see which one works best for us
-        current_app.statsd_client.gauge('sms.content_length', template_with_content.content_count)
-        # Histogram is a DataDog specific method, which sends a histogram value to statsd.
-        current_app.statsd_client.histogram('sms.content_length.histogram', template_with_content.content_count)
-
-    if template.template_type == SMS_TYPE and template_with_content.content_count > SMS_CHAR_COUNT_LIMIT:
-        current_app.logger.warning(
-            'The personalized message length is %s, which exceeds the 4 segments length of %s.',
-            template_with_content.content_count,
-            SMS_CHAR_COUNT_LIMIT,
-            extra={'template_id': template.id},
-        )
     return template
 
 
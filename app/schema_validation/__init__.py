@@ -1,6 +1,8 @@
+import hashlib
 import json
 from app.notifications.validators import decode_personalisation_files
 from datetime import datetime, timedelta
+from cachetools import LRUCache, cached
 from flask import current_app
 from iso8601 import iso8601, ParseError
 from jsonschema import Draft7Validator, FormatChecker, ValidationError
@@ -10,10 +12,18 @@ from notifications_utils.recipients import (
     validate_email_address,
     ValidatedPhoneNumber,
 )
+from threading import Lock
 from uuid import UUID
 
 format_checker = FormatChecker()
 
+# Number of distinct values remembered by each memoized format check
+FORMAT_CHECK_CACHE_SIZE = 4096
+
+# Compiled validators keyed by id(schema).  The schema is kept alongside its validator so that its id can't be reused
+# by another dict while the entry exists.
+_validators: dict[int, tuple[dict, Draft7Validator]] = {}
+
 
 @format_checker.checks('validate_uuid', raises=Exception)
 def validate_uuid(instance):
@@ -22,17 +32,40 @@ def validate_uuid(instance):
     return True
 
 
+def _format_check_key(instance: str) -> bytes:
+    # Recipients are not kept in memory as cache keys
+    return hashlib.sha256(instance.encode()).digest()
+
+
+@cached(LRUCache(maxsize=FORMAT_CHECK_CACHE_SIZE), key=_format_check_key, lock=Lock())
+def _phone_number_error(instance: str) -> str | None:
+    try:
+        ValidatedPhoneNumber(instance)
+    except InvalidPhoneError as e:
+        return str(e)
+    return None
+
+
+@cached(LRUCache(maxsize=FORMAT_CHECK_CACHE_SIZE), key=_format_check_key, lock=Lock())
+def _email_address_error(instance: str) -> str | None:
+    try:
+        validate_email_address(instance)
+    except InvalidEmailError as e:
+        return str(e)
+    return None
+
+
 @format_checker.checks('phone_number', raises=InvalidPhoneError)
 def validate_schema_phone_number(instance):
-    if isinstance(instance, str):
-        ValidatedPhoneNumber(instance)
+    if isinstance(instance, str) and (message := _phone_number_error(instance)) is not None:
+        raise InvalidPhoneError(message)
     return True
 
 
 @format_checker.checks('email_address', raises=InvalidEmailError)
 def validate_schema_email_address(instance):
-    if isinstance(instance, str):
-        validate_email_address(instance)
+    if isinstance(instance, str) and (message := _email_address_error(instance)) is not None:
+        raise InvalidEmailError(message)
     return True
 
 
@@ -44,6 +77,13 @@ def validate_schema_postage(instance):
     return True
 
 
+@format_checker.checks('datetime', raises=ParseError)
+def validate_schema_datetime(instance):
+    if isinstance(instance, str):
+        iso8601.parse_date(instance)
+    return True
+
+
 @format_checker.checks('datetime_within_next_day', raises=ValidationError)
 def validate_schema_date_with_hour(instance):
     if isinstance(instance, str):
@@ -61,6 +101,22 @@ def validate_schema_date_with_hour(instance):
     return True
 
 
+def get_validator(schema: dict) -> Draft7Validator:
+    """Return the validator for a schema, compiling it on first use.
+
+    Args:
+        schema (dict): The JSON schema.  Schemas are module level constants, so each is compiled once per process.
+
+    Returns:
+        Draft7Validator: The validator for the schema
+    """
+    cached = _validators.get(id(schema))
+    if cached is None or cached[0] is not schema:
+        cached = (schema, Draft7Validator(schema, format_checker=format_checker))
+        _validators[id(schema)] = cached
+    return cached[1]
+
+
 def validate(
     json_to_validate: dict,
     schema: dict,
@@ -86,9 +142,9 @@ def validate(
         error_message = json.dumps({'status_code': 400, 'errors': errors})
         raise ValidationError(error_message)
 
-    validator = Draft7Validator(schema, format_checker=format_checker)
-    errors = list(validator.iter_errors(json_to_validate))
-    if len(errors) > 0:
+    validator = get_validator(schema)
+    if not validator.is_valid(json_to_validate):
+        errors = list(validator.iter_errors(json_to_validate))
         json_to_validate = _redact_sensitive_data(json_to_validate)
         # Log the JSON object with redacted information
         current_app.logger.info('Validation failed for: %s', json_to_validate)
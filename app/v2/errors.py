@@ -44,7 +44,13 @@ class RateLimitError(InvalidRequest):
         sending_limit,
         interval,
         key_type=None,
+        retry_after=None,
+        slot_reserved=False,
     ):
+        # Seconds until the request can succeed, when known, and whether a slot has been reserved for it at that time
+        self.retry_after = retry_after
+        self.slot_reserved = slot_reserved
+
         # normal keys are spoken of as "live" in the documentation
         # so using this in the error messaging
         if key_type and key_type == 'normal':
@@ -34,6 +34,16 @@ def create_post_letter_response_from_notification(
     return noti
 
 
+def create_post_bulk_response_from_notification(
+    notification,
+    index,
+    url_root,
+):
+    noti = __create_notification_response(notification, url_root, None)
+    noti['index'] = index
+    return noti
+
+
 def __create_notification_response(
     notification,
     url_root,
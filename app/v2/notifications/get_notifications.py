@@ -1,6 +1,9 @@
 from flask import jsonify, request, url_for, current_app
+from iso8601 import iso8601
+import pytz
 from app import api_user, authenticated_service
 from app.dao import notifications_dao
+from app.models import Notification
 from app.schema_validation import validate
 from app.v2.notifications import v2_notification_blueprint
 from app.v2.notifications.notification_schemas import get_notifications_request, notification_by_id
@@ -24,6 +27,9 @@ def get_notifications():
     if 'older_than' in _data:
         _data['older_than'] = _data['older_than'][0]
 
+    if 'older_than_created_at' in _data:
+        _data['older_than_created_at'] = _data['older_than_created_at'][0]
+
     # and client reference
     if 'reference' in _data:
         _data['reference'] = _data['reference'][0]
@@ -39,9 +45,15 @@ def get_notifications():
         key_type=api_user.key_type,
         personalisation=True,
         older_than=data.get('older_than'),
+        older_than_created_at=(
+            iso8601.parse_date(data['older_than_created_at']).astimezone(pytz.utc).replace(tzinfo=None)
+            if 'older_than_created_at' in data
+            else None
+        ),
         client_reference=data.get('reference'),
         page_size=current_app.config.get('API_PAGE_SIZE'),
         include_jobs=data.get('include_jobs'),
+        count_pages=False,
     )
 
     def _build_links(notifications):
@@ -50,12 +62,16 @@ def get_notifications():
         }
 
         if len(notifications):
-            next_query_params = dict(data, older_than=notifications[-1].id)
+            next_query_params = dict(
+                data,
+                older_than=notifications[-1].id,
+                older_than_created_at=notifications[-1].created_at.isoformat(),
+            )
             _links['next'] = url_for('.get_notifications', _external=True, **next_query_params)
 
         return _links
 
     return jsonify(
-        notifications=[notification.serialize() for notification in paginated_notifications.items],
+        notifications=Notification.serialize_many(paginated_notifications.items),
         links=_build_links(paginated_notifications.items),
     ), 200
@@ -1,6 +1,7 @@
 from copy import deepcopy
 
 from app.constants import (
+    BULK_NOTIFICATION_MAX_RECIPIENTS,
     NOTIFICATION_STATUS_TYPES,
     TEMPLATE_TYPES,
 )
@@ -99,7 +100,13 @@ get_notifications_request = {
         'template_type': {'type': 'array', 'items': {'enum': TEMPLATE_TYPES}},
         'include_jobs': {'enum': ['true', 'True']},
         'older_than': uuid,
+        'older_than_created_at': {
+            'type': 'string',
+            'format': 'datetime',
+            'validationMessage': 'is not a valid ISO8601 date time',
+        },
     },
+    'dependencies': {'older_than_created_at': ['older_than']},
     'additionalProperties': False,
 }
 
@@ -232,6 +239,78 @@ post_email_response = {
     'required': ['id', 'content', 'uri', 'template'],
 }
 
+# Bulk requests are validated in two passes: the envelope once, then each recipient, so that one bad recipient
+# is reported against its index instead of failing the whole request.
+bulk_recipients = {
+    'type': 'array',
+    'items': {'type': 'object'},
+    'minItems': 1,
+    'maxItems': BULK_NOTIFICATION_MAX_RECIPIENTS,
+}
+
+post_sms_bulk_request = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'description': 'POST bulk sms notification schema',
+    'type': 'object',
+    'title': 'POST v2/notifications/sms/bulk',
+    'properties': {
+        'template_id': uuid,
+        'sms_sender_id': nullable_uuid,
+        'billing_code': {'type': ['string', 'null'], 'maxLength': 256},
+        'callback_url': {'type': ['string', 'null'], 'format': 'uri', 'pattern': '^https.*', 'maxLength': 255},
+        'recipients': bulk_recipients,
+    },
+    'required': ['template_id', 'recipients'],
+    'additionalProperties': False,
+}
+
+post_sms_bulk_recipient = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'description': 'POST bulk sms notification recipient schema',
+    'type': 'object',
+    'title': 'POST v2/notifications/sms/bulk recipient',
+    'properties': {
+        'reference': {'type': 'string'},
+        'phone_number': {'type': 'string', 'format': 'phone_number'},
+        'recipient_identifier': recipient_identifier,
+        'personalisation': personalisation,
+    },
+    'anyOf': [{'required': ['phone_number']}, {'required': ['recipient_identifier']}],
+    'additionalProperties': False,
+    'validationMessage': {'anyOf': 'Please provide either a phone number or recipient identifier.'},
+}
+
+post_email_bulk_request = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'description': 'POST bulk email notification schema',
+    'type': 'object',
+    'title': 'POST v2/notifications/email/bulk',
+    'properties': {
+        'template_id': uuid,
+        'billing_code': {'type': ['string', 'null'], 'maxLength': 256},
+        'callback_url': {'type': ['string', 'null'], 'format': 'uri', 'pattern': '^https.*', 'maxLength': 255},
+        'recipients': bulk_recipients,
+    },
+    'required': ['template_id', 'recipients'],
+    'additionalProperties': False,
+}
+
+post_email_bulk_recipient = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'description': 'POST bulk email notification recipient schema',
+    'type': 'object',
+    'title': 'POST v2/notifications/email/bulk recipient',
+    'properties': {
+        'reference': {'type': 'string'},
+        'email_address': {'type': 'string', 'format': 'email_address'},
+        'recipient_identifier': recipient_identifier,
+        'personalisation': personalisation,
+    },
+    'anyOf': [{'required': ['email_address']}, {'required': ['recipient_identifier']}],
+    'additionalProperties': False,
+    'validationMessage': {'anyOf': 'Please provide either an email address or a recipient identifier'},
+}
+
 post_letter_request = {
     '$schema': 'http://json-schema.org/draft-04/schema#',
     'description': 'POST letter notification schema',
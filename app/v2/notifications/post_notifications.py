@@ -1,10 +1,13 @@
 import functools
 import html
+import json
+import uuid
 from datetime import datetime, timezone
 
 import werkzeug
 from flask import request, jsonify, current_app, abort
-from notifications_utils.recipients import try_validate_and_format_phone_number
+from jsonschema import ValidationError
+from notifications_utils.recipients import InvalidEmailError, try_validate_and_format_phone_number
 
 from app import api_user, authenticated_service, attachment_store
 from app.feature_flags import is_feature_enabled, FeatureFlag
@@ -21,9 +24,12 @@ from app.constants import (
 )
 from app.dao.service_sms_sender_dao import dao_get_default_service_sms_sender_by_service_id
 from app.notifications.process_notifications import (
+    create_content_for_notification,
     persist_notification,
+    persist_notifications_bulk,
     persist_scheduled_notification,
     send_notification_to_queue,
+    send_notifications_to_queue_in_batches,
     simulated_recipient,
     send_to_queue_for_recipient_info_based_on_recipient_identifier,
 )
@@ -31,19 +37,25 @@ from app.notifications.validators import (
     validate_and_format_recipient,
     check_rate_limiting,
     validate_template,
+    validate_template_for_notification_type,
     get_service_sms_sender_number,
 )
 from app.schema_validation import validate
 from app.v2.errors import BadRequestError
 from app.v2.notifications import v2_notification_blueprint
 from app.v2.notifications.create_response import (
+    create_post_bulk_response_from_notification,
     create_post_sms_response_from_notification,
     create_post_email_response_from_notification,
     create_post_letter_response_from_notification,
 )
 from app.v2.notifications.notification_schemas import (
     post_sms_request,
+    post_sms_bulk_request,
+    post_sms_bulk_recipient,
     post_email_request,
+    post_email_bulk_request,
+    post_email_bulk_recipient,
     post_letter_request,
 )
 from app.utils import get_public_notify_type_text, get_template_instance
@@ -98,17 +110,7 @@ def post_notification(notification_type):  # noqa: C901
         form = validate(request_json, post_email_request)
     elif notification_type == SMS_TYPE:
         form = validate(request_json, post_sms_request)
-
-        if form.get('sms_sender_id') is None:
-            # Use the service's default sms_sender.
-            for sender in authenticated_service.service_sms_senders:
-                if sender.is_default:
-                    form['sms_sender_id'] = sender.id
-                    break
-            else:
-                raise BadRequestError(
-                    message='You must supply a value for sms_sender_id, or the service must have a default.'
-                )
+        set_default_sms_sender_id(form)
         current_app.logger.info(
             'SMS notification: POST /v2/notifications/sms received: %s',
             form['sms_sender_id'],
@@ -122,18 +124,7 @@ def post_notification(notification_type):  # noqa: C901
     else:
         abort(404)
 
-    if not authenticated_service.has_permissions(notification_type):
-        current_app.logger.warning(
-            'Service %s tried to send a %s notification but does not have permission',
-            str(authenticated_service.id),
-            notification_type,
-            extra={'sms_sender_id': form.get('sms_sender_id'), 'template_id': form.get('template_id')},
-        )
-        raise BadRequestError(
-            message='Service is not allowed to send {}'.format(
-                get_public_notify_type_text(notification_type, plural=True)
-            )
-        )
+    check_service_can_send_notification_type(notification_type, form)
 
     if is_feature_enabled(FeatureFlag.PII_ENABLED) and 'recipient_identifier' in form:
         # This might modify the form by converting form['recipient_identifier']['id_value'] to a Pii subclass.
@@ -208,6 +199,231 @@ def post_notification(notification_type):  # noqa: C901
     return jsonify(resp), 201
 
 
+@v2_notification_blueprint.route('/<notification_type>/bulk', methods=['POST'])
+def post_bulk_notifications(notification_type):
+    """
+    Create notifications for many recipients of one template.  The template, sender, permissions, and rate limits are
+    checked once per request, each recipient is validated separately, the notifications are written with multi-row
+    INSERT statements, and delivery tasks are published to the queue in batches.
+
+    Recipients that fail validation are reported by their index in the request without preventing the others from
+    being sent.
+    """
+    created_at = datetime.now(timezone.utc)
+    try:
+        request_json = request.get_json()
+    except werkzeug.exceptions.BadRequest as e:
+        raise BadRequestError(message=f'Error decoding arguments: {e.description}', status_code=400)
+
+    if notification_type == EMAIL_TYPE:
+        form = validate(request_json, post_email_bulk_request)
+        recipient_schema = post_email_bulk_recipient
+        recipient_key = 'email_address'
+    elif notification_type == SMS_TYPE:
+        form = validate(request_json, post_sms_bulk_request)
+        set_default_sms_sender_id(form)
+        recipient_schema = post_sms_bulk_recipient
+        recipient_key = 'phone_number'
+    else:
+        abort(404)
+
+    current_app.logger.info(
+        'Bulk notification: POST /v2/notifications/%s/bulk received with %s recipients',
+        notification_type,
+        len(form['recipients']),
+        extra={'sms_sender_id': form.get('sms_sender_id'), 'template_id': form.get('template_id')},
+    )
+
+    check_service_can_send_notification_type(notification_type, form)
+    template = validate_template_for_notification_type(form['template_id'], authenticated_service, notification_type)
+
+    recipients = []
+    errors = []
+    for index, item in enumerate(form['recipients']):
+        try:
+            recipients.append(
+                _validate_bulk_recipient(index, item, recipient_schema, recipient_key, notification_type, template)
+            )
+        except ValidationError as e:
+            errors.append({'index': index, 'errors': json.loads(e.message)['errors']})
+        except (BadRequestError, InvalidEmailError) as e:
+            errors.append({'index': index, 'errors': [{'error': e.__class__.__name__, 'message': _error_message(e)}]})
+
+    if not recipients:
+        return jsonify(status_code=400, errors=errors), 400
+
+    check_rate_limiting(authenticated_service, api_user, len(recipients))
+
+    reply_to = get_reply_to_text(notification_type, form, template)
+
+    notifications = persist_notifications_bulk(
+        template_id=template.id,
+        template_version=template.version,
+        service_id=authenticated_service.id,
+        notification_type=notification_type,
+        api_key_id=api_user.id,
+        key_type=api_user.key_type,
+        recipients=recipients,
+        created_at=created_at,
+        reply_to_text=reply_to,
+        billing_code=form.get('billing_code'),
+        sms_sender_id=form.get('sms_sender_id'),
+        callback_url=form.get('callback_url'),
+    )
+
+    failed_ids = _send_bulk_notifications_to_queue(notifications, recipients, template, form.get('sms_sender_id'))
+
+    created = []
+    for recipient, notification in zip(recipients, notifications):
+        if notification.id in failed_ids:
+            errors.append(
+                {
+                    'index': recipient['index'],
+                    'errors': [{'error': 'QueueError', 'message': 'Unable to queue notification for delivery'}],
+                }
+            )
+        else:
+            created.append(
+                create_post_bulk_response_from_notification(notification, recipient['index'], request.url_root)
+            )
+
+    errors.sort(key=lambda error: error['index'])
+    return jsonify(notifications=created, errors=errors), 201 if created else 500
+
+
+def _validate_bulk_recipient(
+    index: int,
+    item: dict,
+    recipient_schema: dict,
+    recipient_key: str,
+    notification_type: str,
+    template,
+) -> dict:
+    """
+    Validate one recipient of a bulk request and return the dictionary persist_notifications_bulk expects.
+    """
+
+    item = validate(item, recipient_schema)
+    personalisation = item.get('personalisation') or {}
+
+    if any(isinstance(v, dict) and 'file' in v for v in personalisation.values()):
+        raise BadRequestError(message='Attachments are not supported for bulk notifications')
+
+    if is_feature_enabled(FeatureFlag.PII_ENABLED) and 'recipient_identifier' in item:
+        wrap_recipient_identifier_in_pii(item)
+
+    create_content_for_notification(template, personalisation)
+
+    simulated = False
+    if recipient_key in item:
+        send_to = validate_and_format_recipient(
+            send_to=item[recipient_key],
+            key_type=api_user.key_type,
+            service=authenticated_service,
+            notification_type=notification_type,
+        )
+        simulated = simulated_recipient(send_to, notification_type)
+
+    return {
+        'index': index,
+        'notification_id': uuid.uuid4(),
+        'recipient': item.get(recipient_key),
+        'personalisation': personalisation,
+        'client_reference': item.get('reference'),
+        'recipient_identifier': item.get('recipient_identifier'),
+        'simulated': simulated,
+    }
+
+
+def _send_bulk_notifications_to_queue(
+    notifications: list,
+    recipients: list[dict],
+    template,
+    sms_sender_id,
+) -> set:
+    """
+    Queue the notifications created by a bulk request and return the ids of those that could not be queued.
+    Notifications with contact information are published in batches, unless they also have a recipient identifier
+    and the template has a communication item, because then the VA Profile ID may need looking up for the
+    communication permission check.  Those, and notifications with only a recipient identifier, are chained
+    individually as in post_notification.
+    """
+
+    with_contact_information = []
+    failed_ids = set()
+
+    for recipient, notification in zip(recipients, notifications):
+        recipient_identifier = recipient['recipient_identifier']
+        if recipient['simulated']:
+            continue
+        elif recipient['recipient'] is not None and recipient_identifier and template.communication_item_id:
+            try:
+                send_notification_to_queue(
+                    notification=notification,
+                    research_mode=authenticated_service.research_mode,
+                    recipient_id_type=recipient_identifier['id_type'],
+                    sms_sender_id=sms_sender_id,
+                )
+            except Exception:
+                failed_ids.add(notification.id)
+        elif recipient['recipient'] is not None:
+            with_contact_information.append(notification)
+        else:
+            try:
+                send_to_queue_for_recipient_info_based_on_recipient_identifier(
+                    notification=notification,
+                    id_type=recipient_identifier['id_type'],
+                    communication_item_id=template.communication_item_id,
+                )
+            except Exception:
+                failed_ids.add(notification.id)
+
+    failed = send_notifications_to_queue_in_batches(
+        with_contact_information, authenticated_service.research_mode, sms_sender_id
+    )
+    failed_ids.update(notification.id for notification in failed)
+
+    return failed_ids
+
+
+def _error_message(error: Exception) -> str:
+    return getattr(error, 'message', None) or str(error)
+
+
+def set_default_sms_sender_id(form: dict) -> None:
+    """
+    Use the service's default sms_sender when the request does not name one.
+    """
+
+    if form.get('sms_sender_id') is None:
+        for sender in authenticated_service.service_sms_senders:
+            if sender.is_default:
+                form['sms_sender_id'] = sender.id
+                break
+        else:
+            raise BadRequestError(
+                message='You must supply a value for sms_sender_id, or the service must have a default.'
+            )
+
+
+def check_service_can_send_notification_type(
+    notification_type: str,
+    form: dict,
+) -> None:
+    if not authenticated_service.has_permissions(notification_type):
+        current_app.logger.warning(
+            'Service %s tried to send a %s notification but does not have permission',
+            str(authenticated_service.id),
+            notification_type,
+            extra={'sms_sender_id': form.get('sms_sender_id'), 'template_id': form.get('template_id')},
+        )
+        raise BadRequestError(
+            message='Service is not allowed to send {}'.format(
+                get_public_notify_type_text(notification_type, plural=True)
+            )
+        )
+
+
 def process_sms_or_email_notification(
     *,
     form,
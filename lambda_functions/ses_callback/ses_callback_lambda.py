@@ -6,6 +6,11 @@ import uuid
 
 ROUTING_KEY = 'delivery-status-result-tasks'
 
+# When set to True, the records of each invocation are sent as one process-ses-results-batch task.  SNS invokes the
+# lambda with one record at a time, so this only batches when the lambda reads the SNS topic's SQS subscription with
+# a batch size greater than one.
+BATCH_TASK = os.getenv('SES_CALLBACK_BATCH_TASK', 'False') == 'True'
+
 
 def lambda_handler(
     event,
@@ -14,37 +19,59 @@ def lambda_handler(
     sqs = boto3.resource('sqs')
     queue = sqs.get_queue_by_name(QueueName=f'{os.getenv("NOTIFICATION_QUEUE_PREFIX")}{ROUTING_KEY}')
 
-    for record in event['Records']:
-        task = {
-            'task': 'process-ses-result',
-            'id': str(uuid.uuid4()),
-            'args': [{'Message': record['Sns']['Message']}],
-            'kwargs': {},
-            'retries': 0,
-            'eta': None,
-            'expires': None,
-            'utc': True,
-            'callbacks': None,
-            'errbacks': None,
-            'timelimit': [None, None],
-            'taskset': None,
-            'chord': None,
-        }
-        envelope = {
-            'body': base64.b64encode(bytes(json.dumps(task), 'utf-8')).decode('utf-8'),
-            'content-encoding': 'utf-8',
-            'content-type': 'application/json',
-            'headers': {},
-            'properties': {
-                'reply_to': str(uuid.uuid4()),
-                'correlation_id': str(uuid.uuid4()),
-                'delivery_mode': 2,
-                'delivery_info': {'priority': 0, 'exchange': 'default', 'routing_key': ROUTING_KEY},
-                'body_encoding': 'base64',
-                'delivery_tag': str(uuid.uuid4()),
-            },
-        }
-        msg = base64.b64encode(bytes(json.dumps(envelope), 'utf-8')).decode('utf-8')
-        queue.send_message(MessageBody=msg)
+    messages = [{'Message': get_message(record)} for record in event['Records']]
+    if BATCH_TASK:
+        send_task(queue, 'process-ses-results-batch', [messages])
+    else:
+        for message in messages:
+            send_task(queue, 'process-ses-result', [message])
 
     return {'statusCode': 200}
+
+
+def get_message(record):
+    """Return the SES event from a record delivered by SNS, or by an SQS queue subscribed to the SNS topic."""
+
+    if 'Sns' in record:
+        return record['Sns']['Message']
+
+    # The body of a record from the SQS subscription is the SNS notification, as stringified JSON
+    return json.loads(record['body'])['Message']
+
+
+def send_task(
+    queue,
+    task_name,
+    args,
+):
+    task = {
+        'task': task_name,
+        'id': str(uuid.uuid4()),
+        'args': args,
+        'kwargs': {},
+        'retries': 0,
+        'eta': None,
+        'expires': None,
+        'utc': True,
+        'callbacks': None,
+        'errbacks': None,
+        'timelimit': [None, None],
+        'taskset': None,
+        'chord': None,
+    }
+    envelope = {
+        'body': base64.b64encode(bytes(json.dumps(task), 'utf-8')).decode('utf-8'),
+        'content-encoding': 'utf-8',
+        'content-type': 'application/json',
+        'headers': {},
+        'properties': {
+            'reply_to': str(uuid.uuid4()),
+            'correlation_id': str(uuid.uuid4()),
+            'delivery_mode': 2,
+            'delivery_info': {'priority': 0, 'exchange': 'default', 'routing_key': ROUTING_KEY},
+            'body_encoding': 'base64',
+            'delivery_tag': str(uuid.uuid4()),
+        },
+    }
+    msg = base64.b64encode(bytes(json.dumps(envelope), 'utf-8')).decode('utf-8')
+    queue.send_message(MessageBody=msg)
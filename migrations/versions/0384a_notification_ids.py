@@ -0,0 +1,133 @@
+"""
+Register every notification id in notification_ids ahead of partitioning notifications.
+
+A partitioned table's primary key has to include the partition column, so once notifications is partitioned by
+created_at its primary key cannot keep ids unique or be referenced by foreign keys.  notification_ids takes over both
+jobs: statement triggers on notifications insert and delete its rows, so inserting an id twice still fails with a
+unique violation, and the foreign keys that referenced notifications.id reference notification_ids.id instead, with
+the same ON DELETE behaviour.
+
+Everything here is done online.  The backfill runs in committed batches, the foreign keys are added NOT VALID and
+validated separately, and the (id, created_at) index the partitioned primary key will use is built concurrently.
+0385_partition_notifications then only has to change the catalog.
+
+Revision ID: 0384a_notification_ids
+Revises: 0384_encrypt_opt_in_out
+Create Date: 2026-10-18 09:02:17.640113
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+revision = '0384a_notification_ids'
+down_revision = '0384_encrypt_opt_in_out'
+
+BACKFILL_BATCH_SIZE = 50000
+
+
+def upgrade():
+    op.execute('CREATE TABLE notification_ids (id UUID PRIMARY KEY)')
+    op.execute("""
+        CREATE FUNCTION notification_ids_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO notification_ids (id) SELECT id FROM new_notifications;
+            RETURN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE FUNCTION notification_ids_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM notification_ids WHERE id IN (SELECT id FROM old_notifications);
+            RETURN NULL;
+        END $$
+    """)
+    _create_triggers()
+
+    with op.get_context().autocommit_block():
+        _backfill_notification_ids()
+
+        # Point every foreign key on notifications.id at notification_ids.id instead
+        for table, name, definition in (
+            op.get_bind()
+            .execute(
+                text("""
+                SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint
+                WHERE contype = 'f' AND confrelid = 'notifications'::regclass
+            """)
+            )
+            .all()
+        ):
+            definition = definition.replace('REFERENCES notifications(id)', 'REFERENCES notification_ids(id)')
+            op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name}_ids {definition} NOT VALID')
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}_ids')
+            op.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+            op.execute(f'ALTER TABLE {table} RENAME CONSTRAINT {name}_ids TO {name}')
+
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY ix_notifications_id_created_at ON notifications (id, created_at)')
+
+
+def _create_triggers():
+    op.execute("""
+        CREATE TRIGGER notification_ids_insert AFTER INSERT ON notifications
+        REFERENCING NEW TABLE AS new_notifications
+        FOR EACH STATEMENT EXECUTE FUNCTION notification_ids_insert()
+    """)
+    op.execute("""
+        CREATE TRIGGER notification_ids_delete AFTER DELETE ON notifications
+        REFERENCING OLD TABLE AS old_notifications
+        FOR EACH STATEMENT EXECUTE FUNCTION notification_ids_delete()
+    """)
+
+
+def _backfill_notification_ids():
+    """Copy existing ids in batches, each committed on its own.  The triggers already cover new notifications."""
+    connection = op.get_bind()
+    last_id = '00000000-0000-0000-0000-000000000000'
+    while True:
+        batch_end = connection.execute(
+            text("""
+                SELECT max(id) FROM (
+                    SELECT id FROM notifications WHERE id > :last_id ORDER BY id LIMIT :batch_size
+                ) AS batch
+            """),
+            {'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE},
+        ).scalar()
+        if batch_end is None:
+            return
+
+        connection.execute(
+            text("""
+                INSERT INTO notification_ids (id)
+                SELECT id FROM notifications WHERE id > :last_id AND id <= :batch_end
+                ON CONFLICT DO NOTHING
+            """),
+            {'last_id': last_id, 'batch_end': batch_end},
+        )
+        last_id = batch_end
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table, name, definition in (
+            op.get_bind()
+            .execute(
+                text("""
+                SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint
+                WHERE contype = 'f' AND confrelid = 'notification_ids'::regclass
+            """)
+            )
+            .all()
+        ):
+            definition = definition.replace('REFERENCES notification_ids(id)', 'REFERENCES notifications(id)')
+            op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name}_notifications {definition} NOT VALID')
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}_notifications')
+            op.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+            op.execute(f'ALTER TABLE {table} RENAME CONSTRAINT {name}_notifications TO {name}')
+
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_id_created_at')
+
+    op.execute('DROP TRIGGER notification_ids_insert ON notifications')
+    op.execute('DROP TRIGGER notification_ids_delete ON notifications')
+    op.execute('DROP FUNCTION notification_ids_insert()')
+    op.execute('DROP FUNCTION notification_ids_delete()')
+    op.execute('DROP TABLE notification_ids')
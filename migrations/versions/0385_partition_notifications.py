@@ -0,0 +1,143 @@
+"""
+Partition notifications by week on created_at.
+
+The existing table becomes the notifications_legacy partition, holding everything before the start of the week after
+next.  Weekly partitions are created from there, and the maintain-notification-partitions task keeps creating them
+ahead of time and drops the ones past every service's data retention.  notifications_default only catches rows the
+task has not created a partition for yet.
+
+0384a_notification_ids prepared everything that needs a scan, so this migration only takes brief locks: the check
+constraint that lets ATTACH PARTITION skip its scan is validated online first, the legacy primary key reuses the
+concurrently built (id, created_at) index, and the parent's indexes and foreign keys are created while it is empty so
+attaching adopts the legacy ones.  Ids stay unique through notification_ids, whose triggers move to the parent.
+
+Revision ID: 0385_partition_notifications
+Revises: 0384a_notification_ids
+Create Date: 2026-10-17 09:12:44.102311
+"""
+
+from datetime import date, timedelta
+
+from alembic import op
+
+revision = '0385_partition_notifications'
+down_revision = '0384a_notification_ids'
+
+WEEKS_AHEAD = 4
+
+
+def upgrade():
+    # Leave a week's margin between validating the check constraint and notifications reaching its bound
+    today = date.today()
+    legacy_end = today - timedelta(days=today.weekday()) + timedelta(weeks=2)
+
+    # Validating only takes a lock that allows writes
+    with op.get_context().autocommit_block():
+        op.execute(f"""
+            ALTER TABLE notifications
+            ADD CONSTRAINT notifications_legacy_created_at CHECK (created_at < '{legacy_end}') NOT VALID
+        """)
+        op.execute('ALTER TABLE notifications VALIDATE CONSTRAINT notifications_legacy_created_at')
+
+    # Triggers with transition tables are not allowed on partitions, so they move to the parent
+    op.execute('DROP TRIGGER notification_ids_insert ON notifications')
+    op.execute('DROP TRIGGER notification_ids_delete ON notifications')
+
+    op.execute('ALTER TABLE notifications DROP CONSTRAINT notifications_pkey')
+    op.execute("""
+        ALTER TABLE notifications ADD CONSTRAINT notifications_legacy_pkey
+        PRIMARY KEY USING INDEX ix_notifications_id_created_at
+    """)
+    op.execute('ALTER TABLE notifications RENAME TO notifications_legacy')
+
+    op.execute("""
+        CREATE TABLE notifications (LIKE notifications_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER TABLE notifications DROP CONSTRAINT notifications_legacy_created_at')
+    op.execute('ALTER TABLE notifications ADD CONSTRAINT notifications_pkey PRIMARY KEY (id, created_at)')
+
+    # Recreate the secondary indexes and foreign keys on the empty parent under their original names.  ATTACH
+    # PARTITION adopts the matching legacy ones instead of building or validating them again.
+    op.execute("""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT indexname, indexdef FROM pg_indexes
+                     WHERE schemaname = current_schema()
+                     AND tablename = 'notifications_legacy'
+                     AND indexname <> 'notifications_legacy_pkey'
+            LOOP
+                EXECUTE format('ALTER INDEX %I RENAME TO %I', r.indexname, left('legacy_' || r.indexname, 63));
+                EXECUTE replace(r.indexdef, ' ON ' || current_schema() || '.notifications_legacy ',
+                                ' ON ' || current_schema() || '.notifications ');
+            END LOOP;
+            FOR r IN SELECT conname, pg_get_constraintdef(oid) AS definition FROM pg_constraint
+                     WHERE contype = 'f' AND conrelid = 'notifications_legacy'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE notifications ADD CONSTRAINT %I %s', r.conname, r.definition);
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute(f"""
+        ALTER TABLE notifications ATTACH PARTITION notifications_legacy FOR VALUES FROM (MINVALUE) TO ('{legacy_end}')
+    """)
+    op.execute('ALTER TABLE notifications_legacy DROP CONSTRAINT notifications_legacy_created_at')
+
+    for week in range(WEEKS_AHEAD):
+        start = legacy_end + timedelta(weeks=week)
+        op.execute(f"""
+            CREATE TABLE notifications_p{start:%Y%m%d} PARTITION OF notifications
+            FOR VALUES FROM ('{start}') TO ('{start + timedelta(weeks=1)}')
+        """)
+    op.execute('CREATE TABLE notifications_default PARTITION OF notifications DEFAULT')
+
+    _create_triggers()
+
+
+def _create_triggers():
+    op.execute("""
+        CREATE TRIGGER notification_ids_insert AFTER INSERT ON notifications
+        REFERENCING NEW TABLE AS new_notifications
+        FOR EACH STATEMENT EXECUTE FUNCTION notification_ids_insert()
+    """)
+    op.execute("""
+        CREATE TRIGGER notification_ids_delete AFTER DELETE ON notifications
+        REFERENCING OLD TABLE AS old_notifications
+        FOR EACH STATEMENT EXECUTE FUNCTION notification_ids_delete()
+    """)
+
+
+def downgrade():
+    op.execute('ALTER TABLE notifications RENAME TO notifications_partitioned')
+    op.execute("""
+        CREATE TABLE notifications (LIKE notifications_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+    """)
+    op.execute('INSERT INTO notifications SELECT * FROM notifications_partitioned')
+    op.execute('ALTER TABLE notifications ADD CONSTRAINT notifications_pkey PRIMARY KEY (id)')
+    op.execute('CREATE UNIQUE INDEX ix_notifications_id_created_at ON notifications (id, created_at)')
+
+    op.execute("""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT indexname, indexdef FROM pg_indexes
+                     WHERE schemaname = current_schema()
+                     AND tablename = 'notifications_partitioned'
+                     AND indexname <> 'notifications_pkey'
+            LOOP
+                EXECUTE format('DROP INDEX %I', r.indexname);
+                EXECUTE replace(r.indexdef, ' ON ONLY ' || current_schema() || '.notifications_partitioned ',
+                                ' ON ' || current_schema() || '.notifications ');
+            END LOOP;
+            FOR r IN SELECT conname, pg_get_constraintdef(oid) AS definition FROM pg_constraint
+                     WHERE contype = 'f' AND conrelid = 'notifications_partitioned'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE notifications ADD CONSTRAINT %I %s', r.conname, r.definition);
+            END LOOP;
+        END $$;
+    """)
+    # Dropping the partitioned table drops its triggers, so the copied rows are not removed from notification_ids
+    op.execute('DROP TABLE notifications_partitioned')
+    _create_triggers()
@@ -0,0 +1,57 @@
+"""
+Index notifications for keyset pagination by service.
+
+GET /v2/notifications pages through a service's notifications ordered by (created_at, id) descending.  This index
+matches that order, so each page is a bounded index range scan, and supersedes ix_notifications_service_created_at.
+
+notifications is partitioned, and a partitioned index can't be built concurrently.  The index is created on the parent
+only, built concurrently on each partition, and attached partition by partition, so writes are never blocked while the
+index is built.  The parent index becomes valid once every partition's index is attached, and only then is the index
+it replaces dropped.  Partitions created afterwards get the index from the parent.
+
+Revision ID: 0386_notifications_keyset_index
+Revises: 0385_partition_notifications
+Create Date: 2026-10-17 11:40:02.518930
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+revision = '0386_notifications_keyset_index'
+down_revision = '0385_partition_notifications'
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        _create_partitioned_index('ix_notifications_service_created_at_id', '(service_id, created_at DESC, id DESC)')
+        op.execute('DROP INDEX IF EXISTS ix_notifications_service_created_at')
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        _create_partitioned_index('ix_notifications_service_created_at', '(service_id, created_at)')
+        op.execute('DROP INDEX IF EXISTS ix_notifications_service_created_at_id')
+
+
+def _create_partitioned_index(
+    name: str,
+    columns: str,
+) -> None:
+    op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON ONLY notifications {columns}')
+
+    partitions = (
+        op.get_bind()
+        .execute(
+            text("""
+                SELECT inhrelid::regclass::text FROM pg_inherits
+                WHERE inhparent = 'notifications'::regclass
+                ORDER BY 1
+            """)
+        )
+        .scalars()
+        .all()
+    )
+    for partition in partitions:
+        partition_index = f'{partition}_{name.removeprefix("ix_notifications_")}'[:63]
+        op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {columns}')
+        op.execute(f'ALTER INDEX {name} ATTACH PARTITION {partition_index}')
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+
+# Sends webhook delivery status callbacks from the delivery-status-callbacks queue.  See app/callback/dispatcher.py.
+
+import asyncio
+
+from flask import Flask
+
+from app import create_app
+from app.callback.dispatcher import CallbackDispatcher
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+application = Flask('callback-dispatcher', static_folder=None)
+create_app(application)
+
+if __name__ == '__main__':
+    with application.app_context():
+        asyncio.run(CallbackDispatcher.from_config(application.config).run())
@@ -21,13 +21,14 @@ from app.authentication.auth import (
 from app.constants import PERMISSION_LIST, SERVICE_PERMISSION_TYPES
 from app.dao.api_key_dao import get_unsigned_secrets
 from app.dao.permissions_dao import permission_dao
+from app.model import User
 from app.models import Permission
 from app.service.service_data import ServiceDataApiKey
 from flask import json, current_app, request
 from flask_jwt_extended import create_access_token
 from freezegun import freeze_time
 from jwt import ExpiredSignatureError
-from notifications_python_client.authentication import create_jwt_token
+from notifications_python_client.authentication import create_jwt_token, decode_jwt_token
 from tests import create_admin_basic_authorization_header
 from tests.conftest import set_config, set_config_values
 from uuid import uuid4
@@ -110,6 +111,28 @@ def test_should_not_allow_request_with_basic_auth_archived_user(client, admin_re
     assert exc.value.short_message == 'Unauthorized, invalid basic auth credentials'
 
 
+def test_basic_auth_password_is_hashed_once_until_it_changes(client, admin_request_jwt, sample_user, mocker):
+    user = sample_user(platform_admin=True)
+    password = admin_request_jwt.post('user.reset_user_password', user_id=user.id)['data']
+    check_password = mocker.spy(User, 'check_password')
+
+    request.headers = dict((create_admin_basic_authorization_header(user.id, password),))
+    validate_admin_basic_auth()
+    validate_admin_basic_auth()
+    assert check_password.call_count == 1
+
+    request.headers = dict((create_admin_basic_authorization_header(user.id, 'bad password'),))
+    with pytest.raises(AuthError):
+        validate_admin_basic_auth()
+    assert check_password.call_count == 2
+
+    admin_request_jwt.post('user.reset_user_password', user_id=user.id)
+    request.headers = dict((create_admin_basic_authorization_header(user.id, password),))
+    with pytest.raises(AuthError):
+        validate_admin_basic_auth()
+    assert check_password.call_count == 3
+
+
 @pytest.mark.parametrize('auth_fn', [validate_service_api_key_auth, validate_admin_jwt_auth])
 def test_should_not_allow_request_with_no_token(client, auth_fn):
     request.headers = {}
@@ -587,6 +610,56 @@ def test_authentication_edge_case_key_expires_at_exact_moment(
         validate_service_api_key_auth()
 
 
+def test_authentication_skips_signature_check_for_recently_verified_token(
+    client, sample_api_key, sample_service, mocker
+):
+    service = sample_service()
+    api_key = sample_api_key(service)
+    token = create_jwt_token(api_key.secret, client_id=str(service.id))
+    request.headers = {'Authorization': 'Bearer {}'.format(token)}
+
+    validate_service_api_key_auth()
+
+    mock_decode = mocker.patch('app.authentication.auth.decode_jwt_token')
+    validate_service_api_key_auth()
+
+    mock_decode.assert_not_called()
+    assert api_user.id == api_key.id
+
+
+def test_authentication_tries_active_keys_before_revoked_keys(client, sample_api_key, sample_service, mocker):
+    service = sample_service()
+    revoked_api_keys = [sample_api_key(service, expired=True) for _ in range(3)]
+    api_key = sample_api_key(service)
+    token = create_jwt_token(api_key.secret, client_id=str(service.id))
+    request.headers = {'Authorization': 'Bearer {}'.format(token)}
+
+    mock_decode = mocker.patch('app.authentication.auth.decode_jwt_token', wraps=decode_jwt_token)
+    validate_service_api_key_auth()
+
+    assert mock_decode.call_count == 1
+    assert api_user.id == api_key.id
+    assert all(revoked.secret != mock_decode.call_args[0][1] for revoked in revoked_api_keys)
+
+
+def test_authentication_uses_kid_header_to_select_api_key(client, sample_api_key, sample_service, mocker):
+    service = sample_service()
+    sample_api_key(service)
+    api_key = sample_api_key(service)
+    token = jwt.encode(
+        payload={'iss': str(service.id), 'iat': int(time.time())},
+        key=api_key.secret,
+        headers={'typ': 'JWT', 'alg': 'HS256', 'kid': str(api_key.id)},
+    )
+    request.headers = {'Authorization': 'Bearer {}'.format(token)}
+
+    mock_decode = mocker.patch('app.authentication.auth.decode_jwt_token', wraps=decode_jwt_token)
+    validate_service_api_key_auth()
+
+    mock_decode.assert_called_once_with(token, api_key.secret)
+    assert api_user.id == api_key.id
+
+
 def __create_token(service_id):
     return create_jwt_token(secret=get_unsigned_secrets(service_id)[0], client_id=str(service_id))
 
@@ -1,13 +1,16 @@
+import io
 from unittest.mock import call
 from datetime import datetime, timedelta
 import pytest
 import pytz
+from botocore.response import StreamingBody
 from flask import current_app
 
 from freezegun import freeze_time
 
 from app.aws.s3 import (
     get_s3_bucket_objects,
+    get_job_lines_from_s3,
     get_s3_file,
     filter_s3_bucket_objects_within_date_range,
     remove_transformed_dvla_file,
@@ -27,6 +30,19 @@ def test_get_s3_file_makes_correct_call(notify_api, mocker):
     get_s3_mock.assert_called_with('foo-bucket', 'bar-file.txt')
 
 
+def test_get_job_lines_from_s3_streams_decoded_lines(notify_api, mocker):
+    content = 'phone number,name\r\n+16502532222,Zoë\n+16502532223,Jo\n'.encode('utf-8')
+    get_s3_mock = mocker.patch('app.aws.s3.get_s3_object')
+    get_s3_mock.return_value.get.return_value = {'Body': StreamingBody(io.BytesIO(content), len(content))}
+
+    lines = get_job_lines_from_s3('some-service-id', 'some-job-id')
+
+    assert list(lines) == ['phone number,name\r\n', '+16502532222,Zoë\n', '+16502532223,Jo\n']
+    get_s3_mock.assert_called_once_with(
+        current_app.config['CSV_UPLOAD_BUCKET_NAME'], 'service-some-service-id-notify/some-job-id.csv'
+    )
+
+
 def test_remove_transformed_dvla_file_makes_correct_call(notify_api, mocker):
     s3_mock = mocker.patch('app.aws.s3.get_s3_object')
     fake_uuid = '5fbf9799-6b9b-4dbb-9a4e-74a939f3bb49'
@@ -0,0 +1,288 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.callback.dispatcher import CallbackDispatcher, HostLimiter
+from app.celery.service_callback_tasks import (
+    send_delivery_status_from_notification,
+    send_delivery_status_to_service,
+)
+from app.config import QueueNames
+from app.constants import QUEUE_CHANNEL_TYPE, WEBHOOK_CHANNEL_TYPE
+
+CALLBACK_URL = 'https://test_url.com/callback'
+
+
+class _FakeResponse:
+    def __init__(self, status, delay):
+        self.status = status
+        self.delay = delay
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.delay)
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class _FakeSession:
+    def __init__(self, status=200, delay=0):
+        self.status = status
+        self.delay = delay
+        self.requests = []
+
+    def post(self, url, data, headers):
+        self.requests.append((url, data, headers))
+        return _FakeResponse(self.status, self.delay)
+
+
+def _message(mocker, retries=0, url=CALLBACK_URL):
+    message = mocker.Mock(headers={'task': 'send-notification-delivery-status', 'id': 'task-id', 'retries': retries})
+    message.decode.return_value = [
+        [],
+        {
+            'callback_signature': 'signature',
+            'callback_url': url,
+            'notification_data': {'status': 'delivered'},
+            'notification_id': 'notification-id',
+        },
+        {},
+    ]
+    return message
+
+
+class _FakeQueue:
+    class Empty(Exception):
+        pass
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    def get(self, block, timeout):
+        if self.messages:
+            return self.messages.pop(0)
+        raise self.Empty
+
+
+def _dispatcher(start_timeout=10, host_concurrency=10, max_in_flight=10):
+    return CallbackDispatcher(
+        max_in_flight=max_in_flight, start_timeout=start_timeout, host_concurrency=host_concurrency, host_rate=1000
+    )
+
+
+def _dispatch(dispatcher, session, messages):
+    """Handle each message in its own task, as CallbackDispatcher.consume does, and wait for them all."""
+
+    async def dispatch():
+        await asyncio.gather(*(dispatcher.start(session, message) for message in messages))
+
+    asyncio.run(dispatch())
+
+
+def test_host_limiter_limits_callbacks_in_flight():
+    async def acquire_three():
+        limiter = HostLimiter(concurrency=2, rate=1000)
+        await limiter.acquire()
+        await limiter.acquire()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acquire(), 0.05)
+
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), 0.05)
+
+    asyncio.run(acquire_three())
+
+
+def test_dispatcher_sends_callback_and_acks(notify_api, mocker):
+    session = _FakeSession()
+    message = _message(mocker)
+
+    _dispatch(_dispatcher(), session, [message])
+
+    assert session.requests == [
+        (
+            CALLBACK_URL,
+            '{"status": "delivered"}',
+            {'Content-Type': 'application/json', 'x-enp-signature': 'signature'},
+        )
+    ]
+    message.ack.assert_called_once()
+
+
+@pytest.mark.parametrize('status', [429, 500])
+def test_dispatcher_queues_retryable_failures_again(notify_api, mocker, status):
+    mock_apply_async = mocker.patch.object(send_delivery_status_from_notification, 'apply_async')
+    message = _message(mocker, retries=2)
+
+    _dispatch(_dispatcher(), _FakeSession(status=status), [message])
+
+    mock_apply_async.assert_called_once()
+    assert mock_apply_async.call_args.args == ([], message.decode.return_value[1])
+    assert mock_apply_async.call_args.kwargs['queue'] == QueueNames.DELIVERY_STATUS_CALLBACKS
+    assert mock_apply_async.call_args.kwargs['retries'] == 3
+    assert (
+        0
+        <= mock_apply_async.call_args.kwargs['DelaySeconds']
+        <= send_delivery_status_from_notification.retry_backoff_max
+    )
+    message.ack.assert_called_once()
+
+
+def test_dispatcher_does_not_retry_client_errors(notify_api, mocker):
+    mock_apply_async = mocker.patch.object(send_delivery_status_from_notification, 'apply_async')
+    message = _message(mocker)
+
+    _dispatch(_dispatcher(), _FakeSession(status=404), [message])
+
+    mock_apply_async.assert_not_called()
+    message.ack.assert_called_once()
+
+
+def test_dispatcher_stops_retrying_after_max_retries(notify_api, mocker):
+    mock_apply_async = mocker.patch.object(send_delivery_status_from_notification, 'apply_async')
+    message = _message(mocker, retries=send_delivery_status_from_notification.max_retries)
+
+    _dispatch(_dispatcher(), _FakeSession(status=500), [message])
+
+    mock_apply_async.assert_not_called()
+    message.ack.assert_called_once()
+
+
+def test_dispatcher_returns_callbacks_for_a_busy_host_to_the_queue(notify_api, mocker):
+    session = _FakeSession(delay=0.2)
+    first, second = _message(mocker), _message(mocker)
+    other_host = _message(mocker, url='https://other.com/callback')
+
+    _dispatch(_dispatcher(start_timeout=0.05, host_concurrency=1), session, [first, second, other_host])
+
+    assert [url for url, _, _ in session.requests] == [CALLBACK_URL, 'https://other.com/callback']
+    first.ack.assert_called_once()
+    other_host.ack.assert_called_once()
+    second.requeue.assert_called_once()
+    second.ack.assert_not_called()
+
+
+def test_dispatcher_hands_queue_callbacks_to_celery(notify_api, mocker):
+    mocker.patch(
+        'app.callback.dispatcher.get_service_callback',
+        return_value=mocker.Mock(callback_channel=QUEUE_CHANNEL_TYPE),
+    )
+    mock_send_task = mocker.patch('app.callback.dispatcher.notify_celery.send_task')
+    session = _FakeSession()
+    message = mocker.Mock(headers={'task': 'send-delivery-status', 'id': 'task-id', 'retries': 1})
+    kwargs = {
+        'service_callback_id': 'callback-id',
+        'notification_id': 'notification-id',
+        'encrypted_status_update': 'encrypted',
+    }
+    message.decode.return_value = [[], kwargs, {}]
+
+    _dispatch(_dispatcher(), session, [message])
+
+    assert session.requests == []
+    mock_send_task.assert_called_once_with('send-delivery-status', [], kwargs, queue=QueueNames.CALLBACKS, retries=1)
+    message.ack.assert_called_once()
+
+
+def test_dispatcher_sends_webhook_metrics_under_the_celery_task_names(notify_api, mocker):
+    mocker.patch(
+        'app.callback.dispatcher.get_service_callback',
+        return_value=mocker.Mock(
+            callback_channel=WEBHOOK_CHANNEL_TYPE, callback_type='delivery_status', url=CALLBACK_URL
+        ),
+    )
+    mocker.patch('app.callback.dispatcher.create_delivery_status_payload', return_value={'status': 'delivered'})
+    mocker.patch('app.callback.dispatcher.webhook_headers', return_value={})
+    mock_statsd_http = mocker.patch('app.callback.dispatcher.statsd_http')
+    mock_incr = mocker.patch('app.callback.dispatcher.statsd_client.incr')
+    message = mocker.Mock(headers={'task': 'send-delivery-status', 'id': 'task-id', 'retries': 0})
+    message.decode.return_value = [
+        [],
+        {
+            'service_callback_id': 'callback-id',
+            'notification_id': 'notification-id',
+            'encrypted_status_update': 'encrypted',
+        },
+        {},
+    ]
+
+    _dispatch(_dispatcher(), _FakeSession(), [message])
+
+    mock_statsd_http.assert_called_once_with('callback.webhook')
+    mock_incr.assert_any_call('callback.webhook.delivery_status.success')
+    message.ack.assert_called_once()
+
+
+def test_dispatcher_survives_errors_completing_a_callback(notify_api, mocker):
+    mocker.patch.object(send_delivery_status_from_notification, 'apply_async', side_effect=Exception('broker down'))
+    failing, sent = _message(mocker), _message(mocker, url='https://other.com/callback')
+    session = _FakeSession()
+    session.post = lambda url, data, headers: _FakeResponse(500 if url == CALLBACK_URL else 200, 0)
+
+    _dispatch(_dispatcher(), session, [failing, sent])
+
+    # Left unacknowledged, so it is delivered again after its visibility timeout
+    failing.ack.assert_not_called()
+    sent.ack.assert_called_once()
+
+
+def test_consume_takes_new_messages_while_a_slow_callback_is_in_flight(notify_api, mocker):
+    slow = _message(mocker, url='https://slow.com/callback')
+    fast = [_message(mocker) for _ in range(3)]
+    session = _FakeSession()
+    session.post = lambda url, data, headers: _FakeResponse(200, 0.5 if url.startswith('https://slow') else 0)
+
+    async def consume():
+        dispatcher = _dispatcher(max_in_flight=2)
+        consumer = asyncio.create_task(dispatcher.consume(session, _FakeQueue([slow, *fast])))
+        await asyncio.sleep(0.2)
+
+        for message in fast:
+            message.ack.assert_called_once()
+        slow.ack.assert_not_called()
+
+        dispatcher.stop()
+        await consumer
+        slow.ack.assert_called_once()
+
+    asyncio.run(consume())
+
+
+def test_dispatcher_does_not_block_the_event_loop(notify_api, mocker):
+    threads = {}
+
+    def record_thread(name, return_value=None):
+        def record(*args, **kwargs):
+            threads[name] = threading.current_thread().name
+            return return_value
+
+        return record
+
+    mocker.patch(
+        'app.callback.dispatcher.get_service_callback',
+        side_effect=record_thread(
+            'prepare',
+            mocker.Mock(callback_channel=WEBHOOK_CHANNEL_TYPE, callback_type='delivery_status', url=CALLBACK_URL),
+        ),
+    )
+    mocker.patch('app.callback.dispatcher.create_delivery_status_payload', return_value={'status': 'delivered'})
+    mocker.patch('app.callback.dispatcher.webhook_headers', return_value={})
+    mocker.patch.object(send_delivery_status_to_service, 'apply_async', record_thread('retry'))
+    message = mocker.Mock(headers={'task': 'send-delivery-status', 'id': 'task-id', 'retries': 0})
+    message.decode.return_value = [
+        [],
+        {
+            'service_callback_id': 'callback-id',
+            'notification_id': 'notification-id',
+            'encrypted_status_update': 'encrypted',
+        },
+        {},
+    ]
+
+    _dispatch(_dispatcher(), _FakeSession(status=500), [message])
+
+    assert threads['prepare'].startswith('callback-dispatcher-prepare')
+    assert threads['retry'].startswith('callback-dispatcher-broker')
+    message.ack.assert_called_once()
@@ -0,0 +1,73 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+import pytest
+
+from app.callback import http_session
+from app.callback.http_session import get_callback_session
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Set-Cookie', 'session=secret; Path=/')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def callback_server():
+    server = HTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def new_session(mocker):
+    mocker.patch('app.callback.http_session._session', None)
+
+
+def test_get_callback_session_reuses_the_session(notify_api):
+    session = get_callback_session()
+
+    assert get_callback_session() is session
+    assert session.get_adapter('https://example.com')._pool_maxsize == notify_api.config['CALLBACK_HTTP_POOL_MAXSIZE']
+
+
+def test_get_callback_session_creates_a_session_after_fork(notify_api):
+    session = get_callback_session()
+
+    http_session._discard_session()
+
+    assert get_callback_session() is not session
+
+
+def test_callback_session_reuses_connections(notify_api, callback_server, mocker):
+    mock_incr = mocker.patch('app.callback.http_session.statsd_client.incr')
+    session = get_callback_session()
+
+    session.post(callback_server, data='first', timeout=5)
+    session.post(callback_server, data='second', timeout=5)
+
+    assert mock_incr.call_args_list == [
+        mocker.call('callback.http.connection.new'),
+        mocker.call('callback.http.connection.reused'),
+    ]
+
+
+def test_callback_session_does_not_keep_cookies(notify_api, callback_server):
+    session = get_callback_session()
+
+    response = session.post(callback_server, data='first', timeout=5)
+
+    assert response.headers['Set-Cookie'] == 'session=secret; Path=/'
+    assert len(session.cookies) == 0
@@ -116,7 +116,9 @@ def test_send_callback_increments_statsd_client_with_retryable_error_for_status_
 def test_send_callback_raises_retryable_exception_with_request_exception(
     notify_api, sample_delivery_status_callback_api_data, mocker
 ):
-    mocker.patch('app.callback.webhook_callback_strategy.request', side_effect=RequestException())
+    mocker.patch(
+        'app.callback.webhook_callback_strategy.get_callback_session'
+    ).return_value.post.side_effect = RequestException()
     with pytest.raises(RetryableException):
         WebhookCallbackStrategy.send_callback(
             callback=sample_delivery_status_callback_api_data,
@@ -128,7 +130,9 @@ def test_send_callback_raises_retryable_exception_with_request_exception(
 def test_send_callback_increments_statsd_client_with_retryable_error_for_request_exception(
     notify_api, sample_delivery_status_callback_api_data, mock_statsd_client, mocker
 ):
-    mocker.patch('app.callback.webhook_callback_strategy.request', side_effect=RequestException())
+    mocker.patch(
+        'app.callback.webhook_callback_strategy.get_callback_session'
+    ).return_value.post.side_effect = RequestException()
     with pytest.raises(RetryableException):
         WebhookCallbackStrategy.send_callback(
             callback=sample_delivery_status_callback_api_data,
@@ -18,6 +18,7 @@ from app.celery.nightly_tasks import (
     delete_letter_notifications_older_than_retention,
     delete_sms_notifications_older_than_retention,
     export_active_user_email_lists,
+    maintain_notification_partitions,
     raise_alert_if_letter_notifications_still_sending,
     remove_letter_csv_files,
     remove_sms_email_csv_files,
@@ -199,6 +200,14 @@ def test_should_call_delete_letter_notifications_more_than_week_in_task(notify_a
     mocked.assert_called_once_with(LETTER_TYPE)
 
 
+def test_maintain_notification_partitions_creates_and_drops_partitions(notify_api, mocker):
+    create = mocker.patch('app.celery.nightly_tasks.dao_create_notification_partitions', return_value=[])
+    drop = mocker.patch('app.celery.nightly_tasks.dao_drop_expired_notification_partitions', return_value=[])
+    maintain_notification_partitions()
+    create.assert_called_once_with()
+    drop.assert_called_once_with()
+
+
 @freeze_time('2026-03-03T08:00:00')
 def test_export_active_user_email_lists_uploads_expected_files_in_staging(notify_api, mocker):
     """Export task uploads all three role-based files with sorted semicolon-separated content in staging."""
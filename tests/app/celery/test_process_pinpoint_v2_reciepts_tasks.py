@@ -1,9 +1,27 @@
 import pytest
 from datetime import datetime
+from uuid import uuid4
 
+from celery.exceptions import Retry
+from freezegun import freeze_time
+
+from app.celery.exceptions import AutoRetryException
 from app.clients.sms import SmsStatusRecord
-from app.constants import NOTIFICATION_DELIVERED, NOTIFICATION_SENDING, PINPOINT_PROVIDER, STATUS_REASON_RETRYABLE
-from app.celery.process_pinpoint_v2_receipt_tasks import process_pinpoint_v2_receipt_results
+from app.config import QueueNames
+from app.constants import (
+    NOTIFICATION_DELIVERED,
+    NOTIFICATION_PERMANENT_FAILURE,
+    NOTIFICATION_SENDING,
+    NOTIFICATION_SENT,
+    NOTIFICATION_TEMPORARY_FAILURE,
+    PINPOINT_PROVIDER,
+    STATUS_REASON_RETRYABLE,
+)
+from app.celery.process_pinpoint_v2_receipt_tasks import (
+    MISSING_NOTIFICATION_RETRY_DELAY,
+    process_pinpoint_v2_receipt_results,
+    process_pinpoint_v2_receipt_results_batch,
+)
 
 
 class TestProcessPinpointV2ReceiptResults:
@@ -67,3 +85,127 @@ class TestProcessPinpointV2ReceiptResults:
 
         mock_sms_attempt_retry.assert_called_once_with(retryable_sms_status_record, event_timestamp)
         mock_sms_status_update.assert_not_called()
+
+
+class TestProcessPinpointV2ReceiptResultsBatch:
+    @staticmethod
+    def _sms_status_record(reference, status, status_reason=None):
+        return SmsStatusRecord(
+            payload=None,
+            reference=reference,
+            status=status,
+            status_reason=status_reason,
+            message_parts=1,
+            provider=PINPOINT_PROVIDER,
+            price_millicents=75,
+            provider_updated_at=datetime(2024, 7, 31, 12, 0, 0, 0),
+        )
+
+    def test_updates_every_notification_in_the_batch(
+        self,
+        mocker,
+        sample_notification,
+        notify_db_session,
+    ):
+        mock_callback = mocker.patch('app.celery.process_delivery_status_result_tasks.check_and_queue_callback_task')
+        mocker.patch(
+            'app.celery.process_delivery_status_result_tasks.check_and_queue_va_profile_notification_status_callback'
+        )
+        delivered = sample_notification(status=NOTIFICATION_SENDING, reference=str(uuid4()))
+        failed = sample_notification(status=NOTIFICATION_SENDING, reference=str(uuid4()))
+
+        process_pinpoint_v2_receipt_results_batch(
+            [
+                (self._sms_status_record(delivered.reference, NOTIFICATION_DELIVERED), '1722427200000'),
+                (
+                    self._sms_status_record(failed.reference, NOTIFICATION_PERMANENT_FAILURE, 'Unreachable'),
+                    '1722427200000',
+                ),
+            ]
+        )
+
+        notify_db_session.session.refresh(delivered)
+        notify_db_session.session.refresh(failed)
+        assert (delivered.status, delivered.status_reason) == (NOTIFICATION_DELIVERED, None)
+        assert (failed.status, failed.status_reason) == (NOTIFICATION_PERMANENT_FAILURE, 'Unreachable')
+        assert delivered.cost_in_millicents == failed.cost_in_millicents == 75
+        assert mock_callback.call_count == 2
+
+    def test_honours_status_precedence_within_the_batch(
+        self,
+        mocker,
+        sample_notification,
+        notify_db_session,
+    ):
+        mock_callback = mocker.patch('app.celery.process_delivery_status_result_tasks.check_and_queue_callback_task')
+        mocker.patch(
+            'app.celery.process_delivery_status_result_tasks.check_and_queue_va_profile_notification_status_callback'
+        )
+        notification = sample_notification(status=NOTIFICATION_SENDING, reference=str(uuid4()))
+
+        process_pinpoint_v2_receipt_results_batch(
+            [
+                (self._sms_status_record(notification.reference, NOTIFICATION_DELIVERED), '1722427200000'),
+                # Arrives out of order, so must not replace the final status or be billed
+                (self._sms_status_record(notification.reference, NOTIFICATION_SENT), '1722427200000'),
+            ]
+        )
+
+        notify_db_session.session.refresh(notification)
+        assert notification.status == NOTIFICATION_DELIVERED
+        assert notification.cost_in_millicents == 75
+        mock_callback.assert_called_once()
+
+    def test_requeues_receipts_for_notifications_not_found_yet(self, mocker, notify_db_session):
+        mock_apply_async = mocker.patch(
+            'app.celery.process_pinpoint_v2_receipt_tasks.process_pinpoint_v2_receipt_results_batch.apply_async'
+        )
+        recent = (self._sms_status_record(str(uuid4()), NOTIFICATION_DELIVERED), '1722427200000')
+        expired = (self._sms_status_record(str(uuid4()), NOTIFICATION_DELIVERED), '1722426000000')
+
+        with freeze_time('2024-07-31 12:01:00'):
+            process_pinpoint_v2_receipt_results_batch([recent, expired])
+
+        mock_apply_async.assert_called_once_with(
+            [[recent]],
+            queue=QueueNames.NOTIFY,
+            serializer='pickle',
+            countdown=MISSING_NOTIFICATION_RETRY_DELAY,
+        )
+
+    def test_retryable_receipts_are_processed_one_at_a_time(self, mocker):
+        mock_sms_attempt_retry = mocker.patch('app.celery.process_pinpoint_v2_receipt_tasks.sms_attempt_retry')
+        mock_sms_status_update_batch = mocker.patch(
+            'app.celery.process_pinpoint_v2_receipt_tasks.sms_status_update_batch', return_value=[]
+        )
+        retryable = (
+            self._sms_status_record(str(uuid4()), NOTIFICATION_TEMPORARY_FAILURE, STATUS_REASON_RETRYABLE),
+            '1722427200000',
+        )
+        delivered = (self._sms_status_record(str(uuid4()), NOTIFICATION_DELIVERED), '1722427200000')
+
+        process_pinpoint_v2_receipt_results_batch([retryable, delivered])
+
+        mock_sms_attempt_retry.assert_called_once_with(*retryable)
+        mock_sms_status_update_batch.assert_called_once_with([delivered])
+
+    def test_retries_unapplied_receipts_after_a_transient_database_error(self, mocker):
+        mock_sms_attempt_retry = mocker.patch('app.celery.process_pinpoint_v2_receipt_tasks.sms_attempt_retry')
+        mocker.patch(
+            'app.celery.process_pinpoint_v2_receipt_tasks.sms_status_update_batch',
+            side_effect=AutoRetryException('Found OperationalError, autoretrying...'),
+        )
+        mock_retry = mocker.patch.object(process_pinpoint_v2_receipt_results_batch, 'retry', side_effect=Retry)
+        retryable = (
+            self._sms_status_record(str(uuid4()), NOTIFICATION_TEMPORARY_FAILURE, STATUS_REASON_RETRYABLE),
+            '1722427200000',
+        )
+        delivered = (self._sms_status_record(str(uuid4()), NOTIFICATION_DELIVERED), '1722427200000')
+
+        with pytest.raises(Retry):
+            process_pinpoint_v2_receipt_results_batch([retryable, delivered])
+
+        # The retryable receipt was applied, so only the status update is retried
+        mock_sms_attempt_retry.assert_called_once_with(*retryable)
+        assert mock_retry.call_args.kwargs['args'] == [[delivered]]
+        assert mock_retry.call_args.kwargs['serializer'] == 'pickle'
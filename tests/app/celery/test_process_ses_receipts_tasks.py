@@ -8,6 +8,9 @@ from freezegun import freeze_time
 from unittest.mock import patch
 from uuid import uuid4
 
+from sqlalchemy import event
+
+from app import db
 from app.celery import process_ses_receipts_tasks
 from app.celery.exceptions import NonRetryableException
 from app.celery.research_mode_tasks import (
@@ -16,6 +19,7 @@ from app.celery.research_mode_tasks import (
     ses_soft_bounce_callback,
 )
 from app.celery.service_callback_tasks import create_delivery_status_callback_data
+from app.config import QueueNames
 from app.constants import (
     EMAIL_TYPE,
     NOTIFICATION_DELIVERED,
@@ -387,7 +391,7 @@ def test_process_ses_results_retry_called(mocker, sample_template, sample_notifi
     ref = str(uuid4())
     sample_notification(template=template, reference=ref, sent_at=datetime.utcnow(), status=NOTIFICATION_SENDING)
 
-    mocker.patch('app.dao.notifications_dao._update_notification_status', side_effect=Exception('EXPECTED'))
+    mocker.patch('app.dao.notifications_dao.dao_update_notification_if_unchanged', side_effect=Exception('EXPECTED'))
     mocked = mocker.patch('app.celery.process_ses_receipts_tasks.process_ses_results.retry')
     process_ses_receipts_tasks.process_ses_results(celery_envelope=ses_notification_callback(reference=ref))
     assert mocked.call_count != 0
@@ -430,6 +434,142 @@ def test_process_ses_results_increments_retry_count(mocker, sample_template, sam
     assert notification.retry_count == 1
 
 
+def test_process_ses_results_updates_notification_with_one_statement(mocker, sample_template, sample_notification):
+    template = sample_template(template_type=EMAIL_TYPE)
+    ref = str(uuid4())
+    notification: Notification = sample_notification(
+        template=template,
+        reference=ref,
+        sent_at=datetime.utcnow(),
+        status=NOTIFICATION_SENDING,
+    )
+
+    mock_task = mocker.Mock(spec=Task)
+    mock_task.request.retries = 1
+
+    statements = []
+
+    def record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record_statement)
+    try:
+        process_ses_receipts_tasks.process_ses_results.__wrapped__.__wrapped__(
+            mock_task,
+            celery_envelope=ses_notification_callback(reference=ref),
+        )
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record_statement)
+
+    assert len([statement for statement in statements if statement.startswith('UPDATE notifications')]) == 1
+    assert notification.status == NOTIFICATION_DELIVERED
+    assert notification.retry_count == 1
+    assert notification.provider_updated_at == datetime(2017, 11, 17, 12, 14, 1, 643000)
+
+
+def test_process_ses_results_retries_if_notification_changed(mocker, sample_template, sample_notification):
+    template = sample_template(template_type=EMAIL_TYPE)
+    ref = str(uuid4())
+    notification = sample_notification(template=template, reference=ref, status=NOTIFICATION_SENDING)
+
+    mocker.patch('app.dao.notifications_dao.dao_update_notification_if_unchanged', return_value=None)
+    mock_callback = mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_callback_task')
+    mock_retry = mocker.patch('app.celery.process_ses_receipts_tasks.process_ses_results.retry')
+
+    assert process_ses_receipts_tasks.process_ses_results(ses_notification_callback(reference=ref)) is None
+
+    mock_retry.assert_called_once_with(queue=QueueNames.RETRY)
+    mock_callback.assert_not_called()
+    assert get_notification_by_id(notification.id).status == NOTIFICATION_SENDING
+
+
+def test_process_ses_results_batch_finds_notifications_with_one_query(mocker, sample_template, sample_notification):
+    template = sample_template(template_type=EMAIL_TYPE)
+    notifications = [
+        sample_notification(template=template, reference=str(uuid4()), status=NOTIFICATION_SENDING) for _ in range(2)
+    ]
+    mock_get = mocker.patch('app.dao.notifications_dao.dao_get_notification_by_reference')
+    mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_callback_task')
+    mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_va_profile_notification_status_callback')
+
+    process_ses_receipts_tasks.process_ses_results_batch(
+        [ses_notification_callback(reference=notification.reference) for notification in notifications]
+    )
+
+    mock_get.assert_not_called()
+    for notification in notifications:
+        assert get_notification_by_id(notification.id).status == NOTIFICATION_DELIVERED
+
+
+def test_process_ses_results_batch_does_not_reload_notifications_after_each_commit(
+    mocker, sample_template, sample_notification
+):
+    template = sample_template(template_type=EMAIL_TYPE)
+    notifications = [
+        sample_notification(template=template, reference=str(uuid4()), status=NOTIFICATION_SENDING) for _ in range(3)
+    ]
+    mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_callback_task')
+    mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_va_profile_notification_status_callback')
+
+    statements = []
+
+    def record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record_statement)
+    try:
+        process_ses_receipts_tasks.process_ses_results_batch(
+            [ses_notification_callback(reference=notification.reference) for notification in notifications]
+        )
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record_statement)
+
+    selects = [s for s in statements if s.startswith('SELECT') and 'FROM notifications' in s]
+    assert len(selects) == 1
+    assert len([s for s in statements if s.startswith('UPDATE notifications')]) == 3
+    assert db.session().expire_on_commit
+
+
+def test_process_ses_results_batch_requeues_only_missing_notifications(
+    mocker, client, sample_template, sample_notification
+):
+    template = sample_template(template_type=EMAIL_TYPE)
+    notification = sample_notification(template=template, reference=str(uuid4()), status=NOTIFICATION_SENDING)
+    mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_callback_task')
+    mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_va_profile_notification_status_callback')
+    mock_apply_async = mocker.patch('app.celery.process_ses_receipts_tasks.process_ses_results.apply_async')
+
+    found = ses_notification_callback(reference=notification.reference)
+    missing = ses_notification_callback(reference=str(uuid4()))
+    missing_message = json.loads(missing['Message'])
+    missing_message['mail']['timestamp'] = datetime.utcnow().isoformat()
+    missing = {'Message': json.dumps(missing_message)}
+
+    process_ses_receipts_tasks.process_ses_results_batch([found, missing])
+
+    assert get_notification_by_id(notification.id).status == NOTIFICATION_DELIVERED
+    mock_apply_async.assert_called_once_with(
+        [missing],
+        retries=1,
+        countdown=process_ses_receipts_tasks.process_ses_results.default_retry_delay,
+        queue=QueueNames.RETRY,
+    )
+
+
+def test_process_ses_results_batch_fans_out_with_delivery_status_overhaul(mocker):
+    mocker.patch('app.celery.process_ses_receipts_tasks.is_feature_enabled', return_value=True)
+    mock_legacy = mocker.patch('app.celery.process_ses_receipts_tasks._process_ses_results')
+    mock_apply_async = mocker.patch('app.celery.process_ses_receipts_tasks.process_ses_results.apply_async')
+    envelopes = [ses_notification_callback(reference=str(uuid4())) for _ in range(2)]
+
+    process_ses_receipts_tasks.process_ses_results_batch(envelopes)
+
+    mock_legacy.assert_not_called()
+    assert mock_apply_async.call_args_list == [
+        mocker.call([envelope], queue=QueueNames.DELIVERY_STATUS_RESULT_TASKS) for envelope in envelopes
+    ]
+
+
 def test_remove_emails_from_complaint():
     test_json = json.loads(ses_complaint_callback()['Message'])
     remove_emails_from_complaint(test_json)
@@ -549,7 +689,6 @@ def test_it_ses_callback_should_send_email_status_to_va_profile_with_notificatio
     template = sample_template(template_type=EMAIL_TYPE)
     with freeze_time('2001-01-01T12:00:00'):
         mock_log_total_time = mocker.patch('app.celery.common.log_notification_total_time')
-        mocker.patch('app.celery.process_ses_receipts_tasks.notifications_dao.dao_update_notification')
         mocker.patch('app.celery.process_ses_receipts_tasks.process_ses_results.retry')
         mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_callback_task')
         mock_send_email_status = mocker.patch(
@@ -587,7 +726,6 @@ def test_it_ses_callback_should_send_email_status_to_va_profile_with_notificatio
     template = sample_template(template_type=EMAIL_TYPE)
     with freeze_time('2001-01-01T12:00:00'):
         mock_log_total_time = mocker.patch('app.celery.common.log_notification_total_time')
-        mocker.patch('app.celery.process_ses_receipts_tasks.notifications_dao.dao_update_notification')
         mock_callback = mocker.patch('app.celery.process_ses_receipts_tasks.check_and_queue_callback_task')
         mock_send_email_status = mocker.patch(
             'app.celery.send_va_profile_notification_status_tasks.send_notification_status_to_va_profile.apply_async'
@@ -620,7 +758,6 @@ def test_ses_callback_should_not_update_notification_status_if_already_delivered
     mocker, sample_template, sample_notification
 ):
     mock_dup = mocker.patch('app.celery.process_ses_receipts_tasks.notifications_dao.duplicate_update_warning')
-    mock_upd = mocker.patch('app.celery.process_ses_receipts_tasks.notifications_dao._update_notification_status')
 
     template = sample_template(template_type=EMAIL_TYPE)
     ref = str(uuid4())
@@ -632,7 +769,6 @@ def test_ses_callback_should_not_update_notification_status_if_already_delivered
     mock_dup.assert_called_once()
     assert mock_dup.call_args.args[0].id == notification.id
     assert mock_dup.call_args.args[1] == NOTIFICATION_DELIVERED
-    assert mock_upd.call_count == 0
 
 
 def test_ses_callback_should_retry_if_notification_is_new(client, notify_db, mocker):
@@ -604,6 +604,65 @@ def test_deliver_sms_with_rate_limiting_should_retry_if_rate_limit_exceeded(
     retry.assert_called_once()
 
 
+def test_deliver_sms_with_rate_limiting_retries_at_reserved_slot(
+    mocker,
+    sample_template,
+    sample_notification,
+):
+    MockSmsSender = namedtuple('ServiceSmsSender', ['id', 'rate_limit', 'rate_limit_interval'])
+    sms_sender = MockSmsSender(id=uuid4(), rate_limit=50, rate_limit_interval=1)
+
+    mocker.patch(
+        'app.notifications.validators.check_sms_sender_over_rate_limit',
+        side_effect=RateLimitError(sms_sender.rate_limit, 1, retry_after=0.75, slot_reserved=True),
+    )
+    send_sms_to_provider = mocker.patch('app.delivery.send_to_providers.send_sms_to_provider')
+    mocker.patch(
+        'app.celery.provider_tasks.dao_get_service_sms_sender_by_service_id_and_number', return_value=sms_sender
+    )
+    retry = mocker.patch('app.celery.provider_tasks.deliver_sms_with_rate_limiting.retry')
+    notification = sample_notification(template=sample_template())
+
+    deliver_sms_with_rate_limiting(notification.id)
+
+    send_sms_to_provider.assert_not_called()
+    assert retry.call_args.kwargs['countdown'] == 0.75
+    assert retry.call_args.kwargs['kwargs']['sms_sender_slot_reserved']
+
+
+def test_deliver_sms_with_rate_limiting_sends_in_reserved_slot_without_checking(
+    mocker,
+    sample_template,
+    sample_notification,
+):
+    check = mocker.patch('app.notifications.validators.check_sms_sender_over_rate_limit')
+    send_sms_to_provider = mocker.patch('app.delivery.send_to_providers.send_sms_to_provider')
+    notification = sample_notification(template=sample_template())
+
+    deliver_sms_with_rate_limiting(notification.id, sms_sender_slot_reserved=True)
+
+    check.assert_not_called()
+    send_sms_to_provider.assert_called_once()
+
+
+def test_deliver_sms_with_rate_limiting_checks_the_rate_limit_when_retrying_a_reserved_slot(
+    mocker,
+    sample_template,
+    sample_notification,
+):
+    check = mocker.patch('app.notifications.validators.check_sms_sender_over_rate_limit')
+    send_sms_to_provider = mocker.patch(
+        'app.delivery.send_to_providers.send_sms_to_provider', side_effect=[Exception('provider error'), None]
+    )
+    notification = sample_notification(template=sample_template())
+
+    # Run eagerly, so the retry for the provider error runs the task again straight away
+    deliver_sms_with_rate_limiting.apply(args=(notification.id,), kwargs={'sms_sender_slot_reserved': True})
+
+    assert send_sms_to_provider.call_count == 2
+    check.assert_called_once()
+
+
 def test_deliver_sms_with_rate_limiting_should_retry_generic_exceptions(
     mocker,
     sample_template,
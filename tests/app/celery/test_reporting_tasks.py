@@ -15,9 +15,10 @@ from app.celery.reporting_tasks import (
     create_nightly_notification_status_for_day,
     generate_daily_notification_status_csv_report,
     generate_nightly_billing_csv_report,
+    update_fact_notification_status_for_today,
 )
 from app.constants import EMAIL_TYPE, LETTER_TYPE, SMS_TYPE
-from app.dao.fact_billing_dao import get_rate
+from app.dao.fact_billing_dao import RateIndex, get_rate
 
 from app.models import FactBilling, FactNotificationStatus
 
@@ -445,9 +446,9 @@ def test_get_rate_for_letter_latest(sample_letter_rate):
     # rate and post_class
     new = sample_letter_rate(datetime(2017, 12, 1), crown=True, sheet_count=1, rate=0.33, post_class='second')
     old = sample_letter_rate(datetime(2016, 12, 1), crown=True, sheet_count=1, rate=0.30, post_class='second')
-    letter_rates = [new, old]
+    letter_rates = RateIndex.for_letter_rates([new, old])
 
-    rate = get_rate([], letter_rates, LETTER_TYPE, date(2018, 1, 1), True, 1)
+    rate = get_rate(RateIndex.for_non_letter_rates([]), letter_rates, LETTER_TYPE, date(2018, 1, 1), True, 1)
 
     assert rate == Decimal('0.33')
 
@@ -456,15 +457,18 @@ def test_get_rate_for_sms_and_email(
     notify_api,
     sample_rate,
 ):
-    non_letter_rates = [
-        sample_rate(datetime(2017, 12, 1), 0.15, SMS_TYPE),
-        sample_rate(datetime(2017, 12, 1), 0, EMAIL_TYPE),
-    ]
+    non_letter_rates = RateIndex.for_non_letter_rates(
+        [
+            sample_rate(datetime(2017, 12, 1), 0.15, SMS_TYPE),
+            sample_rate(datetime(2017, 12, 1), 0, EMAIL_TYPE),
+        ]
+    )
+    letter_rates = RateIndex.for_letter_rates([])
 
-    rate = get_rate(non_letter_rates, [], SMS_TYPE, date(2018, 1, 1))
+    rate = get_rate(non_letter_rates, letter_rates, SMS_TYPE, date(2018, 1, 1))
     assert rate == Decimal(0.15)
 
-    rate = get_rate(non_letter_rates, [], EMAIL_TYPE, date(2018, 1, 1))
+    rate = get_rate(non_letter_rates, letter_rates, EMAIL_TYPE, date(2018, 1, 1))
     assert rate == Decimal(0)
 
 
@@ -650,6 +654,16 @@ def test_create_nightly_notification_status_for_day_respects_local_timezone(
         notify_db_session.session.commit()
 
 
+# 3:30am UTC is still the previous day in the local timezone.
+@freeze_time('2019-04-02T03:30')
+def test_update_fact_notification_status_for_today_uses_local_day(notify_api, mocker):
+    mock_update = mocker.patch('app.celery.reporting_tasks.update_fact_notification_status', return_value=3)
+
+    update_fact_notification_status_for_today()
+
+    mock_update.assert_called_once_with(date(2019, 4, 1))
+
+
 def test_generate_daily_notification_status_csv_report(notify_api, mocker):
     service_id = uuid.uuid4()
     template_id = uuid.uuid4()
@@ -21,6 +21,7 @@ from app.celery.service_callback_tasks import (
     send_inbound_sms_to_service,
     create_delivery_status_callback_data,
     create_delivery_status_callback_data_v3,
+    delivery_status_callback_queue,
 )
 from app.config import QueueNames
 from app.constants import (
@@ -29,7 +30,9 @@ from app.constants import (
     INBOUND_SMS_CALLBACK_TYPE,
     NOTIFICATION_PERMANENT_FAILURE,
     NOTIFICATION_STATUS_TYPES,
+    QUEUE_CHANNEL_TYPE,
     SMS_TYPE,
+    WEBHOOK_CHANNEL_TYPE,
 )
 from app.exceptions import NotificationTechnicalFailureException
 from app.models import Complaint, Notification, ServiceCallback, Service, Template
@@ -627,3 +630,17 @@ def test_send_delivery_status_from_notification_raises_non_retryable_exception(r
     rmock.post(callback_url, json=notification_data, status_code=status_code)
     with pytest.raises(NonRetryableException):
         send_delivery_status_from_notification(callback_signature, callback_url, notification_data, notification_id)
+
+
+@pytest.mark.parametrize(
+    'callback_channel, dispatcher_enabled, expected_queue',
+    [
+        (WEBHOOK_CHANNEL_TYPE, True, QueueNames.DELIVERY_STATUS_CALLBACKS),
+        (WEBHOOK_CHANNEL_TYPE, False, QueueNames.CALLBACKS),
+        (QUEUE_CHANNEL_TYPE, True, QueueNames.CALLBACKS),
+    ],
+)
+def test_delivery_status_callback_queue(mocker, callback_channel, dispatcher_enabled, expected_queue):
+    mocker.patch('app.celery.service_callback_tasks.is_feature_enabled', return_value=dispatcher_enabled)
+
+    assert delivery_status_callback_queue(callback_channel) == expected_queue
@@ -5,6 +5,7 @@ from uuid import uuid4
 from celery.exceptions import Retry
 from freezegun import freeze_time
 from notifications_utils.columns import Row
+from notifications_utils.recipients import RecipientCSV
 from notifications_utils.template import SMSMessageTemplate, WithSubjectTemplate
 import pytest
 from sqlalchemy import func, select
@@ -17,10 +18,13 @@ from app.celery.tasks import (
     process_job,
     process_row,
     save_sms,
+    save_sms_batch,
     save_email,
+    save_email_batch,
     save_letter,
     process_incomplete_job,
     process_incomplete_jobs,
+    get_job_rows,
     get_template_class,
     s3,
 )
@@ -61,10 +65,16 @@ def _notification_json(template, to, personalisation=None, job_id=None, row_numb
     }
 
 
+def _published_row_count(mock_apply_async) -> int:
+    return sum(len(encryption.decrypt(c.args[0][1])['rows']) for c in mock_apply_async.call_args_list)
+
+
 def test_should_have_decorated_tasks_functions():
     assert process_job.__wrapped__.__name__ == 'process_job'
     assert save_sms.__wrapped__.__name__ == 'save_sms'
     assert save_email.__wrapped__.__name__ == 'save_email'
+    assert save_sms_batch.__wrapped__.__name__ == 'save_sms_batch'
+    assert save_email_batch.__wrapped__.__name__ == 'save_email_batch'
     assert save_letter.__wrapped__.__name__ == 'save_letter'
 
 
@@ -77,22 +87,23 @@ def test_should_process_sms_job(
     sample_job,
     notify_db_session,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv(SMS_TYPE))
-    mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv(SMS_TYPE).splitlines())
+    mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
     mocker.patch('app.encryption.encrypt', return_value='something_encrypted')
     mocker.patch('app.celery.tasks.create_uuid', return_value='uuid')
     template = sample_template()
     job = sample_job(template=template)
 
     process_job(job.id)
-    s3.get_job_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
-    assert encryption.encrypt.call_args[0][0]['to'] == '+441234123123'
+    s3.get_job_lines_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
     assert encryption.encrypt.call_args[0][0]['template'] == str(job.template.id)
     assert encryption.encrypt.call_args[0][0]['template_version'] == job.template.version
-    assert encryption.encrypt.call_args[0][0]['personalisation'] == {'phonenumber': '+441234123123'}
-    assert encryption.encrypt.call_args[0][0]['row_number'] == 0
-    tasks.save_sms.apply_async.assert_called_once_with(
-        (str(job.service_id), 'uuid', 'something_encrypted'), {}, queue='notify-internal-tasks'
+    assert encryption.encrypt.call_args[0][0]['job'] == str(job.id)
+    assert encryption.encrypt.call_args[0][0]['rows'] == [
+        {'id': 'uuid', 'to': '+441234123123', 'row_number': 0, 'personalisation': {'phonenumber': '+441234123123'}}
+    ]
+    tasks.save_sms_batch.apply_async.assert_called_once_with(
+        (str(job.service_id), 'something_encrypted'), {}, queue='notify-internal-tasks'
     )
 
     # Retrieve job from db
@@ -106,17 +117,16 @@ def test_should_process_sms_job_with_sender_id(
     sample_template,
     sample_job,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv(SMS_TYPE))
-    mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv(SMS_TYPE).splitlines())
+    mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
     mocker.patch('app.encryption.encrypt', return_value='something_encrypted')
-    mocker.patch('app.celery.tasks.create_uuid', return_value='uuid')
 
     template = sample_template()
     job = sample_job(template=template)
     process_job(job.id, sender_id=fake_uuid)
 
-    tasks.save_sms.apply_async.assert_called_once_with(
-        (str(job.service_id), 'uuid', 'something_encrypted'), {'sender_id': fake_uuid}, queue='notify-internal-tasks'
+    tasks.save_sms_batch.apply_async.assert_called_once_with(
+        (str(job.service_id), 'something_encrypted'), {'sender_id': fake_uuid}, queue='notify-internal-tasks'
     )
 
 
@@ -127,15 +137,17 @@ def test_should_not_process_sms_job_if_would_exceed_send_limits(
     service = sample_service(message_limit=9)
     template = sample_template(service=service)
     job = sample_job(template, notification_count=10, original_file_name='multiple_sms.csv')
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    mocker.patch('app.celery.tasks.process_row')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mocker.patch('app.celery.tasks.process_rows')
 
     process_job(job.id)
     notify_db_session.session.refresh(job)
 
     assert job.job_status == 'sending limits exceeded'
-    assert s3.get_job_from_s3.called is False
-    assert tasks.process_row.called is False
+    assert s3.get_job_lines_from_s3.called is False
+    assert tasks.process_rows.called is False
 
 
 def test_should_not_process_sms_job_if_would_exceed_send_limits_inc_today(
@@ -146,8 +158,8 @@ def test_should_not_process_sms_job_if_would_exceed_send_limits_inc_today(
     sample_notification,
     notify_db_session,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv(SMS_TYPE))
-    mocker.patch('app.celery.tasks.process_row')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv(SMS_TYPE).splitlines())
+    mocker.patch('app.celery.tasks.process_rows')
 
     service = sample_service(message_limit=1)
     template = sample_template(service=service)
@@ -158,8 +170,8 @@ def test_should_not_process_sms_job_if_would_exceed_send_limits_inc_today(
     notify_db_session.session.refresh(job)
 
     assert job.job_status == 'sending limits exceeded'
-    assert s3.get_job_from_s3.called is False
-    assert tasks.process_row.called is False
+    assert s3.get_job_lines_from_s3.called is False
+    assert tasks.process_rows.called is False
 
 
 @pytest.mark.parametrize('template_type', [SMS_TYPE, EMAIL_TYPE])
@@ -178,16 +190,16 @@ def test_should_not_process_email_job_if_would_exceed_send_limits_inc_today(
 
     sample_notification(template=template, job=job)
 
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3')
-    mocker.patch('app.celery.tasks.process_row')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3')
+    mocker.patch('app.celery.tasks.process_rows')
 
     process_job(job.id)
 
     notify_db_session.session.refresh(job)
 
     assert job.job_status == 'sending limits exceeded'
-    assert s3.get_job_from_s3.called is False
-    assert tasks.process_row.called is False
+    assert s3.get_job_lines_from_s3.called is False
+    assert tasks.process_rows.called is False
 
 
 def test_should_not_process_job_if_already_pending(
@@ -198,13 +210,13 @@ def test_should_not_process_job_if_already_pending(
     template = sample_template()
     job = sample_job(template, job_status='scheduled')
 
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3')
-    mocker.patch('app.celery.tasks.process_row')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3')
+    mocker.patch('app.celery.tasks.process_rows')
 
     process_job(job.id)
 
-    assert s3.get_job_from_s3.called is False
-    assert tasks.process_row.called is False
+    assert s3.get_job_lines_from_s3.called is False
+    assert tasks.process_rows.called is False
 
 
 def test_should_process_email_job_if_exactly_on_send_limits(
@@ -218,22 +230,23 @@ def test_should_process_email_job_if_exactly_on_send_limits(
     template = sample_template(service=service, template_type=EMAIL_TYPE)
     job = sample_job(template, notification_count=10)
 
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_email'))
-    mocker.patch('app.celery.tasks.save_email.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_email').splitlines()
+    )
+    mocker.patch('app.celery.tasks.save_email_batch.apply_async')
     mocker.patch('app.encryption.encrypt', return_value='something_encrypted')
-    mocker.patch('app.celery.tasks.create_uuid', return_value='uuid')
 
     process_job(job.id)
 
-    s3.get_job_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
+    s3.get_job_lines_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
 
     notify_db_session.session.refresh(job)
 
     assert job.job_status == 'finished'
-    tasks.save_email.apply_async.assert_called_with(
+    assert len(encryption.encrypt.call_args[0][0]['rows']) == 10
+    tasks.save_email_batch.apply_async.assert_called_once_with(
         (
             str(job.service_id),
-            'uuid',
             'something_encrypted',
         ),
         {},
@@ -247,19 +260,19 @@ def test_should_not_create_save_task_for_empty_file(
     sample_template,
     sample_job,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('empty'))
-    mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('empty').splitlines())
+    mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
 
     template = sample_template()
     job = sample_job(template)
     process_job(job.id)
 
-    s3.get_job_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
+    s3.get_job_lines_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
 
     notify_db_session.session.refresh(job)
 
     assert job.job_status == 'finished'
-    assert tasks.save_sms.apply_async.called is False
+    assert tasks.save_sms_batch.apply_async.called is False
 
 
 def test_should_process_email_job(
@@ -273,8 +286,8 @@ def test_should_process_email_job(
     test@test.com,foo
     """
 
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=email_csv)
-    mocker.patch('app.celery.tasks.save_email.apply_async')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3', return_value=email_csv.splitlines())
+    mocker.patch('app.celery.tasks.save_email_batch.apply_async')
     mocker.patch('app.encryption.encrypt', return_value='something_encrypted')
     mocker.patch('app.celery.tasks.create_uuid', return_value='uuid')
 
@@ -282,16 +295,21 @@ def test_should_process_email_job(
     job = sample_job(template)
     process_job(job.id)
 
-    s3.get_job_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
+    s3.get_job_lines_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
 
-    assert encryption.encrypt.call_args[0][0]['to'] == 'test@test.com'
     assert encryption.encrypt.call_args[0][0]['template'] == str(template.id)
     assert encryption.encrypt.call_args[0][0]['template_version'] == template.version
-    assert encryption.encrypt.call_args[0][0]['personalisation'] == {'emailaddress': 'test@test.com', 'name': 'foo'}
-    tasks.save_email.apply_async.assert_called_once_with(
+    assert encryption.encrypt.call_args[0][0]['rows'] == [
+        {
+            'id': 'uuid',
+            'to': 'test@test.com',
+            'row_number': 0,
+            'personalisation': {'emailaddress': 'test@test.com', 'name': 'foo'},
+        }
+    ]
+    tasks.save_email_batch.apply_async.assert_called_once_with(
         (
             str(job.service_id),
-            'uuid',
             'something_encrypted',
         ),
         {},
@@ -303,7 +321,7 @@ def test_should_process_email_job(
     assert job.job_status == 'finished'
 
 
-def test_should_process_email_job_with_sender_id(
+def test_should_not_pass_sender_id_to_email_batch(
     mocker,
     fake_uuid,
     sample_template,
@@ -314,18 +332,17 @@ def test_should_process_email_job_with_sender_id(
     test@test.com,foo
     """
 
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=email_csv)
-    mocker.patch('app.celery.tasks.save_email.apply_async')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3', return_value=email_csv.splitlines())
+    mocker.patch('app.celery.tasks.save_email_batch.apply_async')
     mocker.patch('app.encryption.encrypt', return_value='something_encrypted')
-    mocker.patch('app.celery.tasks.create_uuid', return_value='uuid')
 
     template = sample_template(template_type=EMAIL_TYPE, content='Hello (( Name))\nYour thing is due soon')
     job = sample_job(template)
     process_job(job.id, sender_id=fake_uuid)
 
-    tasks.save_email.apply_async.assert_called_once_with(
-        (str(job.service_id), 'uuid', 'something_encrypted'),
-        {'sender_id': fake_uuid},
+    tasks.save_email_batch.apply_async.assert_called_once_with(
+        (str(job.service_id), 'something_encrypted'),
+        {},
         queue='notify-internal-tasks',
     )
 
@@ -336,8 +353,10 @@ def test_should_process_all_sms_job(
     sample_template,
     sample_job,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
     mocker.patch('app.encryption.encrypt', return_value='something_encrypted')
     mocker.patch('app.celery.tasks.create_uuid', return_value='uuid')
 
@@ -345,19 +364,61 @@ def test_should_process_all_sms_job(
     job = sample_job(template)
     process_job(job.id)
 
-    s3.get_job_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
+    s3.get_job_lines_from_s3.assert_called_once_with(str(job.service.id), str(job.id))
 
-    assert encryption.encrypt.call_args[0][0]['to'] == '+441234123120'
+    rows = encryption.encrypt.call_args[0][0]['rows']
+    assert len(rows) == 10
+    assert rows[-1]['to'] == '+441234123120'
+    assert rows[-1]['personalisation'] == {'phonenumber': '+441234123120', 'name': 'chris'}
     assert encryption.encrypt.call_args[0][0]['template'] == str(template.id)
     assert encryption.encrypt.call_args[0][0]['template_version'] == template.version
-    assert encryption.encrypt.call_args[0][0]['personalisation'] == {'phonenumber': '+441234123120', 'name': 'chris'}
-    assert tasks.save_sms.apply_async.call_count == 10
+    assert tasks.save_sms_batch.apply_async.call_count == 1
 
     notify_db_session.session.refresh(job)
 
     assert job.job_status == 'finished'
 
 
+def test_should_process_sms_job_in_chunks(
+    mocker,
+    sample_template,
+    sample_job,
+):
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
+    mocker.patch('app.celery.tasks.JOB_ROW_CHUNK_SIZE', 3)
+
+    template = sample_template(content='Hello (( Name))\nYour thing is due soon')
+    job = sample_job(template)
+    process_job(job.id)
+
+    chunks = [encryption.decrypt(c.args[0][1])['rows'] for c in tasks.save_sms_batch.apply_async.call_args_list]
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    assert [row['row_number'] for chunk in chunks for row in chunk] == list(range(10))
+
+
+def test_should_process_sms_job_in_chunks_of_bounded_size(
+    mocker,
+    sample_template,
+    sample_job,
+):
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
+    mocker.patch('app.celery.tasks.JOB_CHUNK_MAX_BYTES', 1)
+
+    template = sample_template(content='Hello (( Name))\nYour thing is due soon')
+    job = sample_job(template)
+    process_job(job.id)
+
+    # A row larger than the limit is still published, alone
+    chunks = [encryption.decrypt(c.args[0][1])['rows'] for c in tasks.save_sms_batch.apply_async.call_args_list]
+    assert [len(chunk) for chunk in chunks] == [1] * 10
+
+
 @pytest.mark.parametrize(
     'template_type, research_mode, expected_function, expected_queue',
     [
@@ -1079,6 +1140,123 @@ def test_save_sms_does_not_send_duplicate_and_does_not_put_in_retry_queue(
     assert not retry.called
 
 
+def _batch_json(template, job, recipients):
+    return {
+        'template': str(template.id),
+        'template_version': template.version,
+        'job': str(job.id),
+        'rows': [
+            {'id': str(uuid4()), 'to': to, 'row_number': row_number, 'personalisation': {}}
+            for row_number, to in enumerate(recipients)
+        ],
+    }
+
+
+def test_save_sms_batch_persists_every_row_and_queues_them(
+    notify_db_session,
+    mocker,
+    sample_user,
+    sample_service,
+    sample_template,
+    sample_job,
+):
+    user = sample_user(mobile_number='6502532222')
+    service = sample_service(user=user, restricted=True)
+    template = sample_template(service=service)
+    job = sample_job(template)
+    mock_queue = mocker.patch('app.celery.tasks.send_notifications_to_queue_in_batches')
+
+    # The last recipient is not a team member of the restricted service.
+    batch = _batch_json(template, job, ['+16502532222', '+16502532222', '+16502532223'])
+
+    # Cleaned by sample_job
+    save_sms_batch(service.id, encryption.encrypt(batch))
+
+    persisted = notify_db_session.session.scalars(
+        select(Notification).where(Notification.job_id == job.id).order_by(Notification.job_row_number)
+    ).all()
+
+    assert [str(notification.id) for notification in persisted] == [row['id'] for row in batch['rows'][:2]]
+    assert all(notification.reply_to_text == template.get_reply_to_text() for notification in persisted)
+
+    queued, research_mode, sender_id = mock_queue.call_args.args
+    assert [notification.id for notification in queued] == [notification.id for notification in persisted]
+    assert not research_mode
+    assert sender_id is None
+
+
+def test_save_email_batch_persists_every_row_and_queues_them(
+    notify_db_session,
+    mocker,
+    sample_template,
+    sample_job,
+):
+    template = sample_template(template_type=EMAIL_TYPE)
+    job = sample_job(template)
+    mock_queue = mocker.patch('app.celery.tasks.send_notifications_to_queue_in_batches')
+    batch = _batch_json(template, job, ['one@example.com', 'two@example.com'])
+
+    # Cleaned by sample_job
+    save_email_batch(template.service_id, encryption.encrypt(batch))
+
+    stmt = select(func.count()).select_from(Notification).where(Notification.job_id == job.id)
+    assert notify_db_session.session.scalar(stmt) == 2
+    assert len(mock_queue.call_args.args[0]) == 2
+
+
+def test_save_sms_batch_should_go_to_retry_queue_if_database_errors(
+    notify_db_session,
+    mocker,
+    sample_template,
+    sample_job,
+):
+    template = sample_template()
+    job = sample_job(template)
+    batch = _batch_json(template, job, ['+16502532222', '+16502532223'])
+    expected_exception = SQLAlchemyError()
+
+    mock_queue = mocker.patch('app.celery.tasks.send_notifications_to_queue_in_batches')
+    mocker.patch('app.celery.tasks.save_sms_batch.retry', side_effect=Retry)
+    mocker.patch(
+        'app.notifications.process_notifications.dao_create_notifications_bulk', side_effect=expected_exception
+    )
+
+    with pytest.raises(Retry):
+        save_sms_batch(template.service_id, encryption.encrypt(batch))
+
+    assert not mock_queue.called
+    tasks.save_sms_batch.retry.assert_called_with(exc=expected_exception, queue='retry-tasks')
+    stmt = select(func.count()).select_from(Notification).where(Notification.job_id == job.id)
+    assert notify_db_session.session.scalar(stmt) == 0
+
+
+def test_save_sms_batch_retries_rows_that_could_not_be_queued(
+    notify_db_session,
+    mocker,
+    sample_template,
+    sample_job,
+):
+    template = sample_template()
+    job = sample_job(template)
+    batch = _batch_json(template, job, ['+16502532222', '+16502532222', '+16502532222'])
+
+    mocker.patch(
+        'app.celery.tasks.send_notifications_to_queue_in_batches',
+        side_effect=lambda notifications, *args: notifications[1:],
+    )
+    mocker.patch('app.celery.tasks.save_sms_batch.retry', side_effect=Retry)
+
+    # Cleaned by sample_job
+    with pytest.raises(Retry):
+        save_sms_batch(template.service_id, encryption.encrypt(batch))
+
+    retry_kwargs = tasks.save_sms_batch.retry.call_args.kwargs
+    assert retry_kwargs['queue'] == 'retry-tasks'
+    service_id, encrypted = retry_kwargs['args']
+    assert service_id == str(template.service_id)
+    assert encryption.decrypt(encrypted) == {**batch, 'rows': batch['rows'][1:]}
+
+
 def test_save_sms_uses_sms_sender_reply_to_text(
     mocker,
     notify_db_session,
@@ -1148,15 +1326,15 @@ def test_should_cancel_job_if_service_is_inactive(
     template = sample_template(service=service)
     job = sample_job(template)
 
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3')
-    mocker.patch('app.celery.tasks.process_row')
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3')
+    mocker.patch('app.celery.tasks.process_rows')
 
     process_job(job.id)
 
     notify_db_session.session.refresh(job)
 
     assert job.job_status == 'cancelled'
-    s3.get_job_from_s3.assert_not_called()
+    s3.get_job_lines_from_s3.assert_not_called()
     tasks.process_row.assert_not_called()
 
 
@@ -1172,9 +1350,44 @@ def test_get_template_class(template_type, expected_class):
     assert get_template_class(template_type) == expected_class
 
 
+@pytest.mark.parametrize('resume_from_row', [-1, 1, 9])
+@pytest.mark.parametrize(
+    'csv_file',
+    [
+        load_example_csv('multiple_sms'),
+        # Quoted values spanning lines, and a blank line, are each one record
+        'phone number,name\n+16502532222,"Jo\nSmith"\n+16502532223,Al\n+16502532224,"Bo,\r\nJr"\n\n'
+        '+16502532225,Cy\n+16502532226,Di\n',
+    ],
+)
+def test_get_job_rows_matches_whole_file_parse(
+    mocker,
+    sample_template,
+    sample_job,
+    resume_from_row,
+    csv_file,
+):
+    mocker.patch('app.celery.tasks.s3.get_job_lines_from_s3', return_value=csv_file.splitlines(keepends=True))
+    mocker.patch('app.celery.tasks.JOB_ROW_CHUNK_SIZE', 3)
+    template = sample_template(content='Hello (( Name))\nYour thing is due soon')
+    job = sample_job(template)
+    utils_template = SMSMessageTemplate(template.__dict__)
+
+    rows = get_job_rows(job, utils_template, resume_from_row)
+
+    expected_rows = RecipientCSV(
+        csv_file, template_type=SMS_TYPE, placeholders=utils_template.placeholder_names
+    ).get_rows()
+    assert [(row.index, row.recipient, dict(row.personalisation)) for row in rows] == [
+        (row.index, row.recipient, dict(row.personalisation)) for row in expected_rows if row.index > resume_from_row
+    ]
+
+
 def test_process_incomplete_job_sms(mocker, notify_db_session, sample_template, sample_job, sample_notification):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    save_sms = mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    save_sms_batch = mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
     template = sample_template()
 
     job = sample_job(
@@ -1197,7 +1410,7 @@ def test_process_incomplete_job_sms(mocker, notify_db_session, sample_template,
     notify_db_session.session.refresh(job)
 
     assert job.job_status == JOB_STATUS_FINISHED
-    assert save_sms.call_count == 8  # There are 10 in the file and we've added two already
+    assert _published_row_count(save_sms_batch) == 8  # There are 10 in the file and we've added two already
 
 
 def test_process_incomplete_job_with_notifications_all_sent(
@@ -1208,8 +1421,10 @@ def test_process_incomplete_job_with_notifications_all_sent(
     sample_job,
     sample_notification,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    mock_save_sms = mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mock_save_sms = mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
 
     template = sample_template()
     job = sample_job(
@@ -1245,8 +1460,10 @@ def test_process_incomplete_jobs_sms(
     sample_job,
     sample_notification,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    mock_save_sms = mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mock_save_sms = mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
 
     template = sample_template()
     job = sample_job(
@@ -1288,7 +1505,7 @@ def test_process_incomplete_jobs_sms(
 
     assert job.job_status == JOB_STATUS_FINISHED
     assert job2.job_status == JOB_STATUS_FINISHED
-    assert mock_save_sms.call_count == 12  # There are 20 in total over 2 jobs we've added 8 already
+    assert _published_row_count(mock_save_sms) == 12  # There are 20 in total over 2 jobs we've added 8 already
 
 
 def test_process_incomplete_jobs_no_notifications_added(
@@ -1297,8 +1514,10 @@ def test_process_incomplete_jobs_no_notifications_added(
     sample_job,
     sample_template,
 ):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    mock_save_sms = mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mock_save_sms = mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
 
     template = sample_template()
     job = sample_job(
@@ -1320,12 +1539,14 @@ def test_process_incomplete_jobs_no_notifications_added(
 
     assert completed_job.job_status == JOB_STATUS_FINISHED
 
-    assert mock_save_sms.call_count == 10  # There are 10 in the csv file
+    assert _published_row_count(mock_save_sms) == 10  # There are 10 in the csv file
 
 
 def test_process_incomplete_jobs(mocker):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    mock_save_sms = mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mock_save_sms = mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
 
     jobs = []
     process_incomplete_jobs(jobs)
@@ -1334,8 +1555,10 @@ def test_process_incomplete_jobs(mocker):
 
 
 def test_process_incomplete_job_no_job_in_database(mocker, fake_uuid):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_sms'))
-    mock_save_sms = mocker.patch('app.celery.tasks.save_sms.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_sms').splitlines()
+    )
+    mock_save_sms = mocker.patch('app.celery.tasks.save_sms_batch.apply_async')
 
     with pytest.raises(expected_exception=Exception):
         process_incomplete_job(fake_uuid)
@@ -1344,8 +1567,10 @@ def test_process_incomplete_job_no_job_in_database(mocker, fake_uuid):
 
 
 def test_process_incomplete_job_email(notify_db_session, mocker, sample_template, sample_job, sample_notification):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_email'))
-    mock_email_saver = mocker.patch('app.celery.tasks.save_email.apply_async')
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_email').splitlines()
+    )
+    mock_email_saver = mocker.patch('app.celery.tasks.save_email_batch.apply_async')
 
     template = sample_template(template_type=EMAIL_TYPE)
     job = sample_job(
@@ -1369,13 +1594,15 @@ def test_process_incomplete_job_email(notify_db_session, mocker, sample_template
     completed_job = notify_db_session.session.scalars(stmt).one()
 
     assert completed_job.job_status == JOB_STATUS_FINISHED
-    assert mock_email_saver.call_count == 8  # There are 10 in the file and we've added two already
+    assert _published_row_count(mock_email_saver) == 8  # There are 10 in the file and we've added two already
 
 
 # Letter functionality is not used.  Decline to fix.
 @pytest.mark.skip(reason='TypeError: expected string or bytes-like object')
 def test_process_incomplete_job_letter(notify_db_session, mocker, sample_template, sample_job, sample_notification):
-    mocker.patch('app.celery.tasks.s3.get_job_from_s3', return_value=load_example_csv('multiple_letter'))
+    mocker.patch(
+        'app.celery.tasks.s3.get_job_lines_from_s3', return_value=load_example_csv('multiple_letter').splitlines()
+    )
     mock_letter_saver = mocker.patch('app.celery.tasks.save_letter.apply_async')
 
     template = sample_template(template_type=LETTER_TYPE)
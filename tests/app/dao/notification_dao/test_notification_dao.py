@@ -4,8 +4,8 @@ from uuid import uuid4
 
 import pytest
 from freezegun import freeze_time
-from sqlalchemy import select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm.exc import NoResultFound
 
 from app.constants import (
@@ -26,13 +26,16 @@ from app.constants import (
     SMS_TYPE,
     STATUS_REASON_UNDELIVERABLE,
 )
+from app import db
 from app.dao.notifications_dao import (
+    _update_notification_status,
     dao_create_notification,
     dao_created_scheduled_notification,
     dao_delete_notification_by_id,
     dao_get_last_notification_added_for_job_id,
     dao_get_scheduled_notifications,
     dao_increment_notification_retry_count,
+    dao_transition_notification_status,
     dao_update_provider_updated_at,
     dao_update_sms_notification_delivery_status,
     dao_timeout_notifications,
@@ -608,6 +611,25 @@ def test_save_notification_no_job_id(
     assert data.get('job_id') is None
 
 
+def test_save_notification_rejects_existing_id_with_different_created_at(
+    notify_db_session,
+    sample_template,
+):
+    # notifications' primary key is (id, created_at), so a redelivered save relies on notification_ids to fail
+    template = sample_template()
+    notification_id = uuid4()
+    dao_create_notification(Notification(**_notification_json(template, id=notification_id)))
+
+    data = _notification_json(template, id=notification_id)
+    data['created_at'] = datetime.utcnow() + timedelta(seconds=1)
+    with pytest.raises(IntegrityError):
+        dao_create_notification(Notification(**data))
+    notify_db_session.session.rollback()
+
+    stmt = select(Notification).where(Notification.id == notification_id)
+    assert len(notify_db_session.session.scalars(stmt).all()) == 1
+
+
 def test_get_notification_for_job(
     sample_template,
     sample_notification,
@@ -792,12 +814,35 @@ def test_dao_timeout_notifications(
     assert notify_db_session.session.get(Notification, delivered.id).status == NOTIFICATION_DELIVERED
     # Cannot be ran in parallel - partial function _timeout_notifications uses < on created_at
     technical_failure_notifications, temporary_failure_notifications = dao_timeout_notifications(1)
+    technical_failure_ids = [x.id for batch in technical_failure_notifications for x in batch]
+    temporary_failure_ids = [x.id for batch in temporary_failure_notifications for x in batch]
 
+    notify_db_session.session.expire_all()
     assert notify_db_session.session.get(Notification, created.id).status == NOTIFICATION_PERMANENT_FAILURE
     assert notify_db_session.session.get(Notification, sending.id).status == NOTIFICATION_TEMPORARY_FAILURE
     assert notify_db_session.session.get(Notification, pending.id).status == NOTIFICATION_TEMPORARY_FAILURE
     assert notify_db_session.session.get(Notification, delivered.id).status == NOTIFICATION_DELIVERED
-    assert len(technical_failure_notifications + temporary_failure_notifications) == 3
+    assert technical_failure_ids == [created.id]
+    assert sorted(temporary_failure_ids) == sorted([sending.id, pending.id])
+
+
+@pytest.mark.serial
+def test_dao_timeout_notifications_updates_in_batches(
+    notify_db_session,
+    sample_template,
+    sample_notification,
+):
+    template = sample_template()
+    with freeze_time(datetime.utcnow() - timedelta(minutes=2)):
+        sending = [sample_notification(template=template, status=NOTIFICATION_SENDING) for _ in range(3)]
+
+    # Cannot be ran in parallel - partial function _timeout_notifications uses < on created_at
+    _, temporary_failure_notifications = dao_timeout_notifications(1, batch_size=2)
+    batches = list(temporary_failure_notifications)
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert sorted(x.id for batch in batches for x in batch) == sorted(x.id for x in sending)
+    assert all(x.status == NOTIFICATION_TEMPORARY_FAILURE for batch in batches for x in batch)
 
 
 @pytest.mark.serial
@@ -819,7 +864,8 @@ def test_dao_timeout_notifications_only_updates_for_older_notifications(
     assert notify_db_session.session.get(Notification, delivered.id).status == NOTIFICATION_DELIVERED
     # Cannot be ran in parallel - partial function _timeout_notifications uses < on created_at
     technical_failure_notifications, temporary_failure_notifications = dao_timeout_notifications(1)
-    assert len(technical_failure_notifications + temporary_failure_notifications) == 0
+    assert list(technical_failure_notifications) == []
+    assert list(temporary_failure_notifications) == []
 
 
 def test_should_return_notifications_excluding_jobs_by_default(
@@ -1476,6 +1522,57 @@ def test_update_notification_status_updates_failure_reason(
     assert updated_notification.status_reason == failure_message
 
 
+def test_dao_transition_notification_status_returns_the_updated_columns(
+    notify_db_session,
+    sample_notification,
+):
+    notification = sample_notification(status=NOTIFICATION_SENDING, callback_url='https://example.com/callback')
+
+    updated = dao_transition_notification_status(notification.id, NOTIFICATION_PERMANENT_FAILURE, 'Unreachable')
+    notify_db_session.session.commit()
+
+    assert updated.id == notification.id
+    assert updated.status == NOTIFICATION_PERMANENT_FAILURE
+    assert updated.status_reason == 'Unreachable'
+    assert updated.service_id == notification.service_id
+    assert updated.callback_url == 'https://example.com/callback'
+    assert updated.updated_at is not None
+
+
+def test_dao_transition_notification_status_returns_none_when_the_transition_is_not_allowed(
+    notify_db_session,
+    sample_notification,
+):
+    notification = sample_notification(status=NOTIFICATION_DELIVERED)
+
+    assert dao_transition_notification_status(notification.id, NOTIFICATION_SENT) is None
+    assert dao_transition_notification_status(uuid4(), NOTIFICATION_SENT) is None
+
+
+def test_update_notification_status_updates_the_status_with_one_statement(
+    notify_db_session,
+    sample_notification,
+):
+    notification = sample_notification(status=NOTIFICATION_SENDING)
+    # Load the notification, as callers have
+    assert notification.status == NOTIFICATION_SENDING
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        updated_notification = _update_notification_status(notification, NOTIFICATION_DELIVERED)
+        assert updated_notification.status == NOTIFICATION_DELIVERED
+        assert updated_notification.updated_at is not None
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE notifications')
+
+
 @pytest.mark.parametrize(
     'next_status',
     [NOTIFICATION_CREATED, NOTIFICATION_DELIVERED, NOTIFICATION_SENDING, NOTIFICATION_PENDING, NOTIFICATION_SENT],
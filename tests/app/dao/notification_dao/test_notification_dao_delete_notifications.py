@@ -4,16 +4,20 @@ from uuid import uuid4
 from flask import current_app
 from freezegun import freeze_time
 import pytest
-from sqlalchemy import select, update
+from sqlalchemy import select, text, update
 
 from app.constants import EMAIL_TYPE, LETTER_TYPE, SMS_TYPE
+from app.dao import notifications_dao
 from app.dao.notifications_dao import (
+    dao_create_notification_partitions,
+    dao_drop_expired_notification_partitions,
     delete_notifications_older_than_retention_by_type,
     insert_update_notification_history,
 )
 from app.models import (
     Notification,
     NotificationHistory,
+    NotificationId,
     RecipientIdentifier,
 )
 from app.va.identifier import IdentifierType
@@ -544,6 +548,39 @@ def test_delete_notifications_returns_sum_correctly(sample_service, sample_templ
     assert ret == 4
 
 
+@pytest.mark.serial
+def test_delete_notifications_archives_once_per_retention_bucket(
+    mocker,
+    notify_db_session,
+    sample_service,
+    sample_template,
+    sample_notification,
+    sample_service_data_retention,
+):
+    archive = mocker.patch(
+        'app.dao.notifications_dao.insert_update_notification_history',
+        wraps=insert_update_notification_history,
+    )
+    notification_ids = []
+    for _ in range(2):
+        template = sample_template(service=sample_service())
+        sample_service_data_retention(service=template.service, notification_type=SMS_TYPE, days_of_retention=3)
+        notification_ids.append(
+            sample_notification(template=template, created_at=datetime.utcnow() - timedelta(days=4)).id
+        )
+        notification_ids.append(
+            sample_notification(template=template, created_at=datetime.utcnow() - timedelta(days=2)).id
+        )
+
+    # Cannot be ran in parallel - _delete_notifications uses < date
+    delete_notifications_older_than_retention_by_type(SMS_TYPE, qry_limit=1)
+
+    # One call for the 3 day bucket shared by both services and one for services on the default retention
+    assert archive.call_count == 2
+    stmt = select(Notification.id).where(Notification.id.in_(notification_ids))
+    assert set(notify_db_session.session.scalars(stmt).all()) == {notification_ids[1], notification_ids[3]}
+
+
 def test_insert_update_notification_history(
     notify_db_session,
     sample_service,
@@ -641,3 +678,70 @@ def test_insert_update_notification_history_updates_history_with_billing_code(
     history = notify_db_session.session.scalar(stmt)
     assert history.billing_code == billing_code
     assert notify_db_session.session.get(NotificationHistory, notification_1.id) is None
+
+
+@pytest.fixture
+def drop_notification_partitions(notify_db_session):
+    names = []
+    yield names
+    for name in names:
+        notify_db_session.session.execute(text(f'DROP TABLE IF EXISTS {name}'))
+    notify_db_session.session.commit()
+
+
+@pytest.mark.serial
+def test_dao_create_notification_partitions_creates_missing_weeks(drop_notification_partitions):
+    with freeze_time('2040-01-04 12:00'):
+        created = dao_create_notification_partitions(weeks_ahead=2)
+        drop_notification_partitions.extend(created)
+
+        assert created == ['notifications_p20400102', 'notifications_p20400109', 'notifications_p20400116']
+        assert dao_create_notification_partitions(weeks_ahead=2) == []
+
+
+@pytest.mark.serial
+def test_dao_create_notification_partitions_skips_weeks_with_default_partition_rows(
+    sample_template,
+    sample_notification,
+    drop_notification_partitions,
+):
+    with freeze_time('2040-01-04 12:00'):
+        # No partition covers this week yet, so the notification lands in notifications_default
+        sample_notification(template=sample_template())
+        created = dao_create_notification_partitions(weeks_ahead=1)
+        drop_notification_partitions.extend(created)
+
+    assert created == ['notifications_p20400109']
+
+
+@pytest.mark.serial
+def test_dao_drop_expired_notification_partitions_archives_and_drops(
+    notify_db_session,
+    mocker,
+    sample_template,
+    sample_notification,
+    drop_notification_partitions,
+):
+    with freeze_time('2040-01-04 12:00'):
+        drop_notification_partitions.extend(dao_create_notification_partitions(weeks_ahead=0))
+        notification = sample_notification(
+            template=sample_template(),
+            recipient_identifiers=[{'id_type': IdentifierType.VA_PROFILE_ID.value, 'id_value': 'foo'}],
+        )
+    notification_id = notification.id
+
+    # Only consider the partition created above so the rest of the test database is left alone
+    partitions = notifications_dao._get_notification_partitions
+    mocker.patch(
+        'app.dao.notifications_dao._get_notification_partitions',
+        side_effect=lambda: [p for p in partitions() if p[0] == 'notifications_p20400102'],
+    )
+    with freeze_time('2040-03-01 12:00'):
+        assert dao_drop_expired_notification_partitions() == ['notifications_p20400102']
+
+    assert notify_db_session.session.get(NotificationHistory, notification_id) is not None
+    stmt = select(RecipientIdentifier).where(RecipientIdentifier.notification_id == notification_id)
+    assert notify_db_session.session.scalars(stmt).all() == []
+    assert notify_db_session.session.get(NotificationId, notification_id) is None
+    stmt = text("SELECT to_regclass('notifications_p20400102')")
+    assert notify_db_session.session.scalar(stmt) is None
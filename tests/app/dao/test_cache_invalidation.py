@@ -0,0 +1,51 @@
+from app import db
+from app.dao.cache_invalidation import (
+    CACHE_VERSION_CHECK_SECONDS,
+    InvalidatedTTLCache,
+    invalidate_after_commit,
+)
+
+
+def test_invalidated_cache_is_cleared_when_the_version_in_redis_changes(notify_api, mocker):
+    get = mocker.patch('app.dao.cache_invalidation.redis_store.get', return_value=b'1')
+    monotonic = mocker.patch('app.dao.cache_invalidation.monotonic', return_value=1000.0)
+    cache = InvalidatedTTLCache('test-versioned', maxsize=8)
+    assert 'key' not in cache
+    cache['key'] = 'value'
+    assert cache['key'] == 'value'
+
+    # The version is only checked once per interval
+    get.return_value = b'2'
+    assert cache['key'] == 'value'
+    assert get.call_count == 1
+
+    monotonic.return_value += CACHE_VERSION_CHECK_SECONDS
+    assert 'key' not in cache
+    assert get.call_count == 2
+    get.assert_called_with('cache-version-test-versioned')
+
+
+def test_invalidate_after_commit_clears_caches_when_the_transaction_commits(notify_db_session, mocker):
+    incr = mocker.patch('app.dao.cache_invalidation.redis_store.incr')
+    cache = InvalidatedTTLCache('test-commit', maxsize=8)
+    cache['key'] = 'value'
+
+    invalidate_after_commit('test-commit')
+    assert 'key' in cache
+
+    db.session.commit()
+    assert 'key' not in cache
+    incr.assert_called_once_with('cache-version-test-commit')
+
+
+def test_invalidate_after_commit_is_discarded_on_rollback(notify_db_session, mocker):
+    incr = mocker.patch('app.dao.cache_invalidation.redis_store.incr')
+    cache = InvalidatedTTLCache('test-rollback', maxsize=8)
+    cache['key'] = 'value'
+
+    invalidate_after_commit('test-rollback')
+    db.session.rollback()
+    db.session.commit()
+
+    assert 'key' in cache
+    incr.assert_not_called()
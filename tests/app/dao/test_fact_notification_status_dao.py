@@ -24,7 +24,6 @@ from app.constants import (
 from app.dao.fact_notification_status_dao import (
     fetch_delivered_notification_stats_by_month,
     fetch_monthly_notification_statuses_per_service,
-    fetch_notification_status_for_day,
     fetch_notification_status_for_service_by_month,
     fetch_notification_status_for_service_for_day,
     fetch_notification_status_for_service_for_today_and_7_previous_days,
@@ -35,7 +34,7 @@ from app.dao.fact_notification_status_dao import (
     get_total_sent_notifications_for_day_and_type,
     update_fact_notification_status,
 )
-from app.models import FactNotificationStatus
+from app.models import FactNotificationStatus, NotificationHistory
 
 
 @pytest.mark.serial
@@ -59,8 +58,7 @@ def test_update_fact_notification_status(
     sample_notification(template=third_template, created_at=local_now - timedelta(days=1))
 
     process_day = local_now
-    data = fetch_notification_status_for_day(process_day=process_day)
-    update_fact_notification_status(data=data, process_day=process_day.date())
+    update_fact_notification_status(process_day=process_day.date())
 
     stmt = select(FactNotificationStatus).order_by(
         FactNotificationStatus.bst_date, FactNotificationStatus.notification_type
@@ -110,8 +108,7 @@ def test_update_fact_notification_status_updates_row(
     sample_notification(template=first_template, status='delivered')
 
     process_day = convert_utc_to_local_timezone(datetime.utcnow())
-    data = fetch_notification_status_for_day(process_day=process_day)
-    update_fact_notification_status(data=data, process_day=process_day.date())
+    update_fact_notification_status(process_day=process_day.date())
 
     stmt = select(FactNotificationStatus).order_by(
         FactNotificationStatus.bst_date, FactNotificationStatus.notification_type
@@ -130,8 +127,7 @@ def test_update_fact_notification_status_updates_row(
 
     sample_notification(template=first_template, status='delivered')
 
-    data = fetch_notification_status_for_day(process_day=process_day)
-    update_fact_notification_status(data=data, process_day=process_day.date())
+    update_fact_notification_status(process_day=process_day.date())
 
     updated_fact_data = notify_db_session.session.scalars(stmt).all()
 
@@ -145,6 +141,107 @@ def test_update_fact_notification_status_updates_row(
         notify_db_session.session.commit()
 
 
+@pytest.mark.serial
+def test_update_fact_notification_status_counts_each_status_reason(
+    notify_db_session,
+    sample_template,
+    sample_notification,
+):
+    template = sample_template()
+    sample_notification(template=template, status='permanent-failure', status_reason='foo')
+    sample_notification(template=template, status='permanent-failure', status_reason='bar')
+    sample_notification(template=template, status='permanent-failure', status_reason='bar')
+    sample_notification(template=template, status='permanent-failure')
+
+    process_day = convert_utc_to_local_timezone(datetime.utcnow())
+    update_fact_notification_status(process_day=process_day.date())
+
+    stmt = select(FactNotificationStatus.status_reason, FactNotificationStatus.notification_count).where(
+        FactNotificationStatus.service_id == template.service_id
+    )
+    try:
+        assert sorted(notify_db_session.session.execute(stmt).all()) == [('', 1), ('bar', 2), ('foo', 1)]
+    finally:
+        stmt = delete(FactNotificationStatus).where(FactNotificationStatus.service_id == template.service_id)
+        notify_db_session.session.execute(stmt)
+        notify_db_session.session.commit()
+
+
+@pytest.mark.serial
+def test_update_fact_notification_status_counts_archived_notifications_once(
+    notify_db_session,
+    sample_template,
+    sample_notification,
+    sample_notification_history,
+):
+    template = sample_template()
+    process_day = convert_utc_to_local_timezone(datetime.utcnow())
+
+    # This notification is being archived, so it is in both tables.
+    archiving = sample_notification(template=template, status=NOTIFICATION_DELIVERED)
+    notify_db_session.session.add(NotificationHistory.from_original(archiving))
+    notify_db_session.session.commit()
+    sample_notification(template=template, status=NOTIFICATION_DELIVERED)
+    sample_notification_history(template=template, status=NOTIFICATION_DELIVERED)
+
+    try:
+        update_fact_notification_status(process_day=process_day.date())
+
+        stmt = select(FactNotificationStatus).where(FactNotificationStatus.template_id == template.id)
+        fact_data = notify_db_session.session.scalars(stmt).all()
+
+        assert len(fact_data) == 1
+        assert fact_data[0].notification_status == NOTIFICATION_DELIVERED
+        assert fact_data[0].notification_count == 3
+    finally:
+        notify_db_session.session.execute(delete(NotificationHistory).where(NotificationHistory.id == archiving.id))
+        notify_db_session.session.execute(
+            delete(FactNotificationStatus).where(FactNotificationStatus.template_id == template.id)
+        )
+        notify_db_session.session.commit()
+
+
+@pytest.mark.serial
+def test_update_fact_notification_status_only_changes_rows_that_differ(
+    notify_db_session,
+    sample_template,
+    sample_notification,
+):
+    template = sample_template()
+    process_day = convert_utc_to_local_timezone(datetime.utcnow()).date()
+    sample_notification(template=template, status=NOTIFICATION_DELIVERED)
+    moving = sample_notification(template=template, status=NOTIFICATION_SENDING)
+    stmt = (
+        select(FactNotificationStatus)
+        .where(FactNotificationStatus.template_id == template.id)
+        .order_by(FactNotificationStatus.notification_status)
+    )
+
+    try:
+        update_fact_notification_status(process_day=process_day)
+        assert [
+            (row.notification_status, row.notification_count) for row in notify_db_session.session.scalars(stmt)
+        ] == [
+            (NOTIFICATION_DELIVERED, 1),
+            (NOTIFICATION_SENDING, 1),
+        ]
+
+        moving.status = NOTIFICATION_DELIVERED
+        notify_db_session.session.commit()
+        update_fact_notification_status(process_day=process_day)
+        notify_db_session.session.expire_all()
+
+        fact_data = notify_db_session.session.scalars(stmt).all()
+        assert [(row.notification_status, row.notification_count) for row in fact_data] == [
+            (NOTIFICATION_DELIVERED, 2),
+        ]
+        assert fact_data[0].updated_at is not None
+    finally:
+        stmt = delete(FactNotificationStatus).where(FactNotificationStatus.template_id == template.id)
+        notify_db_session.session.execute(stmt)
+        notify_db_session.session.commit()
+
+
 def test_fetch_notification_status_for_service_by_month(
     sample_service, sample_template, sample_job, sample_ft_notification_status
 ):
@@ -250,6 +347,7 @@ def test_fetch_notification_status_for_service_for_day(sample_service, sample_te
 
 @freeze_time('1995-10-31T18:00:00')
 def test_fetch_notification_status_for_service_for_today_and_7_previous_days(
+    notify_db_session,
     sample_service,
     sample_template,
     sample_job,
@@ -279,11 +377,20 @@ def test_fetch_notification_status_for_service_for_today_and_7_previous_days(
     # too early, shouldn't be included
     sample_notification(template=service.templates[0], created_at=datetime(1995, 10, 30, 12, 0, 0), status='delivered')
 
+    # This is the work of the update-fact-notification-status-for-today task.
+    update_fact_notification_status(process_day=date(1995, 10, 31))
+
     results = sorted(
         fetch_notification_status_for_service_for_today_and_7_previous_days(service.id),
         key=lambda x: (x.notification_type, x.status),
     )
 
+    stmt = delete(FactNotificationStatus).where(
+        FactNotificationStatus.bst_date == date(1995, 10, 31), FactNotificationStatus.service_id == service.id
+    )
+    notify_db_session.session.execute(stmt)
+    notify_db_session.session.commit()
+
     assert len(results) == 4
 
     assert results[0].notification_type == EMAIL_TYPE
@@ -306,7 +413,7 @@ def test_fetch_notification_status_for_service_for_today_and_7_previous_days(
 @freeze_time('1993-10-31T18:00:00')
 # This test assumes the local timezone is EST
 def test_fetch_notification_status_by_template_for_service_for_today_and_7_previous_days(
-    sample_service, sample_template, sample_job, sample_notification, sample_ft_notification_status
+    notify_db_session, sample_service, sample_template, sample_job, sample_notification, sample_ft_notification_status
 ):
     service = sample_service()
 
@@ -334,8 +441,17 @@ def test_fetch_notification_status_by_template_for_service_for_today_and_7_previ
     # too early, shouldn't be included
     sample_notification(template=service.templates[0], created_at=datetime(1993, 10, 30, 12, 0, 0), status='delivered')
 
+    # This is the work of the update-fact-notification-status-for-today task.
+    update_fact_notification_status(process_day=date(1993, 10, 31))
+
     results = fetch_notification_status_for_service_for_today_and_7_previous_days(service.id, by_template=True)
 
+    stmt = delete(FactNotificationStatus).where(
+        FactNotificationStatus.bst_date == date(1993, 10, 31), FactNotificationStatus.service_id == service.id
+    )
+    notify_db_session.session.execute(stmt)
+    notify_db_session.session.commit()
+
     assert [
         (email_template.name, False, mock.ANY, EMAIL_TYPE, 'delivered', 4),
         (sms_template.name, False, mock.ANY, SMS_TYPE, 'created', 2),
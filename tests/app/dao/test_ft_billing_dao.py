@@ -23,6 +23,7 @@ from app.constants import (
     NOTIFICATION_TEMPORARY_FAILURE,
     SMS_TYPE,
 )
+from app.dao import fact_billing_dao
 from app.dao.fact_billing_dao import (
     delete_billing_data_for_service_for_day,
     fetch_billing_data_for_day,
@@ -30,6 +31,7 @@ from app.dao.fact_billing_dao import (
     fetch_monthly_billing_for_year,
     fetch_sms_free_allowance_remainder,
     fetch_nightly_billing_counts,
+    RateIndex,
     get_rate,
     get_rates_for_billing,
 )
@@ -458,8 +460,28 @@ def test_get_rates_for_billing(sample_rate, sample_letter_rate):
     sample_letter_rate(start_date=datetime.utcnow(), rate=0.33, post_class='second')
     non_letter_rates, letter_rates = get_rates_for_billing()
 
-    assert len(non_letter_rates) == 3
-    assert len(letter_rates) == 2
+    assert non_letter_rates.get(EMAIL_TYPE, datetime.utcnow()) == 33
+    assert non_letter_rates.get(SMS_TYPE, datetime.utcnow()) == 22
+    assert letter_rates.get((True, 1, 'first'), datetime.utcnow()) == Decimal('0.66')
+    assert letter_rates.get((True, 1, 'second'), datetime.utcnow()) == Decimal('0.33')
+
+
+def test_rate_index_returns_rate_in_effect(sample_rate):
+    rates = RateIndex.for_non_letter_rates(
+        [
+            sample_rate(start_date=datetime(2019, 4, 1), value=0.3, notification_type=SMS_TYPE),
+            sample_rate(start_date=datetime(2017, 4, 1), value=0.1, notification_type=SMS_TYPE),
+            sample_rate(start_date=datetime(2018, 4, 1), value=0.2, notification_type=SMS_TYPE),
+        ]
+    )
+
+    assert rates.get(SMS_TYPE, datetime(2017, 4, 1)) == 0.1
+    assert rates.get(SMS_TYPE, datetime(2018, 12, 25)) == 0.2
+    assert rates.get(SMS_TYPE, datetime(2020, 1, 1)) == 0.3
+    with pytest.raises(LookupError):
+        rates.get(SMS_TYPE, datetime(2017, 3, 31))
+    with pytest.raises(LookupError):
+        rates.get(EMAIL_TYPE, datetime(2020, 1, 1))
 
 
 @freeze_time('2017-06-01 12:00')
@@ -552,6 +574,7 @@ def test_fetch_monthly_billing_for_year_adds_data_for_today(
     sample_template,
     sample_notification,
     sample_ft_billing,
+    mocker,
 ):
     service = sample_service()
     template = sample_template(service=service, template_type=EMAIL_TYPE)
@@ -568,9 +591,12 @@ def test_fetch_monthly_billing_for_year_adds_data_for_today(
     stmt = select(func.count()).select_from(FactBilling).where(FactBilling.service_id == service.id)
 
     assert notify_db_session.session.scalar(stmt) == 31
+    get_rates = mocker.spy(fact_billing_dao, 'get_rates_for_billing')
     results = fetch_monthly_billing_for_year(service.id, 2018)
     assert len(results) == 2
     assert notify_db_session.session.scalar(stmt) == 32
+    # The rates are loaded once for yesterday and today
+    assert get_rates.call_count == 1
 
 
 # This test assumes the local timezone is EST
@@ -195,3 +195,14 @@ def test_archive_letter_contact_does_dissociates_template_defaults_before_archiv
     assert associated_template_1.reply_to is None
     assert associated_template_2.reply_to is None
     assert template_default.archived is True
+
+
+def test_archive_letter_contact_invalidates_templates(sample_service, mocker):
+    incr = mocker.patch('app.dao.cache_invalidation.redis_store.incr')
+    service = sample_service()
+    letter_contact = create_letter_contact(service=service, contact_block='Edinburgh, ED1 1AA')
+    incr.reset_mock()
+
+    archive_letter_contact(service.id, letter_contact.id)
+
+    incr.assert_called_once_with('cache-version-templates')
@@ -1,3 +1,4 @@
+from dataclasses import FrozenInstanceError
 from datetime import datetime
 from typing import Any, Callable, Literal
 from uuid import UUID, uuid4
@@ -1021,6 +1022,43 @@ class TestDAOGetTemplateById:
 
         assert result1.id == result2.id
 
+    def test_dao_get_template_by_id_does_not_cache_missing_versions(
+        self,
+        notify_db_session: SQLAlchemy,
+        sample_template: Callable[..., Any],
+        mocker: MockerFixture,
+    ):
+        template = sample_template()
+        db_spy = mocker.spy(notify_db_session.session, 'scalars')
+
+        assert dao_get_template_by_id(template.id, version=2) is None
+
+        template.content = 'Updated content'
+        dao_update_template(template)
+        db_spy.reset_mock()
+
+        result = dao_get_template_by_id(template.id, version=2)
+        assert result.content == 'Updated content'
+        assert db_spy.call_count == 1
+
+    def test_dao_get_template_by_id_cached_version_is_refreshed_when_template_is_redacted(
+        self,
+        notify_db_session: SQLAlchemy,
+        sample_template: Callable[..., Any],
+        mocker: MockerFixture,
+    ):
+        mocker.patch('app.dao.cache_invalidation.redis_store.incr')
+        template = sample_template()
+
+        result = dao_get_template_by_id(template.id, version=1)
+        assert not result.redact_personalisation
+        with pytest.raises(FrozenInstanceError):
+            result.content = 'Changed content'
+
+        dao_redact_template(template, template.created_by_id)
+
+        assert dao_get_template_by_id(template.id, version=1).redact_personalisation
+
 
 class TestDAOGetLatestTemplateHistoryByIdAndServiceId:
     def test_returns_current_version_history_row(
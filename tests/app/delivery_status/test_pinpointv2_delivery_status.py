@@ -75,7 +75,7 @@ class TestPinpointV2DeliveryStatus:
 
     @freeze_time('2025-08-07 10:30:00')
     def test_post_delivery_status_no_records(self, client, mocker):
-        mocker.patch('app.delivery_status.rest.process_pinpoint_v2_receipt_results.apply_async')
+        mocker.patch('app.delivery_status.rest.process_pinpoint_v2_receipt_results_batch.apply_async')
         mocker.patch('app.delivery_status.rest.get_notification_platform_status')
 
         request_payload = {'records': [], 'requestId': 'test-request-123'}
@@ -92,7 +92,9 @@ class TestPinpointV2DeliveryStatus:
     def test_post_delivery_status_multiple_records(self, client, mocker, pinpoint_sms_voice_v2_data):
         """Test the happy path with expected PinpointSMSVoiceV2 data from firehose"""
 
-        mock_celery_task = mocker.patch('app.delivery_status.rest.process_pinpoint_v2_receipt_results.apply_async')
+        mock_celery_task = mocker.patch(
+            'app.delivery_status.rest.process_pinpoint_v2_receipt_results_batch.apply_async'
+        )
 
         mocker.patch.dict('os.environ', {'PINPOINT_SMS_VOICE_V2': 'True'})
 
@@ -130,15 +132,34 @@ class TestPinpointV2DeliveryStatus:
         assert response.status_code == 200
         assert response.json == {'requestId': 'test-request-456', 'timestamp': 1754562600000}
 
-        assert mock_celery_task.call_count == 2
+        # The whole request is processed by one task
+        mock_celery_task.assert_called_once()
+        assert mock_celery_task.call_args[0][0] == [
+            [
+                (expected_record_1, 1722427200000),
+                (expected_record_2, 1722427260000),
+            ]
+        ]
 
-        first_call_args = mock_celery_task.call_args_list[0][0][0]
-        assert first_call_args[0] == expected_record_1
-        assert first_call_args[1] == 1722427200000
+    @freeze_time('2025-08-07 10:30:00')
+    def test_post_delivery_status_publishes_fixed_size_batches(self, client, mocker, pinpoint_sms_voice_v2_data):
+        mock_celery_task = mocker.patch(
+            'app.delivery_status.rest.process_pinpoint_v2_receipt_results_batch.apply_async'
+        )
+        mocker.patch('app.delivery_status.rest.RECEIPT_BATCH_SIZE', 1)
+        mocker.patch.dict('os.environ', {'PINPOINT_SMS_VOICE_V2': 'True'})
 
-        second_call_args = mock_celery_task.call_args_list[1][0][0]
-        assert second_call_args[0] == expected_record_2
-        assert second_call_args[1] == 1722427260000
+        response = client.post(
+            url_for('pinpoint_v2.handler'),
+            json=pinpoint_sms_voice_v2_data['sns_payload'],
+            headers=[('X-Amz-Firehose-Access-Key', 'dev')],
+        )
+
+        assert response.status_code == 200
+        assert [call.args[0][0][0][0].reference for call in mock_celery_task.call_args_list] == [
+            'test-message-id-123',
+            'test-message-id-456',
+        ]
 
     @freeze_time('2025-08-07 10:30:00')
     def test_post_delivery_status_with_validation_errors(self, client, mocker):
@@ -146,7 +167,9 @@ class TestPinpointV2DeliveryStatus:
 
         mocker.patch.dict('os.environ', {'PINPOINT_SMS_VOICE_V2': 'True'})
 
-        mock_celery_task = mocker.patch('app.delivery_status.rest.process_pinpoint_v2_receipt_results.apply_async')
+        mock_celery_task = mocker.patch(
+            'app.delivery_status.rest.process_pinpoint_v2_receipt_results_batch.apply_async'
+        )
         mock_logger = mocker.patch('app.delivery_status.rest.current_app.logger')
 
         # Create a mix of valid and invalid records
@@ -234,7 +257,12 @@ class TestPinpointV2DeliveryStatus:
         assert response.json == {'requestId': 'test-request-789', 'timestamp': 1754562600000}
 
         # Should have processed 2 valid records, skipped 1 invalid
-        assert mock_celery_task.call_count == 2
+        mock_celery_task.assert_called_once()
+        receipts = mock_celery_task.call_args[0][0][0]
+        assert [sms_status_record.reference for sms_status_record, _ in receipts] == [
+            'test-message-id-123',
+            'test-message-id-789',
+        ]
 
         # Check that error was logged with unknown messageId
         assert mock_logger.error.called_once()
@@ -248,7 +276,9 @@ class TestPinpointV2DeliveryStatus:
     def test_post_delivery_status_with_decoding_errors(self, client, mocker):
         """Test that records with decoding errors are skipped and logged"""
 
-        mock_celery_task = mocker.patch('app.delivery_status.rest.process_pinpoint_v2_receipt_results.apply_async')
+        mock_celery_task = mocker.patch(
+            'app.delivery_status.rest.process_pinpoint_v2_receipt_results_batch.apply_async'
+        )
         mock_get_notification_platform_status = mocker.patch(
             'app.delivery_status.rest.get_notification_platform_status'
         )
@@ -291,8 +321,8 @@ class TestPinpointV2DeliveryStatus:
         assert error_calls[2][0][1] == {'data': base64.b64encode(b'invalid json').decode('utf-8')}
         assert 'Expecting value' in str(error_calls[2][0][2])
 
-        assert mock_celery_task.not_called()
-        assert mock_get_notification_platform_status.not_called()
+        mock_celery_task.assert_not_called()
+        mock_get_notification_platform_status.assert_not_called()
 
     @freeze_time('2025-08-07 10:30:00')
     def test_post_delivery_status_no_auth(self, client, mocker, pinpoint_sms_voice_v2_data):
@@ -341,7 +371,9 @@ class TestPinpointV2DeliveryStatus:
 
         mocker.patch.dict('os.environ', {'PINPOINT_SMS_VOICE_V2': 'True'})
 
-        mock_celery_task = mocker.patch('app.delivery_status.rest.process_pinpoint_v2_receipt_results.apply_async')
+        mock_celery_task = mocker.patch(
+            'app.delivery_status.rest.process_pinpoint_v2_receipt_results_batch.apply_async'
+        )
         mock_celery_task.side_effect = CeleryError('Celery is unavailable')
 
         mock_logger = mocker.patch('app.delivery_status.rest.current_app.logger')
@@ -360,6 +392,6 @@ class TestPinpointV2DeliveryStatus:
 
         assert mock_celery_task.called_once()
 
-        assert mock_logger.error.called_once_with(
-            'Celery unavailable for record: %s', pinpoint_sms_voice_v2_data['sns_payload']['records'][0]
+        mock_logger.error.assert_called_once_with(
+            'Celery unavailable for %s records of request: %s', 1, 'test-request-celery-error'
         )
@@ -19,6 +19,7 @@ from app.celery.lookup_va_profile_id_task import lookup_va_profile_id
 from app.celery.provider_tasks import deliver_email, deliver_sms
 from app.constants import (
     EMAIL_TYPE,
+    KEY_TYPE_NORMAL,
     LETTER_TYPE,
     NOTIFICATION_CREATED,
     SMS_TYPE,
@@ -33,10 +34,13 @@ from app.models import (
 from app.notifications.process_notifications import (
     check_placeholders,
     create_content_for_notification,
+    get_recipient_columns,
     persist_notification,
+    persist_notifications_bulk,
     persist_scheduled_notification,
     send_notification_to_queue,
     send_notification_to_queue_delayed,
+    send_notifications_to_queue_in_batches,
     send_to_queue_for_recipient_info_based_on_recipient_identifier,
     simulated_recipient,
 )
@@ -735,6 +739,137 @@ def test_persist_notification_persists_recipient_identifiers(
         notify_db_session.session.commit()
 
 
+def test_persist_notifications_bulk_persists_every_row_with_derived_values(
+    notify_db_session,
+    sample_api_key,
+    sample_template,
+):
+    template = sample_template()
+    api_key = sample_api_key(template.service)
+    recipients = [
+        {'recipient': '+16502532222', 'personalisation': {'name': 'Jo'}, 'client_reference': 'ref-0'},
+        {'recipient': '+79587714230', 'personalisation': None},
+        {'recipient': '+16502532223', 'personalisation': None, 'simulated': True},
+        {
+            'recipient': None,
+            'personalisation': None,
+            'recipient_identifier': {'id_type': IdentifierType.VA_PROFILE_ID.value, 'id_value': 'some va profile id'},
+        },
+    ]
+
+    # Cleaned by the template cleanup
+    notifications = persist_notifications_bulk(
+        template_id=template.id,
+        template_version=template.version,
+        service_id=template.service.id,
+        notification_type=SMS_TYPE,
+        api_key_id=api_key.id,
+        key_type=api_key.key_type,
+        recipients=recipients,
+    )
+
+    assert len(notifications) == 4
+    notify_db_session.session.expire_all()
+
+    try:
+        persisted = notify_db_session.session.get(Notification, notifications[0].id)
+        assert persisted.normalised_to == '+16502532222'
+        assert persisted.client_reference == 'ref-0'
+        assert persisted.personalisation == {'name': 'Jo'}
+        assert persisted.status == NOTIFICATION_CREATED
+        assert persisted.rate_multiplier == 1
+
+        international = notify_db_session.session.get(Notification, notifications[1].id)
+        assert international.international
+        assert international.phone_prefix == '7'
+
+        # Simulated notifications are returned but not persisted.
+        assert notify_db_session.session.get(Notification, notifications[2].id) is None
+
+        with_identifier = notify_db_session.session.get(Notification, notifications[3].id)
+        assert with_identifier.recipient_identifiers[IdentifierType.VA_PROFILE_ID.value].id_value == (
+            'some va profile id'
+        )
+    finally:
+        stmt = delete(RecipientIdentifier).where(RecipientIdentifier.notification_id == notifications[3].id)
+        notify_db_session.session.execute(stmt)
+        notify_db_session.session.commit()
+
+
+def test_persist_notifications_bulk_persists_job_rows_across_insert_chunks(
+    notify_db_session,
+    mocker,
+    sample_job,
+    sample_template,
+):
+    template = sample_template(template_type=EMAIL_TYPE)
+    job = sample_job(template)
+    mocker.patch('app.dao.notifications_dao.BULK_INSERT_CHUNK_SIZE', 2)
+    recipients = [
+        {'recipient': f'Row.{row}@Example.com', 'personalisation': None, 'job_row_number': row} for row in range(5)
+    ]
+
+    # Cleaned by the job cleanup
+    persist_notifications_bulk(
+        template_id=template.id,
+        template_version=template.version,
+        service_id=template.service.id,
+        notification_type=EMAIL_TYPE,
+        api_key_id=None,
+        key_type=KEY_TYPE_NORMAL,
+        recipients=recipients,
+        job_id=job.id,
+        created_by_id=job.created_by_id,
+    )
+
+    persisted = notify_db_session.session.scalars(
+        select(Notification).where(Notification.job_id == job.id).order_by(Notification.job_row_number)
+    ).all()
+
+    assert [notification.job_row_number for notification in persisted] == list(range(5))
+    assert all(notification.created_by_id == job.created_by_id for notification in persisted)
+    assert persisted[3].normalised_to == 'row.3@example.com'
+
+
+@pytest.mark.parametrize(
+    'notification_type, recipient, expected',
+    [
+        (
+            SMS_TYPE,
+            '+16502532222',
+            {'normalised_to': '+16502532222', 'international': False, 'phone_prefix': '1', 'rate_multiplier': 1},
+        ),
+        (EMAIL_TYPE, 'Someone@Example.com', {'normalised_to': 'someone@example.com'}),
+        (LETTER_TYPE, 'some address', {}),
+    ],
+)
+def test_get_recipient_columns(notification_type, recipient, expected):
+    assert get_recipient_columns(notification_type, recipient) == expected
+
+
+@mock_aws
+def test_send_notifications_to_queue_in_batches_publishes_every_notification(
+    client, mock_sqs, mocker, sample_notification
+) -> None:
+    sqs_client, q_url = mock_sqs
+    mocker.patch('app.notifications.process_notifications._get_delivery_task', return_value=(deliver_sms, 'test_queue'))
+    notifications = [sample_notification() for _ in range(12)]
+
+    failed = send_notifications_to_queue_in_batches(notifications, False)
+
+    assert failed == []
+    task_args = []
+    while messages := sqs_client.receive_message(QueueUrl=q_url, MaxNumberOfMessages=10).get('Messages'):
+        for message in messages:
+            message_body = json.loads(base64.b64decode(message.get('Body')).decode('utf-8'))
+            task_body = json.loads(base64.b64decode(message_body.get('body')).decode('utf-8'))
+            assert task_body.get('task') == 'deliver_sms'
+            task_args.append(task_body.get('args'))
+            sqs_client.delete_message(QueueUrl=q_url, ReceiptHandle=message['ReceiptHandle'])
+
+    assert sorted(task_args) == sorted([str(n.id), None] for n in notifications)
+
+
 def test_persist_notification_should_not_persist_recipient_identifier_is_none(
     notify_db_session,
     sample_api_key,
@@ -8,10 +8,14 @@ from flask import current_app
 
 from notifications_utils.recipients import InvalidPhoneError
 
-import app
 from app.constants import EMAIL_TYPE, LETTER_TYPE, SERVICE_PERMISSION_TYPES, SMS_TYPE
 
 from app.notifications.validators import (
+    LIMIT_DAILY_COUNT_MISSING,
+    LIMIT_DAILY_EXCEEDED,
+    LIMIT_OK,
+    LIMIT_RATE_EXCEEDED,
+    check_rate_limiting,
     check_service_over_daily_message_limit,
     check_template_is_for_notification_type,
     check_template_is_active,
@@ -36,8 +40,7 @@ from tests.app.db import (
 def enable_redis(notify_api, mocker):
     with set_config(notify_api, 'REDIS_ENABLED', True):
         with set_config(notify_api, 'API_MESSAGE_LIMIT_ENABLED', True):
-            mocker.patch('app.notifications.validators.redis_store.get', return_value=1)
-            mocker.patch('app.notifications.validators.services_dao.fetch_todays_total_message_count', return_value=1)
+            mocker.patch('app.notifications.validators._service_limits_script', return_value=[LIMIT_OK, 1])
             yield
 
 
@@ -51,33 +54,44 @@ class TestCheckServiceDailyLimit:
         mocker,
     ):
         service = sample_service()
-
-        # override the value set in the fixture
-        mocker.patch('app.notifications.validators.redis_store.get', return_value=None)
-        mock_set = mocker.patch('app.notifications.validators.redis_store.set')
-        mock_incr = mocker.patch('app.notifications.validators.redis_store.incr')
+        mock_script = mocker.patch('app.notifications.validators._service_limits_script', return_value=[LIMIT_OK, 0])
 
         check_service_over_daily_message_limit(key_type, service)
 
         # The message limit is only enforced when the key type is not 'test' and
         # API_MESSAGE_LIMIT_ENABLED and REDIS_ENABLED are True.
         if key_type == 'test':
-            mock_set.assert_not_called()
-            mock_incr.assert_not_called()
+            mock_script.assert_not_called()
         else:
-            mock_set.assert_called_once_with(str(service.id) + '-2025-05-04-count', 1, ex=3600)
-            mock_incr.assert_called_once_with(str(service.id) + '-2025-05-04-count')
+            mock_script.assert_called_once()
+            keys = mock_script.call_args.kwargs['keys']
+            args = mock_script.call_args.kwargs['args']
+            assert keys[1] == str(service.id) + '-2025-05-04-count'
+            # the rate limit is not checked, and the request counts once against the daily limit
+            assert args[2] == -1
+            assert args[4:8] == [service.message_limit, 1, 3600, -1]
 
     @staticmethod
-    @freeze_time('2025-05-04 11:11:11')
-    def test_check_service_message_limit_increments_cache_count(sample_service, mocker):
+    def test_check_service_message_limit_seeds_a_missing_count_from_the_database(sample_service, mocker):
         service = sample_service()
-        mock_incr = mocker.patch('app.notifications.validators.redis_store.incr')
+        mock_script = mocker.patch(
+            'app.notifications.validators._service_limits_script',
+            side_effect=[[LIMIT_DAILY_COUNT_MISSING, 0], [LIMIT_OK, 5]],
+        )
+        mock_fetch = mocker.patch('app.notifications.validators.fetch_todays_total_message_count', return_value=5)
 
-        # Cleaned by the template cleanup
         check_service_over_daily_message_limit('normal', service)
 
-        mock_incr.assert_called_once_with(str(service.id) + '-2025-05-04-count')
+        mock_fetch.assert_called_once_with(service.id)
+        assert [call.kwargs['args'][7] for call in mock_script.call_args_list] == [-1, 5]
+
+    @staticmethod
+    def test_check_service_message_limit_does_not_query_an_existing_count(sample_service, mocker):
+        mock_fetch = mocker.patch('app.notifications.validators.fetch_todays_total_message_count')
+
+        check_service_over_daily_message_limit('normal', sample_service())
+
+        mock_fetch.assert_not_called()
 
     @staticmethod
     @pytest.mark.parametrize(
@@ -94,9 +108,9 @@ class TestCheckServiceDailyLimit:
     ) -> None:
         with set_config(notify_api, 'REDIS_ENABLED', redis_enabled):
             with set_config(notify_api, 'API_MESSAGE_LIMIT_ENABLED', api_limit_enabled):
-                mock_get = mocker.patch('app.notifications.validators.redis_store.get')
+                mock_script = mocker.patch('app.notifications.validators._service_limits_script')
                 check_service_over_daily_message_limit('normal', sample_service())
-                assert mock_get.not_called()
+                mock_script.assert_not_called()
 
     @staticmethod
     @freeze_time('2025-05-04 11:11:11')
@@ -105,6 +119,7 @@ class TestCheckServiceDailyLimit:
         sample_service,
         mocker,
     ):
+        mocker.patch('app.notifications.validators._service_limits_script', return_value=[LIMIT_DAILY_EXCEEDED, 1])
         mock_logger = mocker.patch('app.notifications.validators.current_app.logger.info')
 
         with pytest.raises(TooManyRequestsError) as e:
@@ -114,6 +129,29 @@ class TestCheckServiceDailyLimit:
         assert e.value.message == 'Exceeded send limits (1) for today'
         assert mock_logger.call_count == 1
 
+    @staticmethod
+    def test_check_service_message_limit_admits_request_if_redis_fails(sample_service, mocker):
+        mocker.patch('app.notifications.validators._service_limits_script', side_effect=ConnectionError)
+        mock_logger = mocker.patch('app.notifications.validators.current_app.logger.exception')
+
+        check_service_over_daily_message_limit('normal', sample_service(message_limit=1))
+
+        mock_logger.assert_called_once()
+
+
+def test_check_rate_limiting_checks_both_limits_in_one_call(notify_api, sample_api_key, mocker):
+    api_key = sample_api_key()
+    service = api_key.service
+    mock_script = mocker.patch('app.notifications.validators._service_limits_script', return_value=[LIMIT_OK, 1])
+
+    with set_config(notify_api, 'API_RATE_LIMIT_ENABLED', True):
+        check_rate_limiting(service, api_key, notification_count=3)
+
+    mock_script.assert_called_once()
+    args = mock_script.call_args.kwargs['args']
+    assert args[2] == service.rate_limit
+    assert args[4:6] == [service.message_limit, 3]
+
 
 @pytest.mark.parametrize('template_type, notification_type', [(EMAIL_TYPE, EMAIL_TYPE), (SMS_TYPE, SMS_TYPE)])
 def test_check_template_is_for_notification_type_pass(template_type, notification_type):
@@ -258,8 +296,9 @@ def test_that_when_exceed_rate_limit_request_fails(
         else:
             api_key_type = key_type
 
-        mocker.patch('app.redis_store.exceeded_rate_limit', return_value=True)
-        mocker.patch('app.notifications.validators.services_dao')
+        mock_script = mocker.patch(
+            'app.notifications.validators._service_limits_script', return_value=[LIMIT_RATE_EXCEEDED, 0]
+        )
 
         service = sample_service()
         service.restricted = True
@@ -268,9 +307,8 @@ def test_that_when_exceed_rate_limit_request_fails(
         with pytest.raises(RateLimitError) as e:
             check_service_over_api_rate_limit(service, api_key)
 
-        assert app.redis_store.exceeded_rate_limit.called_with(
-            '{}-{}'.format(str(service.id), api_key.key_type), service.rate_limit, 60
-        )
+        assert mock_script.call_args.kwargs['keys'][0] == '{}-{}'.format(str(service.id), api_key.key_type)
+        assert mock_script.call_args.kwargs['args'][1:3] == [60, service.rate_limit]
         assert e.value.status_code == 429
         assert e.value.message == 'Exceeded rate limit for key type {} of {} requests per {} seconds'.format(
             key_type.upper(), service.rate_limit, 60
@@ -284,17 +322,17 @@ def test_that_when_not_exceeded_rate_limit_request_succeeds(
     mocker,
 ):
     with freeze_time('2016-01-01 12:00:00.000000'):
-        mocker.patch('app.redis_store.exceeded_rate_limit', return_value=False)
-        mocker.patch('app.notifications.validators.services_dao')
+        current_app.config['API_RATE_LIMIT_ENABLED'] = True
+        mock_script = mocker.patch('app.notifications.validators._service_limits_script', return_value=[LIMIT_OK, 0])
 
         service = sample_service()
         service.restricted = True
         api_key = sample_api_key(service)
 
         check_service_over_api_rate_limit(service, api_key)
-        assert app.redis_store.exceeded_rate_limit.called_with(
-            '{}-{}'.format(str(service.id), api_key.key_type), 3000, 60
-        )
+        assert mock_script.call_args.kwargs['args'][1:3] == [60, service.rate_limit]
+        # the daily limit is not checked
+        assert mock_script.call_args.kwargs['args'][4] == -1
 
 
 def test_should_not_rate_limit_if_limiting_is_disabled(
@@ -306,13 +344,12 @@ def test_should_not_rate_limit_if_limiting_is_disabled(
         api_key = sample_api_key()
         service = api_key.service
 
-        mocker.patch('app.redis_store.exceeded_rate_limit', return_value=False)
-        mocker.patch('app.notifications.validators.services_dao')
+        mock_script = mocker.patch('app.notifications.validators._service_limits_script')
 
         service.restricted = True
 
         check_service_over_api_rate_limit(service, api_key)
-        assert not app.redis_store.exceeded_rate_limit.called
+        mock_script.assert_not_called()
 
 
 @pytest.mark.parametrize('key_type', ['test', 'normal'])
@@ -444,6 +481,10 @@ def test_check_reply_to_sms_type(
 
 
 class TestSmsSenderRateLimit:
+    @pytest.fixture(autouse=True)
+    def clear_leased_tokens(self, mocker):
+        mocker.patch.dict('app.notifications.validators._sms_sender_tokens', clear=True)
+
     def test_that_when_sms_sender_rate_exceed_rate_limit_request_fails(
         self,
         sample_service,
@@ -461,21 +502,19 @@ class TestSmsSenderRateLimit:
                 id='some-id', rate_limit=3000, rate_limit_interval=60, sms_sender='+18888888888'
             )
 
-            should_throttle = mocker.patch(
-                'app.notifications.validators.redis_store.should_throttle', return_value=True
-            )
-            mocker.patch('app.notifications.validators.services_dao')
-            mocker.patch('app.notifications.validators.dao_get_service_sms_sender_by_id', return_value=sms_sender)
-
-            service.restricted = True
+            lease = mocker.patch('app.notifications.validators._sms_sender_lease_script', return_value=[0, 400_000_000])
 
             with pytest.raises(RateLimitError) as e:
-                check_sms_sender_over_rate_limit(service, sms_sender)
+                check_sms_sender_over_rate_limit(service.id, sms_sender)
 
-            should_throttle.assert_called_once_with(sms_sender.sms_sender, service.rate_limit, 60)
+            assert lease.call_args.kwargs['keys'] == ['sms-sender-slots-+18888888888']
+            # 20ms per slot over a 60 second window, leasing 10 at a time
+            assert lease.call_args.kwargs['args'][1:5] == [20_000, 60_000_000, 10, 300_000_000]
             assert e.value.status_code == 429
             assert e.value.message == (f'Exceeded rate limit of {sms_sender.rate_limit} requests per 60 seconds')
             assert e.value.fields == []
+            assert e.value.retry_after == 400
+            assert not e.value.slot_reserved
 
     def test_that_when_not_exceeded_sms_sender_rate_limit_request_succeeds(self, sample_service, mocker):
         from app.notifications.validators import check_sms_sender_over_rate_limit
@@ -489,16 +528,51 @@ class TestSmsSenderRateLimit:
                 id='some-id', sms_sender='+11111111111', rate_limit=10, rate_limit_interval=60
             )
 
-            should_throttle = mocker.patch(
-                'app.notifications.validators.redis_store.should_throttle', return_value=False
-            )
-            mocker.patch('app.notifications.validators.services_dao')
-            mocker.patch('app.notifications.validators.dao_get_service_sms_sender_by_id', return_value=sms_sender)
+            lease = mocker.patch('app.notifications.validators._sms_sender_lease_script', return_value=[1, 0])
+
+            check_sms_sender_over_rate_limit(service.id, sms_sender)
+            assert lease.call_args.kwargs['args'][1:4] == [6_000_000, 60_000_000, 10]
+
+    def test_sms_sender_uses_leased_tokens_before_asking_redis(self, sample_service, mocker):
+        from app.notifications.validators import check_sms_sender_over_rate_limit
+
+        MockServiceSmsSender = namedtuple('ServiceSmsSender', ['id', 'sms_sender', 'rate_limit', 'rate_limit_interval'])
+        sms_sender = MockServiceSmsSender(id='some-id', sms_sender='+11111111111', rate_limit=3, rate_limit_interval=60)
+        lease = mocker.patch('app.notifications.validators._sms_sender_lease_script', return_value=[3, 0])
+
+        for _ in range(3):
+            check_sms_sender_over_rate_limit(sample_service().id, sms_sender)
+        assert lease.call_count == 1
+        assert lease.call_args.kwargs['args'][3] == 3
+
+        check_sms_sender_over_rate_limit(sample_service().id, sms_sender)
+        assert lease.call_count == 2
+
+    def test_sms_sender_rate_limit_reports_a_reserved_slot(self, sample_service, mocker):
+        from app.notifications.validators import check_sms_sender_over_rate_limit
+
+        MockServiceSmsSender = namedtuple('ServiceSmsSender', ['id', 'sms_sender', 'rate_limit', 'rate_limit_interval'])
+        sms_sender = MockServiceSmsSender(id='some-id', sms_sender='+11111111111', rate_limit=1, rate_limit_interval=1)
+        mocker.patch('app.notifications.validators._sms_sender_lease_script', return_value=[1, 250_000])
+
+        with pytest.raises(RateLimitError) as e:
+            check_sms_sender_over_rate_limit(sample_service().id, sms_sender)
+
+        assert e.value.retry_after == 0.25
+        assert e.value.slot_reserved
+
+    def test_sms_sender_slot_time_is_never_rounded_to_zero(self, sample_service, mocker):
+        from app.notifications.validators import check_sms_sender_over_rate_limit
+
+        MockServiceSmsSender = namedtuple('ServiceSmsSender', ['id', 'sms_sender', 'rate_limit', 'rate_limit_interval'])
+        sms_sender = MockServiceSmsSender(
+            id='some-id', sms_sender='+11111111111', rate_limit=3_000_000, rate_limit_interval=1
+        )
+        lease = mocker.patch('app.notifications.validators._sms_sender_lease_script', return_value=[1, 0])
 
-            service.restricted = True
+        check_sms_sender_over_rate_limit(sample_service().id, sms_sender)
 
-            check_sms_sender_over_rate_limit(service, sms_sender)
-            should_throttle.assert_called_once_with(str(sms_sender.sms_sender), 10, 60)
+        assert lease.call_args.kwargs['args'][1] == 1
 
 
 class TestTemplateNameAlreadyExistsOnService:
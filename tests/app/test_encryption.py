@@ -18,3 +18,10 @@ def test_should_encrypt_json(notify_api):
     encryption.init_app(notify_api)
     encrypted = encryption.encrypt({'this': 'that'})
     assert encryption.decrypt(encrypted) == {'this': 'that'}
+
+
+def test_should_decrypt_many(notify_api):
+    encryption.init_app(notify_api)
+    first = encryption.encrypt({'this': 'that'})
+    second = encryption.encrypt('other')
+    assert encryption.decrypt_many([first, second, first]) == {first: {'this': 'that'}, second: 'other'}
@@ -5,6 +5,7 @@ from freezegun import freeze_time
 from sqlalchemy.exc import IntegrityError
 
 from app import encryption
+from app import utils as app_utils
 from app.constants import (
     SMS_TYPE,
     MOBILE_TYPE,
@@ -21,6 +22,7 @@ from app.constants import (
 from app.models import (
     ServiceWhitelist,
     Notification,
+    TemplateHistory,
 )
 from app.va.identifier import IdentifierType
 
@@ -110,6 +112,55 @@ def test_notification_personalisation_setter_always_sets_empty_dict(notify_api,
     assert noti._personalisation == encryption.encrypt({})
 
 
+def test_notification_personalisation_is_decrypted_once_until_set(notify_api, mocker):
+    noti = Notification()
+    noti.personalisation = {'name': 'Jo'}
+    decrypt = mocker.spy(encryption, 'decrypt')
+
+    assert noti.personalisation == {'name': 'Jo'}
+    noti.personalisation['name'] = 'changed'
+    assert noti.personalisation == {'name': 'Jo'}
+    assert decrypt.call_count == 1
+
+    noti.personalisation = {'name': 'Sam'}
+    assert noti.personalisation == {'name': 'Sam'}
+    assert decrypt.call_count == 2
+
+
+def test_notification_decrypt_personalisation_decrypts_each_value_once(notify_api, mocker):
+    notifications = [Notification(), Notification(), Notification()]
+    notifications[0].personalisation = {'name': 'Jo'}
+    notifications[1].personalisation = {'name': 'Jo'}
+    notifications[2]._personalisation = None
+    decrypt_many = mocker.spy(encryption, 'decrypt_many')
+    decrypt = mocker.spy(encryption, 'decrypt')
+
+    Notification.decrypt_personalisation(notifications)
+
+    assert [n.personalisation for n in notifications] == [{'name': 'Jo'}, {'name': 'Jo'}, {}]
+    assert decrypt_many.spy_return == {notifications[0]._personalisation: {'name': 'Jo'}}
+    decrypt.assert_not_called()
+
+
+def test_notification_serialize_many_builds_template_parts_once(
+    sample_template,
+    sample_notification,
+    mocker,
+):
+    template = sample_template(template_type=SMS_TYPE)
+    notifications = [sample_notification(template=template, personalisation={'name': 'Jo'}) for _ in range(3)]
+    get_link = mocker.spy(TemplateHistory, 'get_link')
+    get_template_instance = mocker.spy(app_utils, 'get_template_instance')
+
+    serialized = Notification.serialize_many(notifications)
+
+    assert [n['id'] for n in serialized] == [n.id for n in notifications]
+    assert serialized == [n.serialize() for n in notifications]
+    # Once each for serialize_many, then once per notification for the individual serialize calls.
+    assert get_link.call_count == 1 + 3
+    assert get_template_instance.call_count == 1 + 3
+
+
 def test_notification_subject_is_none_for_sms():
     assert Notification(notification_type=SMS_TYPE).subject is None
 
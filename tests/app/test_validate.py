@@ -1,7 +1,14 @@
 import pytest
-from app.schema_validation import validate, _redact_sensitive_data
+from app.schema_validation import (
+    _phone_number_error,
+    _redact_sensitive_data,
+    get_validator,
+    validate,
+    validate_schema_phone_number,
+)
 from app.v2.notifications.notification_schemas import post_sms_request
 from jsonschema import ValidationError
+from notifications_utils.recipients import InvalidPhoneError
 
 
 def test_validate_v2_notifications_personalisation_redaction(notify_api, mocker):
@@ -172,6 +179,32 @@ def test_validate_with_invalid_dict(
         validate(payload, {})
 
 
+def test_get_validator_compiles_each_schema_once() -> None:
+    assert get_validator(post_sms_request) is get_validator(post_sms_request)
+    assert get_validator(post_sms_request) is not get_validator(dict(post_sms_request))
+
+
+def test_validate_reports_invalid_phone_number_on_repeated_calls(notify_api) -> None:
+    payload = {'phone_number': 'not a phone number', 'template_id': '4e7e0b9b-2c6f-4d83-9f0e-8d4a4a0b9a3c'}
+
+    for _ in range(2):
+        with pytest.raises(ValidationError) as e:
+            validate(dict(payload), post_sms_request)
+        assert 'phone_number' in str(e.value)
+
+
+def test_validate_schema_phone_number_raises_a_new_error_each_call(notify_api) -> None:
+    errors = []
+    for _ in range(2):
+        with pytest.raises(InvalidPhoneError) as e:
+            validate_schema_phone_number('not a phone number')
+        errors.append(e.value)
+
+    assert errors[0] is not errors[1]
+    assert str(errors[0]) == str(errors[1])
+    assert all(not isinstance(key, str) and b'not a phone number' not in key for key in _phone_number_error.cache)
+
+
 @pytest.mark.parametrize(
     'payload, expected_output',
     [
@@ -25,3 +25,16 @@ def post_send_push_broadcast_notification(
         data=json.dumps(payload),
         headers=[('Content-Type', 'application/json'), create_authorization_header(api_key)],
     )
+
+
+def post_send_bulk_notification(
+    client,
+    api_key,
+    notification_type,
+    payload,
+):
+    return client.post(
+        path=f'/v2/notifications/{notification_type}/bulk',
+        data=json.dumps(payload),
+        headers=[('Content-Type', 'application/json'), create_authorization_header(api_key)],
+    )
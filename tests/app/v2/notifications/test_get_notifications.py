@@ -1,8 +1,11 @@
+from datetime import datetime
 from uuid import uuid4
 
 import pytest
 from flask import url_for
+from sqlalchemy import event
 
+from app import db
 from app.constants import (
     DATETIME_FORMAT,
     EMAIL_TYPE,
@@ -380,6 +383,38 @@ def test_get_all_notifications_except_job_notifications_returns_200(
     assert not json_response['notifications'][0]['scheduled_for']
 
 
+def test_get_all_notifications_query_count_does_not_grow_with_page(
+    client,
+    sample_api_key,
+    sample_template,
+    sample_notification,
+):
+    template = sample_template()
+    auth_header = create_authorization_header(sample_api_key(service=template.service))
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args)
+
+    def get_notifications():
+        statements.clear()
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+        try:
+            response = client.get(path='/v2/notifications', headers=[('Content-Type', 'application/json'), auth_header])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_statement)
+        assert response.status_code == 200
+        return len(response.get_json()['notifications']), len(statements)
+
+    sample_notification(template=template, personalisation={'name': 'Jo'})
+    assert get_notifications()[0] == 1
+    one_notification_queries = get_notifications()[1]
+
+    for _ in range(4):
+        sample_notification(template=template, personalisation={'name': 'Jo'})
+    assert get_notifications() == (5, one_notification_queries)
+
+
 def test_get_all_notifications_with_include_jobs_arg_returns_200(
     client,
     sample_api_key,
@@ -630,6 +665,47 @@ def test_get_all_notifications_filter_by_id(
     assert json_response['notifications'][0]['id'] == str(older_notification.id)
 
 
+def test_get_all_notifications_next_link_pages_through_notifications_created_at_the_same_time(
+    client,
+    mocker,
+    sample_api_key,
+    sample_template,
+    sample_notification,
+):
+    template = sample_template()
+    created_at = datetime.utcnow()
+    notifications = [sample_notification(template=template, created_at=created_at) for _ in range(3)]
+    mocker.patch.dict(client.application.config, {'API_PAGE_SIZE': 2})
+    auth_header = create_authorization_header(sample_api_key(service=template.service))
+
+    returned_ids = []
+    pages = 0
+    path = '/v2/notifications'
+    while path:
+        response = client.get(path=path, headers=[('Content-Type', 'application/json'), auth_header])
+        assert response.status_code == 200
+        json_response = response.get_json()
+        returned_ids.extend(n['id'] for n in json_response['notifications'])
+        path = json_response['links'].get('next')
+        pages += 1
+
+    assert pages == 3
+    assert sorted(returned_ids) == sorted(str(n.id) for n in notifications)
+
+
+def test_get_all_notifications_older_than_created_at_requires_older_than(
+    client,
+    sample_api_key,
+):
+    auth_header = create_authorization_header(sample_api_key())
+    response = client.get(
+        path='/v2/notifications?older_than_created_at=2026-10-17T10:00:00',
+        headers=[('Content-Type', 'application/json'), auth_header],
+    )
+
+    assert response.status_code == 400
+
+
 def test_get_all_notifications_filter_by_id_invalid_id(
     client,
     sample_api_key,
@@ -11,6 +11,7 @@ from app.attachments.exceptions import UnsupportedMimeTypeException
 from app.attachments.store import AttachmentStoreError
 from app.config import QueueNames
 from app.constants import (
+    BULK_NOTIFICATION_MAX_RECIPIENTS,
     EMAIL_TYPE,
     INTERNATIONAL_SMS_TYPE,
     KEY_TYPE_TEAM,
@@ -33,7 +34,7 @@ from app.v2.notifications.notification_schemas import post_email_response, post_
 from app.va.identifier import IdentifierType
 from tests import create_authorization_header
 
-from . import post_send_notification
+from . import post_send_bulk_notification, post_send_notification
 
 
 @pytest.fixture(autouse=True)
@@ -1618,3 +1619,157 @@ def test_post_notification_missing_email_personalization(
     assert response_json['message'].startswith('Missing personalisation: ')
     assert 'name' in response_json['message']
     assert 'dessert' in response_json['message']
+
+
+@pytest.mark.parametrize(
+    'notification_type, recipient_key, recipients',
+    [
+        (SMS_TYPE, 'phone_number', ['+16502532222', '+16502532223', '+16502532224']),
+        (EMAIL_TYPE, 'email_address', ['one@va.gov', 'two@va.gov', 'three@va.gov']),
+    ],
+)
+def test_post_bulk_notifications_returns_201_and_persists_every_recipient(
+    client,
+    notify_db_session,
+    sample_api_key,
+    sample_template,
+    mocker,
+    notification_type,
+    recipient_key,
+    recipients,
+):
+    mock_queue = mocker.patch(
+        'app.v2.notifications.post_notifications.send_notifications_to_queue_in_batches', return_value=[]
+    )
+    template = sample_template(template_type=notification_type, content='Hello ((name))')
+    data = {
+        'template_id': str(template.id),
+        'callback_url': 'https://www.test.com',
+        'recipients': [
+            {recipient_key: recipient, 'personalisation': {'name': f'Jo {i}'}, 'reference': f'ref-{i}'}
+            for i, recipient in enumerate(recipients)
+        ],
+    }
+
+    response = post_send_bulk_notification(client, sample_api_key(service=template.service), notification_type, data)
+
+    assert response.status_code == 201
+    resp_json = response.get_json()
+    assert resp_json['errors'] == []
+    assert [n['index'] for n in resp_json['notifications']] == [0, 1, 2]
+    assert [n['reference'] for n in resp_json['notifications']] == ['ref-0', 'ref-1', 'ref-2']
+
+    notifications = notify_db_session.session.scalars(
+        select(Notification).where(Notification.service_id == template.service_id)
+    ).all()
+    assert len(notifications) == 3
+    assert {str(n.id) for n in notifications} == {n['id'] for n in resp_json['notifications']}
+    assert {n.to for n in notifications} == set(recipients)
+    assert all(n.normalised_to is not None for n in notifications)
+    assert all(n.status == NOTIFICATION_CREATED for n in notifications)
+    assert all(n.callback_url == 'https://www.test.com' for n in notifications)
+    assert {n.personalisation['name'] for n in notifications} == {'Jo 0', 'Jo 1', 'Jo 2'}
+
+    queued_notifications = mock_queue.call_args[0][0]
+    assert {str(n.id) for n in queued_notifications} == {n['id'] for n in resp_json['notifications']}
+
+
+def test_post_bulk_notifications_queues_identified_recipients_with_communication_item_individually(
+    client,
+    notify_db_session,
+    sample_api_key,
+    sample_communication_item,
+    sample_template,
+    mocker,
+):
+    mock_batches = mocker.patch(
+        'app.v2.notifications.post_notifications.send_notifications_to_queue_in_batches', return_value=[]
+    )
+    mock_queue = mocker.patch('app.v2.notifications.post_notifications.send_notification_to_queue')
+    template = sample_template(communication_item_id=sample_communication_item().id)
+    data = {
+        'template_id': str(template.id),
+        'recipients': [
+            {
+                'phone_number': '+16502532222',
+                'recipient_identifier': {'id_type': IdentifierType.ICN.value, 'id_value': 'some icn'},
+            },
+            {'phone_number': '+16502532223'},
+        ],
+    }
+
+    response = post_send_bulk_notification(client, sample_api_key(service=template.service), SMS_TYPE, data)
+
+    assert response.status_code == 201
+    notification_ids = [n['id'] for n in response.get_json()['notifications']]
+    mock_queue.assert_called_once()
+    assert str(mock_queue.call_args.kwargs['notification'].id) == notification_ids[0]
+    assert mock_queue.call_args.kwargs['recipient_id_type'] == IdentifierType.ICN.value
+    assert [str(n.id) for n in mock_batches.call_args[0][0]] == notification_ids[1:]
+
+
+def test_post_bulk_notifications_reports_invalid_recipients_by_index(
+    client,
+    notify_db_session,
+    sample_api_key,
+    sample_template,
+    mocker,
+):
+    mocker.patch('app.v2.notifications.post_notifications.send_notifications_to_queue_in_batches', return_value=[])
+    template = sample_template(content='Hello ((name))')
+    data = {
+        'template_id': str(template.id),
+        'recipients': [
+            {'phone_number': '+16502532222', 'personalisation': {'name': 'Jo'}},
+            {'phone_number': 'not a phone number', 'personalisation': {'name': 'Jo'}},
+            {'phone_number': '+16502532223'},
+        ],
+    }
+
+    response = post_send_bulk_notification(client, sample_api_key(service=template.service), SMS_TYPE, data)
+
+    assert response.status_code == 201
+    resp_json = response.get_json()
+    assert [n['index'] for n in resp_json['notifications']] == [0]
+    assert [e['index'] for e in resp_json['errors']] == [1, 2]
+    assert resp_json['errors'][1]['errors'][0]['message'] == 'Missing personalisation: name'
+
+    count = notify_db_session.session.scalar(
+        select(func.count()).select_from(Notification).where(Notification.service_id == template.service_id)
+    )
+    assert count == 1
+
+
+def test_post_bulk_notifications_returns_400_when_no_recipient_is_valid(
+    client,
+    notify_db_session,
+    sample_api_key,
+    sample_template,
+    mocker,
+):
+    mock_queue = mocker.patch('app.v2.notifications.post_notifications.send_notifications_to_queue_in_batches')
+    template = sample_template(template_type=EMAIL_TYPE)
+    data = {'template_id': str(template.id), 'recipients': [{'email_address': 'not an email address'}]}
+
+    response = post_send_bulk_notification(client, sample_api_key(service=template.service), EMAIL_TYPE, data)
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'][0]['index'] == 0
+    mock_queue.assert_not_called()
+
+
+def test_post_bulk_notifications_rejects_more_than_the_maximum_recipients(
+    client,
+    sample_api_key,
+    sample_template,
+):
+    template = sample_template()
+    data = {
+        'template_id': str(template.id),
+        'recipients': [{'phone_number': '+16502532222'}] * (BULK_NOTIFICATION_MAX_RECIPIENTS + 1),
+    }
+
+    response = post_send_bulk_notification(client, sample_api_key(service=template.service), SMS_TYPE, data)
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'][0]['error'] == 'ValidationError'
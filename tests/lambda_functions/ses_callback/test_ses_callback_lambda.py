@@ -163,3 +163,51 @@ def test_lambda_handler_queue_name_with_message(mocker):
     mocker.patch(CALLBACK_LAMBDA_BOTO, new=mock_boto)
 
     lambda_handler(event, mocker.Mock())
+
+
+def test_lambda_handler_sends_one_batch_task(mocker):
+    mock_queue = mocker.Mock()
+
+    mock_sqs = mocker.Mock()
+    mock_sqs.get_queue_by_name.return_value = mock_queue
+
+    mock_boto = mocker.Mock()
+    mock_boto.resource.return_value = mock_sqs
+
+    mocker.patch(CALLBACK_LAMBDA_BOTO, new=mock_boto)
+    mocker.patch('lambda_functions.ses_callback.ses_callback_lambda.BATCH_TASK', True)
+
+    event = {'Records': [{'Sns': {'Message': 'first'}}, {'Sns': {'Message': 'second'}}]}
+    lambda_handler(event, mocker.Mock())
+
+    mock_queue.send_message.assert_called_once()
+    envelope = json.loads(base64.b64decode(mock_queue.send_message.call_args.kwargs['MessageBody']))
+    message_body = json.loads(base64.b64decode(envelope['body']))
+    assert message_body['task'] == 'process-ses-results-batch'
+    assert message_body['args'] == [[{'Message': 'first'}, {'Message': 'second'}]]
+
+
+def test_lambda_handler_batches_records_from_sqs(mocker):
+    mock_queue = mocker.Mock()
+
+    mock_sqs = mocker.Mock()
+    mock_sqs.get_queue_by_name.return_value = mock_queue
+
+    mock_boto = mocker.Mock()
+    mock_boto.resource.return_value = mock_sqs
+
+    mocker.patch(CALLBACK_LAMBDA_BOTO, new=mock_boto)
+    mocker.patch('lambda_functions.ses_callback.ses_callback_lambda.BATCH_TASK', True)
+
+    event = {
+        'Records': [
+            {'eventSource': 'aws:sqs', 'body': json.dumps({'Type': 'Notification', 'Message': message})}
+            for message in ('first', 'second')
+        ]
+    }
+    lambda_handler(event, mocker.Mock())
+
+    mock_queue.send_message.assert_called_once()
+    envelope = json.loads(base64.b64decode(mock_queue.send_message.call_args.kwargs['MessageBody']))
+    message_body = json.loads(base64.b64decode(envelope['body']))
+    assert message_body['args'] == [[{'Message': 'first'}, {'Message': 'second'}]]